@@ -4,21 +4,34 @@ Système d'Affectation par Mariage Stable
 Implémentation de l'algorithme de Gale-Shapley pour l'affectation 
 étudiants-universités avec mesure de satisfaction.
 """
+import importlib
 
 __version__ = "2.0.0"
 __author__ = "iTaPasta"
 
-from models import Student, University, SimulationData
-from preferences import generer_preferences_etudiants, generer_preferences_universites
-from matching import algorithme_affectation
-from satisfaction import mesurer_satisfaction_globale
-
-__all__ = [
-    "Student",
-    "University",
-    "SimulationData",
-    "generer_preferences_etudiants",
-    "generer_preferences_universites",
-    "algorithme_affectation",
-    "mesurer_satisfaction_globale",
-]
+# Exports chargés à la demande (PEP 562): importer le paquet ne charge
+# ni numpy ni les modules de calcul tant qu'ils ne sont pas utilisés.
+_LAZY_EXPORTS = {
+    "Student": "models",
+    "University": "models",
+    "SimulationData": "models",
+    "generer_preferences_etudiants": "preferences",
+    "generer_preferences_universites": "preferences",
+    "algorithme_affectation": "matching",
+    "mesurer_satisfaction_globale": "satisfaction",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,175 @@
+"""Mesures de temps robustes: échauffement, répétitions internes et contrôle du GC."""
+import gc
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from statistiques import ResumeFlux, resumer_echantillons
+
+
+@dataclass(frozen=True)
+class ParametresBenchmark:
+    """Paramètres du mode benchmark."""
+    echauffement: int = 2        # exécutions non mesurées (caches, allocations)
+    mesures: int = 10            # nombre d'échantillons de temps
+    nombre: int = 0              # appels par échantillon (0 = calibrage automatique)
+    duree_min_ms: float = 2.0    # durée minimale visée par échantillon en calibrage
+    desactiver_gc: bool = True   # pas de pause du ramasse-miettes pendant les mesures
+
+
+def calibrer_nombre(fonction: Callable[[], object], duree_min_ms: float) -> int:
+    """Nombre d'appels par échantillon pour qu'un échantillon dure au moins `duree_min_ms`."""
+    nombre = 1
+    while True:
+        debut = time.perf_counter_ns()
+        for _ in range(nombre):
+            fonction()
+        duree_ms = (time.perf_counter_ns() - debut) / 1e6
+        if duree_ms >= duree_min_ms or nombre >= 1 << 16:
+            return nombre
+        # Viser directement la durée minimale (au moins doubler)
+        nombre = max(nombre * 2, int(nombre * duree_min_ms / max(duree_ms, 1e-6)) + 1)
+
+
+def chronometrer(fonction: Callable[[], object], parametres: ParametresBenchmark) -> List[float]:
+    """
+    Exécute `fonction` selon `parametres` et retourne les temps par appel (ms).
+
+    Le GC est collecté avant les mesures puis désactivé pendant celles-ci
+    (si demandé), et restauré dans tous les cas.
+    """
+    for _ in range(parametres.echauffement):
+        fonction()
+
+    nombre = parametres.nombre or calibrer_nombre(fonction, parametres.duree_min_ms)
+
+    gc_actif = gc.isenabled()
+    gc.collect()
+    if parametres.desactiver_gc:
+        gc.disable()
+    try:
+        echantillons = []
+        for _ in range(max(parametres.mesures, 1)):
+            debut = time.perf_counter_ns()
+            for _ in range(nombre):
+                fonction()
+            echantillons.append((time.perf_counter_ns() - debut) / 1e6 / nombre)
+    finally:
+        if gc_actif:
+            gc.enable()
+    return echantillons
+
+
+def resumer_par_taille(results: Sequence[Dict], cle: str = "exec_time_ms") -> List[Dict]:
+    """
+    Agrège les résultats de tests multiples par taille (n, m).
+
+    Returns:
+        Une entrée par taille: nb_students, nb_universities et le résumé
+        statistique de `cle` (médiane, IQR, IC95...) sur les répétitions.
+    """
+    groupes: Dict[tuple, List[float]] = {}
+    for result in results:
+        groupes.setdefault((result["nb_students"], result["nb_universities"]), []).append(result[cle])
+
+    resume = []
+    for (nb_students, nb_universities), valeurs in groupes.items():
+        entree = {"nb_students": nb_students, "nb_universities": nb_universities}
+        entree.update(resumer_echantillons(valeurs))
+        resume.append(entree)
+    return resume
+
+
+# Métriques résumées en flux par marché (clé du résultat -> libellé)
+METRIQUES_RESUME = {
+    "sat_students": "Satisfaction étudiants",
+    "sat_universities": "Satisfaction établissements",
+    "r_etu_obs": "Rang moyen étudiants",
+    "r_uni_obs": "Rang moyen établissements",
+    "nb_unassigned": "Non affectés",
+    "nb_paires_bloquantes": "Paires bloquantes",
+    "exec_time_ms": "Temps d'affectation (ms)",
+}
+
+
+class AgregatsParMarche:
+    """
+    Agrégats en flux par marché (n, m): un `ResumeFlux` par métrique, mis à
+    jour en temps constant à chaque résultat, sans conserver les répétitions.
+    """
+
+    def __init__(self, metriques: Sequence[str] = tuple(METRIQUES_RESUME)):
+        self.metriques = tuple(metriques)
+        self.marches: Dict[Tuple[int, int], Dict[str, ResumeFlux]] = {}
+
+    def ajouter(self, result: Dict) -> Tuple[int, int]:
+        """Ajoute une répétition; retourne le marché (n, m) mis à jour."""
+        cle = (result["nb_students"], result["nb_universities"])
+        resumes = self.marches.get(cle)
+        if resumes is None:
+            resumes = self.marches[cle] = {nom: ResumeFlux() for nom in self.metriques}
+        for nom, resume in resumes.items():
+            # Métrique absente des lignes antérieures (historique): ignorée
+            if result.get(nom) is not None:
+                resume.ajouter(result[nom])
+        return cle
+
+    def resume(self, cle: Tuple[int, int]) -> Dict[str, Dict[str, float]]:
+        """Résumé (moyenne, écart-type, min/max, percentiles) de chaque métrique d'un marché."""
+        return {nom: resume.resume() for nom, resume in self.marches[cle].items()}
+
+    def vider(self) -> None:
+        self.marches.clear()
+
+
+def matrice_par_marche(results: Sequence[Dict], cle: str, par_ratio: bool = False,
+                       statistique: str = "mediane") -> Tuple[List[int], List, List[List[Optional[float]]]]:
+    """
+    Carte de chaleur d'une métrique sur un balayage (n, m).
+
+    Lignes: n (étudiants); colonnes: m (établissements), ou le ratio m/n
+    arrondi si `par_ratio`. Chaque case vaut la `statistique` (clé de
+    `resumer_echantillons`) des répétitions, None si la case n'a pas été testée.
+
+    Returns:
+        (valeurs de n, valeurs des colonnes, matrice lignes × colonnes)
+    """
+    groupes: Dict[tuple, List[float]] = {}
+    for result in results:
+        n, m = result["nb_students"], result["nb_universities"]
+        colonne = round(m / n, 3) if par_ratio else m
+        groupes.setdefault((n, colonne), []).append(result[cle])
+
+    lignes = sorted({n for n, _ in groupes})
+    colonnes = sorted({c for _, c in groupes})
+    matrice = [
+        [resumer_echantillons(groupes[(n, c)])[statistique] if (n, c) in groupes else None
+         for c in colonnes]
+        for n in lignes
+    ]
+    return lignes, colonnes, matrice
+
+
+def formater_matrice(lignes: Sequence, colonnes: Sequence, matrice: Sequence[Sequence[Optional[float]]],
+                     titre: str, spec: str = ".3f", entete_colonnes: str = "m") -> str:
+    """Texte d'une carte de chaleur (une ligne par n, « · » pour une case absente)."""
+    largeur = max([len(format(v, spec)) for ligne in matrice for v in ligne if v is not None]
+                  + [len(str(c)) for c in colonnes] + [6])
+    coin = "n \\ " + entete_colonnes
+    texte = [titre, f"{coin:>8} " + " ".join(f"{str(c):>{largeur}}" for c in colonnes)]
+    for n, ligne in zip(lignes, matrice):
+        texte.append(f"{n:>8} " + " ".join(
+            f"{'·' if v is None else format(v, spec):>{largeur}}" for v in ligne))
+    return "\n".join(texte)
+
+
+def formater_resume(resume: Sequence[Dict], unite: str = "ms") -> str:
+    """Texte lisible d'un résumé par taille (une ligne par taille)."""
+    lignes = []
+    for r in resume:
+        lignes.append(
+            f"n={r['nb_students']}×{r['nb_universities']}: médiane {r['mediane']:.3f} {unite} "
+            f"(IQR {r['iqr']:.3f}, IC95 [{r['ic95_bas']:.3f}; {r['ic95_haut']:.3f}], "
+            f"{r['n']} rép.)"
+        )
+    return "\n".join(lignes)
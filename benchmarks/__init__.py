@@ -0,0 +1 @@
+# Suite de benchmarks (python -m benchmarks.suite)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks avec lignes de base versionnées.
+
+Couvre l'affectation, la génération des préférences, la satisfaction, le
+chargement CSV et le remplissage des tableaux de la GUI, sur une grille de
+tailles et de modèles de préférences:
+
+    python -m benchmarks.suite                      # compare à benchmarks/baseline.json
+    python -m benchmarks.suite --enregistrer        # met à jour la ligne de base
+    python -m benchmarks.suite --tailles 100,1000 --filtre affectation --seuil 0.15
+
+Le code de sortie vaut 1 si une régression dépasse le seuil.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from benchmark import ParametresBenchmark, chronometrer
+from data.data_loader import load_students_from_csv, load_universities_from_csv
+from experiences import entites_synthetiques
+from matching import algorithme_affectation
+from preferences import MODELES_PREFERENCES, generer_preferences
+from satisfaction import mesurer_satisfaction_globale
+from statistiques import resumer_echantillons
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (identifiant, fonction à chronométrer)
+Cas = Tuple[str, Callable[[], object]]
+
+
+def _instance(n: int, modele: str, seed: int = 0):
+    students, universities = entites_synthetiques(n, n)
+    rng = random.Random(seed)
+    prefs_etud, prefs_uni = generer_preferences(students, universities, modele=modele, rng=rng)
+    capacites = {u.name: u.capacity for u in universities}
+    return students, universities, prefs_etud, prefs_uni, capacites
+
+
+def cas_calcul(tailles: Sequence[int], modeles: Sequence[str]) -> Iterator[Cas]:
+    """Génération, affectation et satisfaction sur la grille (taille × modèle)."""
+    for modele in modeles:
+        for n in tailles:
+            students, universities, prefs_etud, prefs_uni, capacites = _instance(n, modele)
+            affectations = algorithme_affectation(prefs_etud, prefs_uni, capacites)
+            rng = random.Random(1)
+
+            yield (f"generation/{modele}/n={n}",
+                   lambda s=students, u=universities, m=modele, r=rng: generer_preferences(s, u, modele=m, rng=r))
+            yield (f"affectation/{modele}/n={n}",
+                   lambda pe=prefs_etud, pu=prefs_uni, c=capacites: algorithme_affectation(pe, pu, c))
+            yield (f"satisfaction/{modele}/n={n}",
+                   lambda a=affectations, pe=prefs_etud, pu=prefs_uni, c=capacites:
+                   mesurer_satisfaction_globale(a, pe, pu, c))
+
+
+def cas_chargement(tailles: Sequence[int], dossier: str) -> Iterator[Cas]:
+    """Lecture des CSV étudiants/établissements de n lignes."""
+    for n in tailles:
+        path_etu = os.path.join(dossier, f"etudiants_{n}.csv")
+        path_uni = os.path.join(dossier, f"universites_{n}.csv")
+        for path, prefixe in ((path_etu, "Étudiant"), (path_uni, "Université")):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["id", "name"])
+                writer.writerows((i, f"{prefixe} {i}") for i in range(1, n + 1))
+        yield (f"chargement_csv/n={n}",
+               lambda pe=path_etu, pu=path_uni: (load_students_from_csv(pe), load_universities_from_csv(pu)))
+
+
+def cas_interface(tailles: Sequence[int]) -> Iterator[Cas]:
+    """Remplissage des tableaux de résultats (update_results); ignoré sans affichage."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        print(f"[benchmarks] update_results ignoré (pas d'affichage Tk: {e})", file=sys.stderr)
+        return
+
+    from gui_main import ModernMatchingApp
+    from models import SimulationData
+
+    root.withdraw()
+    app = ModernMatchingApp(root)
+    try:
+        for n in tailles:
+            students, universities, prefs_etud, prefs_uni, capacites = _instance(n, "uniforme")
+            affectations = algorithme_affectation(prefs_etud, prefs_uni, capacites)
+            stats = mesurer_satisfaction_globale(affectations, prefs_etud, prefs_uni, capacites)
+            data = SimulationData(students, universities, prefs_etud, prefs_uni, affectations, stats)
+
+            def remplir(d=data):
+                app.simulation_data = d
+                app.update_results()
+                root.update_idletasks()
+
+            yield (f"update_results/n={n}", remplir)
+    finally:
+        root.destroy()
+
+
+def executer_suite(
+    tailles: Sequence[int],
+    modeles: Sequence[str],
+    parametres: ParametresBenchmark,
+    filtre: Optional[str] = None,
+    interface: bool = True,
+) -> Dict[str, Dict[str, float]]:
+    """Chronomètre chaque cas et retourne {identifiant: résumé statistique (ms)}."""
+    resultats: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as dossier:
+        sources = [cas_calcul(tailles, modeles), cas_chargement(tailles, dossier)]
+        if interface:
+            sources.append(cas_interface(tailles))
+        for source in sources:
+            for identifiant, fonction in source:
+                if filtre and filtre not in identifiant:
+                    continue
+                resume = resumer_echantillons(chronometrer(fonction, parametres))
+                resultats[identifiant] = {k: resume[k] for k in ("mediane", "iqr", "ic95_bas", "ic95_haut", "n")}
+                print(f"{identifiant:<40} {resume['mediane']:>11.3f} ms  (IQR {resume['iqr']:.3f})",
+                      file=sys.stderr)
+    return resultats
+
+
+def comparer(
+    resultats: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    seuil: float,
+) -> List[Dict]:
+    """
+    Compare les médianes à la ligne de base.
+
+    Un écart n'est signalé que s'il dépasse `seuil` (relatif) et que les IC95
+    des deux médianes ne se chevauchent pas (écart distinguable du bruit).
+    Un cas sans ligne de base exploitable est signalé `absent`.
+    """
+    rapport = []
+    for identifiant, actuel in resultats.items():
+        ref = baseline.get(identifiant)
+        if ref is None or ref["mediane"] <= 0:
+            rapport.append({"cas": identifiant, "ratio": None, "statut": "absent",
+                            "mediane_ms": actuel["mediane"], "baseline_ms": None})
+            continue
+        ratio = actuel["mediane"] / ref["mediane"]
+        disjoints = actuel["ic95_bas"] > ref["ic95_haut"] or actuel["ic95_haut"] < ref["ic95_bas"]
+        if ratio > 1 + seuil and disjoints:
+            statut = "REGRESSION"
+        elif ratio < 1 - seuil and disjoints:
+            statut = "amelioration"
+        else:
+            statut = "ok"
+        rapport.append({"cas": identifiant, "ratio": ratio, "statut": statut,
+                        "mediane_ms": actuel["mediane"], "baseline_ms": ref["mediane"]})
+    return rapport
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Suite de benchmarks avec lignes de base.")
+    parser.add_argument("--tailles", default="50,200,500",
+                        help="grille de tailles n (défaut: 50,200,500)")
+    parser.add_argument("--modeles", default=",".join(MODELES_PREFERENCES),
+                        help="modèles de préférences (défaut: tous)")
+    parser.add_argument("--filtre", default=None, help="ne lancer que les cas contenant ce texte")
+    parser.add_argument("--mesures", type=int, default=7, help="mesures par cas (défaut: 7)")
+    parser.add_argument("--echauffement", type=int, default=1, help="exécutions d'échauffement")
+    parser.add_argument("--seuil", type=float, default=0.25,
+                        help="écart relatif signalé (défaut: 0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="fichier JSON de la ligne de base")
+    parser.add_argument("--enregistrer", action="store_true",
+                        help="écrire les résultats comme nouvelle ligne de base")
+    parser.add_argument("--sans-interface", action="store_true",
+                        help="ne pas mesurer update_results (Tk)")
+    args = parser.parse_args(argv)
+
+    tailles = [int(t) for t in args.tailles.split(",") if t.strip()]
+    modeles = [m.strip() for m in args.modeles.split(",") if m.strip()]
+    parametres = ParametresBenchmark(echauffement=args.echauffement, mesures=args.mesures)
+    resultats = executer_suite(tailles, modeles, parametres, args.filtre, not args.sans_interface)
+
+    if args.enregistrer:
+        contenu = {
+            "meta": {
+                "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "systeme": platform.system(),
+            },
+            "resultats": resultats,
+        }
+        if os.path.exists(args.baseline):
+            # Conserver les cas non relancés (ex: --filtre)
+            with open(args.baseline, encoding="utf-8") as f:
+                anciens = json.load(f).get("resultats", {})
+            contenu["resultats"] = {**anciens, **resultats}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(contenu, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"Ligne de base enregistrée: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Aucune ligne de base (lancez avec --enregistrer)", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f).get("resultats", {})
+    rapport = comparer(resultats, baseline, args.seuil)
+    for ligne in rapport:
+        if ligne["ratio"] is None:
+            print(f"{ligne['statut']:<12} {ligne['cas']:<40} (pas de ligne de base -> "
+                  f"{ligne['mediane_ms']:.3f} ms)")
+            continue
+        print(f"{ligne['statut']:<12} {ligne['cas']:<40} x{ligne['ratio']:.2f} "
+              f"({ligne['baseline_ms']:.3f} -> {ligne['mediane_ms']:.3f} ms)")
+    return 1 if any(ligne["statut"] == "REGRESSION" for ligne in rapport) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
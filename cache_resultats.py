@@ -0,0 +1,103 @@
+"""Cache des résultats (affectation + satisfaction) indexé par l'empreinte de l'instance."""
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from models import StudentKey, UniversityKey
+
+# Version du contenu des entrées, incluse dans l'empreinte: à incrémenter quand
+# les statistiques enregistrées changent (les anciennes entrées sont ignorées)
+FORMAT_CACHE = 2
+
+
+def empreinte_instance(
+    prefs_etud: Dict[StudentKey, List[UniversityKey]],
+    prefs_uni: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    moteur: str = "gale_shapley",
+) -> str:
+    """
+    Empreinte (BLAKE2b) du contenu d'une instance: listes de préférences,
+    capacités, moteur et version du format. Indépendante de l'ordre
+    d'insertion des dictionnaires.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"v{FORMAT_CACHE}\x1d{moteur}".encode())
+    for prefs in (prefs_etud, prefs_uni):
+        h.update(b"\x1d")
+        for cle in sorted(prefs):
+            h.update(cle.encode())
+            h.update(b"\x1f")
+            h.update("\x1f".join(prefs[cle]).encode())
+            h.update(b"\x1e")
+    h.update(b"\x1d")
+    for cle in sorted(capacites):
+        h.update(f"{cle}\x1f{capacites[cle]}\x1e".encode())
+    return h.hexdigest()
+
+
+class CacheResultats:
+    """
+    Cache à deux niveaux: LRU en mémoire (au plus `capacite` entrées) et,
+    si `dossier` est fourni, un fichier pickle par empreinte sur disque.
+    """
+
+    def __init__(self, capacite: int = 64, dossier: Optional[str] = None):
+        self.capacite = capacite
+        self.dossier = dossier
+        self._memoire: "OrderedDict[str, Any]" = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+    def _chemin(self, cle: str) -> str:
+        return os.path.join(self.dossier, f"{cle}.pickle")
+
+    def obtenir(self, cle: str) -> Optional[Any]:
+        """Valeur associée à `cle` (mémoire puis disque), ou None."""
+        if cle in self._memoire:
+            self._memoire.move_to_end(cle)
+            self.succes += 1
+            return self._memoire[cle]
+        if self.dossier:
+            try:
+                with open(self._chemin(cle), "rb") as f:
+                    valeur = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self._ajouter_memoire(cle, valeur)
+                self.succes += 1
+                return valeur
+        self.echecs += 1
+        return None
+
+    def enregistrer(self, cle: str, valeur: Any) -> None:
+        self._ajouter_memoire(cle, valeur)
+        if self.dossier:
+            # Écriture atomique: un lecteur concurrent ne voit jamais de fichier partiel
+            fd, tmp = tempfile.mkstemp(dir=self.dossier, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(valeur, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._chemin(cle))
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+    def _ajouter_memoire(self, cle: str, valeur: Any) -> None:
+        self._memoire[cle] = valeur
+        self._memoire.move_to_end(cle)
+        while len(self._memoire) > self.capacite:
+            self._memoire.popitem(last=False)
+
+    def vider(self) -> None:
+        """Vide le niveau mémoire (le niveau disque est conservé)."""
+        self._memoire.clear()
+
+    def __len__(self) -> int:
+        return len(self._memoire)
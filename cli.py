@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Exécution des tests multiples en ligne de commande (sans Tk ni matplotlib).
+
+Une ligne JSON est écrite par répétition, avec les colonnes de l'export CSV:
+
+    python -m cli --tailles 100,500,1000 --repetitions 5 --seed 42 --workers 4
+    python -m cli --tailles 2000 --synthetique --sortie resultats.jsonl
+    python -m cli --tailles 100,200 --ratios 0.9,1,1.1 --workers 4
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from data.data_loader import load_students_from_csv, load_universities_from_csv
+from experiences import (
+    METRIQUES_ADAPTATIVES, CritereAdaptatif, entites_synthetiques, executer_repetition, graine_repetition,
+    grille_marches, ligne_export, rejouer_repetition,
+)
+from trace_propositions import TracePropositions
+from instrumentation import Instrumentation, JournalTrace
+from benchmark import (
+    ParametresBenchmark, formater_matrice, formater_resume, matrice_par_marche, resumer_par_taille,
+)
+from statistiques import Welford, resumer_echantillons
+from complexite import analyser_complexite, formater_analyse
+from matching import MOTEURS
+from cache_resultats import CacheResultats
+from historique import HistoriqueResultats
+from reprise import JournalReprise
+from comparaison import comparer_moteurs, desaccords, formater_comparaison, resumer_comparaison
+from egalites import DEPARTAGES, comparer_departages, formater_departages
+from preferences import MODELES_PREFERENCES
+from satisfaction import HistogrammesRangs
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+STUDENTS_CSV = os.path.join(DATA_DIR, "etudiants.csv")
+UNIVERSITIES_CSV = os.path.join(DATA_DIR, "universites.csv")
+
+# (test_num, répétition, nb_étudiants, nb_établissements, seed)
+Tache = Tuple[int, int, int, int, int]
+
+
+def parse_tailles(texte: str) -> List[int]:
+    """Convertit "10, 50, 100" en [10, 50, 100]."""
+    try:
+        tailles = [int(t.strip()) for t in texte.split(",") if t.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Format invalide pour les tailles (utilisez: 10,50,100)") from None
+    if not tailles or any(t < 1 for t in tailles):
+        raise argparse.ArgumentTypeError("Les tailles doivent être des entiers >= 1")
+    return tailles
+
+
+def parse_ratios(texte: str) -> List[float]:
+    """Convertit "0.9, 1, 1.1" en [0.9, 1.0, 1.1] (ratios m/n)."""
+    try:
+        ratios = [float(r.strip()) for r in texte.split(",") if r.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Format invalide pour les ratios (utilisez: 0.9,1,1.1)") from None
+    if not ratios or any(r <= 0 for r in ratios):
+        raise argparse.ArgumentTypeError("Les ratios doivent être > 0")
+    return ratios
+
+
+def planifier(marches: Sequence[Tuple[int, int]], repetitions: int, seed: int) -> List[Tache]:
+    """
+    Construit la liste ordonnée des répétitions de chaque marché (n, m),
+    chacune avec sa graine dérivée de `seed`.
+    """
+    taches: List[Tache] = []
+    test_num = 1
+    for n, m in marches:
+        for rep in range(1, repetitions + 1):
+            taches.append((test_num, rep, n, m, graine_repetition(seed, n, m, rep)))
+            test_num += 1
+    return taches
+
+
+# Données des processus de travail (initialisées une fois par processus)
+_DONNEES: Optional[Tuple[list, list, str, Optional[ParametresBenchmark], str, bool,
+                          Optional[CacheResultats]]] = None
+
+
+def _init_worker(students, universities, moteur: str,
+                 benchmark: Optional[ParametresBenchmark] = None,
+                 modele: str = "uniforme", memoire: bool = False,
+                 cache_dossier: Optional[str] = None) -> None:
+    global _DONNEES
+    # Un cache par processus; le niveau disque est partagé entre processus
+    cache = CacheResultats(dossier=cache_dossier) if cache_dossier else None
+    _DONNEES = (students, universities, moteur, benchmark, modele, memoire, cache)
+
+
+def _executer_tache(tache: Tache):
+    students, universities, moteur, benchmark, modele, memoire, cache = _DONNEES
+    test_num, rep, nb_students, nb_universities, seed = tache
+    instr = Instrumentation()
+    result = executer_repetition(
+        students, universities, nb_students, nb_universities,
+        test_num=test_num, repetition=rep, seed=seed, moteur=moteur,
+        instrumentation=instr, benchmark=benchmark, modele=modele, memoire=memoire,
+        cache=cache,
+    )
+    return result, instr.spans, os.getpid()
+
+
+@contextmanager
+def _pool(workers: int, initargs: tuple) -> Iterator[Callable]:
+    """Fournit une fonction `map` ordonnée: en processus séparés si `workers` > 1."""
+    if workers <= 1:
+        _init_worker(*initargs)
+        yield lambda taches: map(_executer_tache, taches)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=initargs) as executor:
+        yield lambda taches: executor.map(_executer_tache, taches)
+
+
+def _publier(sortie, journal: Optional[JournalTrace]) -> Dict:
+    result, spans, pid = sortie
+    if journal is not None:
+        journal.ecrire(spans, pid=pid, tid=0, args={"test": result["test_num"]})
+    return result
+
+
+def executer_campagne(
+    taches: Sequence[Tache],
+    students: list,
+    universities: list,
+    moteur: str = "gale_shapley",
+    workers: int = 1,
+    journal: Optional[JournalTrace] = None,
+    benchmark: Optional[ParametresBenchmark] = None,
+    modele: str = "uniforme",
+    memoire: bool = False,
+    cache_dossier: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Exécute les répétitions (en parallèle si `workers` > 1), dans l'ordre.
+
+    Les spans mesurés dans les processus de travail sont ajoutés au `journal`.
+    """
+    with _pool(workers, (students, universities, moteur, benchmark, modele, memoire, cache_dossier)) as map_ordonne:
+        for sortie in map_ordonne(taches):
+            yield _publier(sortie, journal)
+
+
+def executer_adaptatif(
+    marches: Sequence[Tuple[int, int]],
+    seed: int,
+    critere: CritereAdaptatif,
+    students: list,
+    universities: list,
+    moteur: str = "gale_shapley",
+    workers: int = 1,
+    journal: Optional[JournalTrace] = None,
+    benchmark: Optional[ParametresBenchmark] = None,
+    modele: str = "uniforme",
+    memoire: bool = False,
+    cache_dossier: Optional[str] = None,
+    reprise: Optional[JournalReprise] = None,
+) -> Iterator[Dict]:
+    """
+    Répète chaque marché (n, m) jusqu'à ce que `critere` soit atteint.
+
+    Les répétitions sont lancées par lots de `workers`; seul un accumulateur
+    de Welford est conservé par taille. Avec une `reprise`, les accumulateurs
+    sont restaurés et les répétitions déjà faites sautées.
+    """
+    test_num = 1
+    with _pool(workers, (students, universities, moteur, benchmark, modele, memoire, cache_dossier)) as map_ordonne:
+        for n, m in marches:
+            accumulateur = reprise.accumulateur(n, m, critere.cle) if reprise else Welford()
+            debut = time.perf_counter()
+            rep = 1
+            # Répétitions déjà faites pour ce marché: avancer la numérotation
+            while reprise is not None and reprise.est_termine(n, m, rep):
+                test_num += 1
+                rep += 1
+            while not critere.atteint(accumulateur, time.perf_counter() - debut):
+                lot = []
+                for _ in range(max(workers, 1)):
+                    tache = (test_num, rep, n, m, graine_repetition(seed, n, m, rep))
+                    if reprise is None or not reprise.est_termine(n, m, rep):
+                        lot.append(tache)
+                    test_num += 1
+                    rep += 1
+                for sortie in map_ordonne(lot):
+                    result = _publier(sortie, journal)
+                    accumulateur.ajouter(result[critere.cle])
+                    yield result
+
+
+def comparer(taches: Sequence[Tache], students: list, universities: list, moteurs: Sequence[str],
+             modele: str, memoire: bool, sortie) -> int:
+    """Mode comparaison: chaque instance est résolue par tous les `moteurs`."""
+    toutes: List[Dict] = []
+    try:
+        for test_num, rep, nb_students, nb_universities, seed in taches:
+            lignes = comparer_moteurs(students, universities, nb_students, nb_universities, moteurs,
+                                      seed=seed, modele=modele, memoire=memoire, repetition=rep)
+            for ligne in lignes:
+                sortie.write(json.dumps(dict(ligne, test_num=test_num), ensure_ascii=False) + "\n")
+            toutes.extend(lignes)
+    finally:
+        if sortie is not sys.stdout:
+            sortie.close()
+    print(formater_comparaison(resumer_comparaison(toutes)), file=sys.stderr)
+    problemes = desaccords(toutes)
+    for probleme in dict.fromkeys(problemes):
+        print(f"Désaccord: {probleme}", file=sys.stderr)
+    return 1 if problemes else 0
+
+
+def departager(taches: Sequence[Tache], students: list, universities: list, taille_bande: int,
+               strategies: Sequence[str], nb_tirages: int, modele: str, sortie) -> int:
+    """Mode égalités: bandes de score ex aequo, `nb_tirages` départages par stratégie et par instance."""
+    toutes: List[Dict] = []
+    try:
+        for test_num, rep, nb_students, nb_universities, seed in taches:
+            lignes = comparer_departages(students, universities, nb_students, nb_universities, taille_bande,
+                                         strategies, nb_tirages, seed=seed, modele=modele, repetition=rep)
+            for ligne in lignes:
+                sortie.write(json.dumps(dict(ligne, test_num=test_num), ensure_ascii=False) + "\n")
+            toutes.extend(lignes)
+    finally:
+        if sortie is not sys.stdout:
+            sortie.close()
+    print(formater_departages(toutes), file=sys.stderr)
+    return 0
+
+
+def formater_cartes(mesures: Sequence[Dict], par_ratio: bool = False) -> str:
+    """Cartes de chaleur (n × m ou n × ratio) de la satisfaction, des non affectés et du temps."""
+    entete = "m/n" if par_ratio else "m"
+    cartes = []
+    for cle, titre, spec in (("sat_students", "Satisfaction étudiants (moyenne)", ".3f"),
+                             ("sat_universities", "Satisfaction établissements (moyenne)", ".3f"),
+                             ("nb_unassigned", "Étudiants non affectés (moyenne)", ".1f"),
+                             ("exec_time_ms", "Temps d'affectation (médiane, ms)", ".3f")):
+        statistique = "mediane" if cle == "exec_time_ms" else "moyenne"
+        cartes.append(formater_matrice(*matrice_par_marche(mesures, cle, par_ratio, statistique),
+                                       titre, spec, entete))
+    return "\n\n".join(cartes)
+
+
+def construire_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Tests multiples de l'algorithme d'affectation, sans interface graphique.",
+    )
+    parser.add_argument("--tailles", type=parse_tailles, default=[10, 50, 100],
+                        help="tailles de marché n (étudiants), ex: 10,50,100; m = n sauf --etablissements/--ratios")
+    grille = parser.add_mutually_exclusive_group()
+    grille.add_argument("--etablissements", type=parse_tailles, default=None, metavar="M",
+                        help="nombres d'établissements: balayage de toute la grille n × m, ex: 50,100,200")
+    grille.add_argument("--ratios", type=parse_ratios, default=None, metavar="R",
+                        help="ratios m/n: pour chaque n, m = round(n · ratio), ex: 0.9,1,1.1")
+    parser.add_argument("--repetitions", type=int, default=5,
+                        help="nombre de répétitions par taille (défaut: 5)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="graine maîtresse de la campagne (défaut: aléatoire)")
+    parser.add_argument("--moteur", choices=sorted(MOTEURS), default="gale_shapley",
+                        help="moteur d'affectation")
+    parser.add_argument("--modele", choices=MODELES_PREFERENCES, default="uniforme",
+                        help="modèle de préférences (défaut: uniforme)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="nombre de processus de calcul (défaut: 1)")
+    parser.add_argument("--synthetique", action="store_true",
+                        help="utiliser des entités générées au lieu des CSV (tailles illimitées)")
+    parser.add_argument("--sortie", default="-",
+                        help="fichier JSON Lines de sortie (défaut: stdout)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="mode benchmark: échauffement, mesures répétées, GC désactivé")
+    parser.add_argument("--echauffement", type=int, default=2,
+                        help="exécutions d'échauffement par instance (mode benchmark)")
+    parser.add_argument("--mesures", type=int, default=10,
+                        help="mesures de temps par instance (mode benchmark)")
+    parser.add_argument("--adaptatif", choices=sorted(METRIQUES_ADAPTATIVES), default=None,
+                        help="répéter chaque taille jusqu'à ce que l'IC95 de cette métrique soit assez étroit")
+    parser.add_argument("--largeur", type=float, default=0.01,
+                        help="largeur totale visée de l'IC95 (mode adaptatif, unités de la métrique)")
+    parser.add_argument("--budget", type=float, default=60.0,
+                        help="budget de temps par taille en secondes (mode adaptatif)")
+    parser.add_argument("--max-repetitions", type=int, default=10000,
+                        help="plafond de répétitions par taille (mode adaptatif)")
+    parser.add_argument("--ajustement", action="store_true",
+                        help="ajuster la complexité empirique (temps, propositions) en fin de campagne")
+    parser.add_argument("--memoire", action="store_true",
+                        help="mesurer le pic mémoire par phase (tracemalloc, ralentit) et la RSS")
+    parser.add_argument("--cache", default=None, metavar="DOSSIER",
+                        help="réutiliser les résultats des instances déjà calculées (cache disque)")
+    parser.add_argument("--historique", default=None, metavar="BASE",
+                        help="ajouter chaque répétition à cette base SQLite")
+    parser.add_argument("--reprise", default=None, metavar="FICHIER",
+                        help="point de reprise: reprendre la campagne interrompue qui y est décrite, "
+                             "ou en créer un (supprimé en fin de campagne)")
+    parser.add_argument("--comparer", default=None, metavar="MOTEURS",
+                        help="comparer des moteurs (liste séparée par des virgules, ou 'tous') "
+                             "sur les mêmes instances, en série")
+    parser.add_argument("--bandes", type=int, default=None, metavar="K",
+                        help="égalités: les établissements classent par bandes de K ex aequo; "
+                             "distribution des issues sur --tirages départages aléatoires")
+    parser.add_argument("--departage", default=",".join(DEPARTAGES), metavar="STRATEGIES",
+                        help="avec --bandes: départages comparés, parmi unique (loterie commune) "
+                             "et multiple (une loterie par établissement)")
+    parser.add_argument("--tirages", type=int, default=100,
+                        help="avec --bandes: départages tirés par instance et par stratégie (défaut: 100)")
+    parser.add_argument("--rejouer", type=int, default=None, metavar="GRAINE",
+                        help="rejouer une seule répétition (colonne Seed) pour le premier marché (n, m)")
+    parser.add_argument("--trace-propositions", default=None, metavar="FICHIER",
+                        help="avec --rejouer: exporter en CSV chaque proposition et son issue")
+    parser.add_argument("--distributions", action="store_true",
+                        help="afficher par marché l'histogramme cumulé des rangs obtenus, "
+                             "la part de premiers choix, le pire rang et le Gini")
+    parser.add_argument("--trace", default=None,
+                        help="fichier de trace des phases (format Trace Event, chrome://tracing)")
+    return parser
+
+
+def _valider_lot(en_attente: List[Tuple[str, Dict]], sortie, historique: Optional[HistoriqueResultats],
+                 reprise: JournalReprise) -> None:
+    """Écrit les lignes en attente, vide l'historique puis avance le point de reprise."""
+    for texte, _ in en_attente:
+        sortie.write(texte)
+    sortie.flush()
+    # Le point de reprise ne doit pas devancer la sortie ni l'historique
+    if historique is not None:
+        historique.vider()
+    for _, result in en_attente:
+        reprise.enregistrer(result)
+    en_attente.clear()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = construire_parser().parse_args(argv)
+    if args.repetitions < 1:
+        print("Erreur: --repetitions doit être >= 1", file=sys.stderr)
+        return 2
+    if args.reprise and args.comparer:
+        print("Erreur: --reprise n'est pas disponible avec --comparer", file=sys.stderr)
+        return 2
+    if args.reprise and args.bandes is not None:
+        print("Erreur: --reprise n'est pas disponible avec --bandes", file=sys.stderr)
+        return 2
+
+    # Paramètres de campagne conservés dans le point de reprise
+    config_campagne = ("tailles", "etablissements", "ratios", "repetitions", "seed", "moteur", "modele",
+                       "synthetique", "benchmark", "echauffement", "mesures", "adaptatif", "largeur",
+                       "budget", "max_repetitions")
+    reprise = JournalReprise.charger(args.reprise) if args.reprise else None
+    if reprise is not None:
+        for cle in config_campagne:
+            setattr(args, cle, reprise.config.get(cle))
+        print(f"Reprise de {args.reprise}: {len(reprise.termines)} répétitions déjà faites",
+              file=sys.stderr)
+    if args.seed is None:
+        args.seed = random.SystemRandom().getrandbits(63)
+    if args.reprise and reprise is None:
+        reprise = JournalReprise.creer(args.reprise, {cle: getattr(args, cle) for cle in config_campagne})
+
+    journal = JournalTrace(args.trace) if args.trace else None
+    instr = Instrumentation(journal)
+
+    grille = grille_marches(args.tailles, args.etablissements, args.ratios)
+    with instr.span("chargement"):
+        if args.synthetique:
+            students, universities = entites_synthetiques(max(n for n, _ in grille), max(m for _, m in grille))
+        else:
+            students = load_students_from_csv(STUDENTS_CSV)
+            universities = load_universities_from_csv(UNIVERSITIES_CSV)
+
+    marches = []
+    for n, m in grille:
+        if n > len(students) or m > len(universities):
+            print(f"Marché {n}×{m} ignoré: données insuffisantes (utilisez --synthetique)",
+                  file=sys.stderr)
+            continue
+        marches.append((n, m))
+
+    seed = args.seed
+    taches = planifier(marches, args.repetitions, seed)
+    if args.rejouer is not None:
+        taches = [(1, 1, *marches[0], args.rejouer)] if marches else []
+        if args.trace_propositions and marches:
+            trace = TracePropositions()
+            rejouer_repetition(students, universities, *marches[0], args.rejouer,
+                               moteur=args.moteur, modele=args.modele, trace=trace)
+            trace.exporter_csv(args.trace_propositions)
+            print(f"Trace: {len(trace)} événements ({trace.perdus} perdus) -> {args.trace_propositions}",
+                  file=sys.stderr)
+    elif args.trace_propositions:
+        print("--trace-propositions ignoré sans --rejouer", file=sys.stderr)
+    if reprise is not None:
+        taches = [t for t in taches if not reprise.est_termine(t[2], t[3], t[1])]
+
+    # En reprise, les lignes s'ajoutent à la sortie de la première exécution
+    mode_sortie = "a" if reprise is not None and reprise.termines else "w"
+    sortie = sys.stdout if args.sortie == "-" else open(args.sortie, mode_sortie, encoding="utf-8")
+    benchmark = None
+    if args.benchmark:
+        # Mesures concurrentes = bruit: le mode benchmark force un seul processus
+        if args.workers > 1:
+            print("Mode benchmark: --workers ignoré (mesures en série)", file=sys.stderr)
+            args.workers = 1
+        benchmark = ParametresBenchmark(echauffement=args.echauffement, mesures=args.mesures)
+
+    if args.comparer:
+        moteurs = list(MOTEURS) if args.comparer == "tous" else \
+            [m.strip() for m in args.comparer.split(",") if m.strip()]
+        inconnus = [m for m in moteurs if m not in MOTEURS]
+        if inconnus:
+            print(f"Erreur: moteur(s) inconnu(s): {', '.join(inconnus)}", file=sys.stderr)
+            return 2
+        return comparer(taches, students, universities, moteurs, args.modele, args.memoire, sortie)
+
+    if args.bandes is not None:
+        strategies = [d.strip() for d in args.departage.split(",") if d.strip()]
+        inconnues = [d for d in strategies if d not in DEPARTAGES]
+        if inconnues or args.bandes < 1 or args.tirages < 1:
+            print(f"Erreur: --bandes et --tirages >= 1, départages parmi {', '.join(DEPARTAGES)}",
+                  file=sys.stderr)
+            return 2
+        return departager(taches, students, universities, args.bandes, strategies, args.tirages,
+                          args.modele, sortie)
+
+    historique = HistoriqueResultats(args.historique) if args.historique else None
+    campagne = f"cli-{seed}"
+    temps_par_taille: Dict[Tuple[int, int], List[float]] = {}
+    mesures: List[Dict] = []
+    histogrammes: Dict[Tuple[int, int], HistogrammesRangs] = {}
+    en_attente: List[Tuple[str, Dict]] = []
+    try:
+        if args.adaptatif:
+            critere = CritereAdaptatif(metrique=args.adaptatif, largeur_ic=args.largeur,
+                                       budget_s=args.budget, max_repetitions=args.max_repetitions)
+            results = executer_adaptatif(marches, seed, critere, students, universities, args.moteur,
+                                         args.workers, journal, benchmark, args.modele, args.memoire, args.cache,
+                                         reprise)
+        else:
+            results = executer_campagne(taches, students, universities, args.moteur, args.workers,
+                                        journal, benchmark, args.modele, args.memoire, args.cache)
+        for result in results:
+            ligne = ligne_export(result, formater=False)
+            texte = json.dumps(ligne, ensure_ascii=False) + "\n"
+            if historique is not None:
+                historique.ajouter(result, campagne)
+            if reprise is None:
+                sortie.write(texte)
+                sortie.flush()
+            else:
+                # Sortie, historique et point de reprise avancent ensemble, par lots de l'historique
+                en_attente.append((texte, result))
+                if historique is None or len(en_attente) >= historique.taille_lot:
+                    _valider_lot(en_attente, sortie, historique, reprise)
+            cle = (ligne["Nb_Étudiants"], ligne["Nb_Établissements"])
+            if args.distributions:
+                histogrammes.setdefault(cle, HistogrammesRangs()).ajouter(result["distributions"])
+            temps_par_taille.setdefault(cle, []).append(ligne["Temps_Execution_ms"])
+            mesures.append({"nb_students": ligne["Nb_Étudiants"],
+                            "nb_universities": ligne["Nb_Établissements"],
+                            "exec_time_ms": ligne["Temps_Execution_ms"],
+                            "sat_students": ligne["Satisfaction_Étudiants"],
+                            "sat_universities": ligne["Satisfaction_Établissements"],
+                            "nb_unassigned": ligne["Non_Affectés"],
+                            "nb_propositions": ligne["Nb_Propositions"],
+                            "octets_par_agent": ligne["Octets_Par_Agent"]})
+    finally:
+        if en_attente:
+            _valider_lot(en_attente, sortie, historique, reprise)
+        if sortie is not sys.stdout:
+            sortie.close()
+        if journal is not None:
+            journal.fermer()
+        if historique is not None:
+            historique.fermer()
+        if reprise is not None:
+            reprise.fermer()
+    if reprise is not None:
+        reprise.terminer()
+
+    if benchmark is not None:
+        resume = [dict(nb_students=n, nb_universities=m, **resumer_echantillons(valeurs))
+                  for (n, m), valeurs in temps_par_taille.items()]
+        print(formater_resume(resume), file=sys.stderr)
+    if args.memoire:
+        print(formater_resume(resumer_par_taille(mesures, "octets_par_agent"), unite="o/agent"),
+              file=sys.stderr)
+    if args.ajustement:
+        print(formater_analyse(analyser_complexite(mesures)), file=sys.stderr)
+    for (n, m), histogramme in histogrammes.items():
+        print(f"Distribution des rangs, marché {n}×{m}:\n{histogramme.formater()}", file=sys.stderr)
+    if (args.etablissements or args.ratios) and args.rejouer is None:
+        print(formater_cartes(mesures, par_ratio=bool(args.ratios)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
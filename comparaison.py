@@ -0,0 +1,132 @@
+"""Comparaison de moteurs d'affectation sur des instances identiques."""
+import random
+from typing import Dict, List, Optional, Sequence
+
+from models import Student, University
+from experiences import generer_instance
+from matching import MOTEURS_ETUDIANTS_PROPOSANTS, MOTEURS_STABLES, obtenir_moteur
+from satisfaction import compter_paires_bloquantes
+from instrumentation import Instrumentation
+from statistiques import quantile
+
+
+def comparer_moteurs(
+    all_students: List[Student],
+    all_universities: List[University],
+    nb_students: int,
+    nb_universities: int,
+    moteurs: Sequence[str],
+    seed: Optional[int] = None,
+    modele: str = "uniforme",
+    memoire: bool = False,
+    repetition: int = 1,
+) -> List[Dict]:
+    """
+    Génère une instance puis la résout avec chaque moteur de `moteurs`.
+
+    Le premier moteur sert de référence: `identique` indique si l'affectation
+    est la même que la sienne (attendu entre moteurs à étudiants proposants),
+    `paires_bloquantes` compte les paires bloquantes (`stable` si aucune),
+    `acceleration` le rapport temps de référence / temps du moteur.
+
+    Returns:
+        Une ligne par moteur (temps, compteurs, pic mémoire, vérifications)
+    """
+    rng = random.Random(seed) if seed is not None else random
+    students, universities, prefs_etud, prefs_uni = generer_instance(
+        rng, all_students, all_universities, nb_students, nb_universities, modele)
+    capacites = {u.name: u.capacity for u in universities}
+
+    lignes = []
+    reference = None
+    for nom in moteurs:
+        algorithme = obtenir_moteur(nom)
+        instr = Instrumentation(memoire=memoire)
+        compteurs: Dict[str, int] = {}
+        with instr.span("affectation"):
+            affectations = algorithme(prefs_etud, prefs_uni, capacites, compteurs=compteurs)
+        if reference is None:
+            reference = affectations
+        nb_paires_bloquantes = compter_paires_bloquantes(affectations, prefs_etud, prefs_uni, capacites)
+        lignes.append({
+            "repetition": repetition,
+            "seed": seed,
+            "nb_students": nb_students,
+            "nb_universities": nb_universities,
+            "moteur": nom,
+            "exec_time_ms": instr.duree_ms("affectation"),
+            "nb_propositions": compteurs.get("propositions", 0),
+            "nb_rejets": compteurs.get("rejets", 0),
+            "nb_tours": compteurs.get("tours", 0),
+            "mem_aff_ko": instr.memoire_phases.get("affectation", {}).get("pic_octets", 0) / 1024,
+            "identique": affectations == reference,
+            "paires_bloquantes": nb_paires_bloquantes,
+            "stable": nb_paires_bloquantes == 0,
+        })
+
+    temps_reference = lignes[0]["exec_time_ms"] if lignes else 0.0
+    for ligne in lignes:
+        ligne["acceleration"] = temps_reference / ligne["exec_time_ms"] if ligne["exec_time_ms"] > 0 else 0.0
+    return lignes
+
+
+def desaccords(lignes: Sequence[Dict]) -> List[str]:
+    """
+    Anomalies d'une comparaison: instabilité d'un moteur stable (pas de TTC
+    ou de Boston, instables par construction) ou désaccord entre étudiants
+    proposants.
+    """
+    problemes = []
+    for ligne in lignes:
+        if not ligne["stable"] and ligne["moteur"] in MOTEURS_STABLES:
+            problemes.append(f"{ligne['moteur']}: affectation instable (n={ligne['nb_students']})")
+        if not ligne["identique"] and ligne["moteur"] in MOTEURS_ETUDIANTS_PROPOSANTS \
+                and lignes[0]["moteur"] in MOTEURS_ETUDIANTS_PROPOSANTS:
+            problemes.append(f"{ligne['moteur']}: résultat différent de {lignes[0]['moteur']} "
+                             f"(n={ligne['nb_students']})")
+    return problemes
+
+
+def resumer_comparaison(lignes: Sequence[Dict]) -> List[Dict]:
+    """
+    Médianes par (taille, moteur): temps, propositions, pic mémoire, paires
+    bloquantes et accélération par rapport au moteur de référence.
+    """
+    groupes: Dict[tuple, List[Dict]] = {}
+    for ligne in lignes:
+        groupes.setdefault((ligne["nb_students"], ligne["nb_universities"], ligne["moteur"]), []).append(ligne)
+
+    def mediane(valeurs):
+        return quantile(sorted(valeurs), 0.5)
+
+    resume = []
+    for (n, m, moteur), groupe in groupes.items():
+        resume.append({
+            "nb_students": n,
+            "nb_universities": m,
+            "moteur": moteur,
+            "repetitions": len(groupe),
+            "exec_time_ms": mediane([g["exec_time_ms"] for g in groupe]),
+            "nb_propositions": mediane([g["nb_propositions"] for g in groupe]),
+            "mem_aff_ko": mediane([g["mem_aff_ko"] for g in groupe]),
+            "acceleration": mediane([g["acceleration"] for g in groupe]),
+            "paires_bloquantes": mediane([g.get("paires_bloquantes", 0) for g in groupe]),
+            "identique": all(g["identique"] for g in groupe),
+            "stable": all(g["stable"] for g in groupe),
+        })
+    return resume
+
+
+def formater_comparaison(resume: Sequence[Dict]) -> str:
+    """Tableau texte du résumé (une ligne par taille et moteur)."""
+    lignes = [f"{'n×m':<11} {'moteur':<25} {'temps ms':>10} {'propositions':>12} "
+              f"{'mém. Ko':>9} {'accél.':>7}  vérif."]
+    for r in resume:
+        verif = ("=" if r["identique"] else "≠") + (
+            " stable" if r["stable"] else f" instable ({r['paires_bloquantes']:.0f} paires bloquantes)")
+        lignes.append(
+            f"{r['nb_students']}×{r['nb_universities']:<{10 - len(str(r['nb_students']))}} "
+            f"{r['moteur']:<25} {r['exec_time_ms']:>10.3f} {r['nb_propositions']:>12.0f} "
+            f"{r['mem_aff_ko']:>9.1f} {r['acceleration']:>6.2f}x  {verif}"
+        )
+    return "\n".join(lignes)
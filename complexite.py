@@ -0,0 +1,145 @@
+"""Ajustement empirique de la complexité (régression log-log et modèles candidats)."""
+import math
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from statistiques import quantile, quantile_student_95
+
+# Modèles candidats f(n); l'ajustement estime c dans y ≈ c · f(n)
+MODELES_COMPLEXITE: Dict[str, Callable[[float], float]] = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log(n),
+    "n²": lambda n: n * n,
+}
+
+
+def ajuster_loglog(ns: Sequence[float], valeurs: Sequence[float]) -> Dict[str, float]:
+    """
+    Régression linéaire de log(y) sur log(n): y ≈ a · n^k.
+
+    Returns:
+        exposant k, son erreur type et son IC95 (Student, k-2 ddl),
+        coefficient a et R². Les points non strictement positifs sont ignorés.
+    """
+    points = [(math.log(n), math.log(y)) for n, y in zip(ns, valeurs) if n > 0 and y > 0]
+    k = len(points)
+    if k < 2 or len({x for x, _ in points}) < 2:
+        return {"points": k, "exposant": float("nan"), "erreur_type": float("nan"),
+                "ic95_bas": float("nan"), "ic95_haut": float("nan"),
+                "coefficient": float("nan"), "r2": float("nan")}
+
+    mx = sum(x for x, _ in points) / k
+    my = sum(y for _, y in points) / k
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    sxy = sum((x - mx) * (y - my) for x, y in points)
+    pente = sxy / sxx
+    origine = my - pente * mx
+
+    residus = [y - (origine + pente * x) for x, y in points]
+    sse = sum(r * r for r in residus)
+    sst = sum((y - my) ** 2 for _, y in points)
+    if k > 2:
+        erreur_type = math.sqrt(sse / (k - 2) / sxx)
+        demi = quantile_student_95(k - 2) * erreur_type
+    else:
+        erreur_type = demi = float("nan")
+    return {
+        "points": k,
+        "exposant": pente,
+        "erreur_type": erreur_type,
+        "ic95_bas": pente - demi,
+        "ic95_haut": pente + demi,
+        "coefficient": math.exp(origine),
+        "r2": 1 - sse / sst if sst > 0 else 1.0,
+    }
+
+
+def ajuster_modeles(ns: Sequence[float], valeurs: Sequence[float]) -> List[Dict[str, float]]:
+    """
+    Ajuste y ≈ c · f(n) pour chaque modèle candidat (moindres carrés en log).
+
+    Returns:
+        Modèles triés du meilleur au moins bon ajustement (erreur RMS en log,
+        c'est-à-dire en écart relatif).
+    """
+    points = [(n, y) for n, y in zip(ns, valeurs) if n > 1 and y > 0]
+    resultats = []
+    if not points:
+        return resultats
+    for nom, f in MODELES_COMPLEXITE.items():
+        ecarts = [math.log(y) - math.log(f(n)) for n, y in points]
+        log_c = sum(ecarts) / len(ecarts)
+        rms = math.sqrt(sum((e - log_c) ** 2 for e in ecarts) / len(ecarts))
+        resultats.append({"modele": nom, "coefficient": math.exp(log_c), "rms_log": rms})
+    resultats.sort(key=lambda r: r["rms_log"])
+    return resultats
+
+
+def medianes_par_marche(results: Sequence[Dict], cle: str) -> Dict[Tuple[int, int], float]:
+    """Médiane de `cle` par marché (étudiants, établissements)."""
+    groupes: Dict[Tuple[int, int], List[float]] = {}
+    for result in results:
+        groupes.setdefault((result["nb_students"], result["nb_universities"]), []).append(result[cle])
+    return {marche: quantile(sorted(v), 0.5) for marche, v in sorted(groupes.items())}
+
+
+def series_marches(marches: Sequence[Tuple[int, int]]) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Regroupe les marchés en séries où seul n varie: à m fixé si chaque m est
+    mesuré pour plusieurs n (grille n × m), sinon à ratio m/n fixé (marchés
+    carrés, balayage par ratios).
+    """
+    par_m: Dict[int, List[Tuple[int, int]]] = {}
+    for n, m in sorted(marches):
+        par_m.setdefault(m, []).append((n, m))
+    if all(len(v) >= 2 for v in par_m.values()):
+        return {f"m={m}": v for m, v in sorted(par_m.items())}
+    par_ratio: Dict[float, List[Tuple[int, int]]] = {}
+    for n, m in sorted(marches):
+        par_ratio.setdefault(round(m / n, 2), []).append((n, m))
+    return {("m=n" if r == 1 else f"m/n={r:g}"): v for r, v in sorted(par_ratio.items())}
+
+
+def analyser_complexite(results: Sequence[Dict]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Ajuste le temps d'affectation et le nombre de propositions en fonction de
+    n, séparément pour chaque série de marchés (voir `series_marches`): des
+    marchés de même n et de m différents ne sont jamais mélangés.
+
+    Utilise les médianes par marché (robustes aux valeurs aberrantes).
+
+    Returns:
+        série -> {"temps": ..., "propositions": ...}
+    """
+    cles = (("exec_time_ms", "temps"), ("nb_propositions", "propositions"))
+    medianes = {cle: medianes_par_marche(results, cle) for cle, _ in cles}
+    analyse: Dict[str, Dict[str, Dict]] = {}
+    for serie, marches in series_marches(list(medianes["exec_time_ms"])).items():
+        ns = [n for n, _ in marches]
+        analyse[serie] = {}
+        for cle, nom in cles:
+            valeurs = [medianes[cle][marche] for marche in marches]
+            analyse[serie][nom] = {
+                "tailles": ns,
+                "medianes": valeurs,
+                "loglog": ajuster_loglog(ns, valeurs),
+                "modeles": ajuster_modeles(ns, valeurs),
+            }
+    return analyse
+
+
+def formater_analyse(analyse: Dict[str, Dict[str, Dict]]) -> str:
+    """Rapport texte par série: exposant ajusté avec IC95 et meilleur modèle candidat."""
+    lignes = []
+    for serie, metriques in analyse.items():
+        prefixe = f"[{serie}] " if len(analyse) > 1 else ""
+        for nom, a in metriques.items():
+            fit = a["loglog"]
+            if math.isnan(fit["exposant"]):
+                lignes.append(f"{prefixe}{nom}: pas assez de tailles distinctes pour ajuster")
+                continue
+            ic = "" if math.isnan(fit["ic95_bas"]) else f" [IC95 {fit['ic95_bas']:.2f}; {fit['ic95_haut']:.2f}]"
+            modeles = ", ".join(f"{m['modele']} ({m['rms_log']:.3f})" for m in a["modeles"])
+            lignes.append(
+                f"{prefixe}{nom} ∝ n^{fit['exposant']:.2f}{ic}, R²={fit['r2']:.3f} · modèles (erreur log): {modeles}"
+            )
+    return "\n".join(lignes)
@@ -0,0 +1,233 @@
+"""Décomposition du marché en sous-marchés indépendants (union-find) et résolution en parallèle."""
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from memoire_partagee import ZonePartagee, attacher
+from models import StudentKey, UniversityKey
+
+# Sous-marché: (préférences des étudiants, préférences des universités, capacités)
+SousMarche = Tuple[Dict[StudentKey, List[UniversityKey]], Dict[UniversityKey, List[StudentKey]],
+                   Dict[UniversityKey, int]]
+
+# En dessous de ce nombre d'entrées de préférences, le coût d'envoi aux
+# processus dépasse le gain: les composantes sont résolues sur place
+SEUIL_PARALLELE = 200_000
+
+
+class UnionFind:
+    """Ensembles disjoints sur 0..n-1 (union par taille, compression par division)."""
+
+    __slots__ = ("parent", "taille")
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.taille = [1] * n
+
+    def trouver(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def unir(self, a: int, b: int) -> int:
+        """Réunit les ensembles de a et b; retourne la nouvelle racine."""
+        a, b = self.trouver(a), self.trouver(b)
+        if a == b:
+            return a
+        if self.taille[a] < self.taille[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.taille[a] += self.taille[b]
+        return a
+
+
+def composantes_marche(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+) -> List[SousMarche]:
+    """
+    Composantes connexes du graphe d'acceptabilité, de la plus grande à la plus petite.
+
+    Une paire ne peut être appariée ni bloquante que si l'étudiant cite
+    l'université: les listes des étudiants suffisent à relier les agents.
+    Chaque liste d'étudiant reste entière dans sa composante; les listes
+    d'universités sont restreintes aux étudiants de leur composante (les
+    autres ne leur proposeront jamais). Les agents sans lien sont isolés.
+    """
+    universites = list(preferences_universites)
+    uf = UnionFind(len(universites))
+    # Étiquette (nœud de l'union-find, pas forcément racine) de chaque université:
+    # une liste entièrement dans un même ensemble se vérifie en un seul passage
+    # C, sans union entrée par entrée
+    etiquettes = {u: j for j, u in enumerate(universites)}
+    racine_etu: Dict[StudentKey, int] = {}
+    for etu, prefs in preferences_etudiants.items():
+        if not prefs:
+            continue
+        noeuds = set(map(etiquettes.__getitem__, prefs))
+        noeud = noeuds.pop()
+        racine = uf.trouver(noeud)
+        if noeuds or racine != noeud:
+            for autre in noeuds:
+                racine = uf.unir(racine, autre)
+            etiquettes.update(dict.fromkeys(prefs, racine))
+        racine_etu[etu] = racine
+
+    groupes: Dict[int, Tuple[list, list]] = {}
+    for j, uni in enumerate(universites):
+        groupes.setdefault(uf.trouver(j), ([], []))[1].append(uni)
+    composante_etu: Dict[StudentKey, int] = {}
+    for i, etu in enumerate(preferences_etudiants):
+        # Étudiant sans liste: composante isolée (clé négative)
+        cle = uf.trouver(racine_etu[etu]) if etu in racine_etu else -1 - i
+        composante_etu[etu] = cle
+        groupes.setdefault(cle, ([], []))[0].append(etu)
+
+    composantes = []
+    for cle, (etus, unis) in groupes.items():
+        prefs_uni = {}
+        for uni in unis:
+            prefs = preferences_universites[uni]
+            if prefs and set(map(composante_etu.get, prefs)) != {cle}:
+                prefs = [e for e in prefs if composante_etu.get(e) == cle]
+            prefs_uni[uni] = prefs
+        composantes.append((
+            {e: preferences_etudiants[e] for e in etus},
+            prefs_uni,
+            {u: capacites.get(u, 1) for u in unis},
+        ))
+    composantes.sort(key=lambda c: len(c[0]) + len(c[1]), reverse=True)
+    return composantes
+
+
+def _resoudre(sous_marche: SousMarche, moteur: str):
+    from matching import obtenir_moteur
+
+    compteurs: Dict[str, int] = {}
+    affectations = obtenir_moteur(moteur)(*sous_marche, compteurs=compteurs)
+    return affectations, compteurs
+
+
+def _partager(zone: ZonePartagee, sous_marche: SousMarche):
+    """
+    Publie une composante dans `zone` en listes indexées (voir
+    `matching.listes_indexees`), plus un bloc de sortie pour les titulaires.
+    """
+    from matching import listes_indexees
+
+    prefs_etud, prefs_uni, _ = sous_marche
+    etudiants, universites = list(prefs_etud), list(prefs_uni)
+    idx_etu = {e: i for i, e in enumerate(etudiants)}
+    idx_uni = {u: j for j, u in enumerate(universites)}
+    descripteurs = [zone.partager(t) for t in (*listes_indexees(prefs_etud, idx_uni),
+                                               *listes_indexees(prefs_uni, idx_etu))]
+    titulaires, sortie = zone.creer((len(universites),), np.int64)
+    return descripteurs + [sortie], titulaires, etudiants, universites
+
+
+def _resoudre_partage(descripteurs) -> Dict[str, int]:
+    """Worker: résout une composante partagée et écrit les titulaires dans le bloc de sortie."""
+    from matching import gale_shapley_tableaux
+
+    compteurs: Dict[str, int] = {}
+    with attacher(descripteurs) as tableaux:
+        tableaux[4][:] = gale_shapley_tableaux(*tableaux[:4], compteurs=compteurs)
+    return compteurs
+
+
+def _resoudre_en_parallele(composantes: List[SousMarche], moteur: str):
+    """
+    Résout les composantes dans le pool, la plus grande en premier.
+
+    Pour les moteurs à étudiants proposants (même appariement stable), les
+    listes indexées et les titulaires passent par la mémoire partagée: seuls
+    les descripteurs sont sérialisés, et la composante suivante est préparée
+    pendant que les workers calculent. Les autres moteurs reçoivent les
+    dictionnaires. Sur exception ou interruption, les tâches en attente sont
+    annulées et tous les blocs détruits.
+    """
+    from matching import MOTEURS_ETUDIANTS_PROPOSANTS
+
+    if moteur not in MOTEURS_ETUDIANTS_PROPOSANTS:
+        futures = [_pool().submit(_resoudre, c, moteur) for c in composantes]
+        return [f.result() for f in futures]
+
+    futures, en_cours = [], []
+    with ZonePartagee() as zone:
+        try:
+            for composante in composantes:
+                descripteurs, titulaires, etudiants, universites = _partager(zone, composante)
+                futures.append(_pool().submit(_resoudre_partage, descripteurs))
+                en_cours.append((titulaires, etudiants, universites))
+            resultats = []
+            for future, (titulaires, etudiants, universites) in zip(futures, en_cours):
+                sous_compteurs = future.result()
+                resultats.append((
+                    {u: [etudiants[t]] if t >= 0 else [] for u, t in zip(universites, titulaires.tolist())},
+                    sous_compteurs,
+                ))
+            return resultats
+        finally:
+            for future in futures:
+                future.cancel()
+            # Aucune vue ne doit survivre aux blocs
+            en_cours.clear()
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _pool() -> ProcessPoolExecutor:
+    """Pool de processus partagé (créé au premier besoin, fermé à la sortie)."""
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        atexit.register(_POOL.shutdown)
+    return _POOL
+
+
+def affectation_par_composantes(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    compteurs: Optional[Dict[str, int]] = None,
+    moteur: str = "gale_shapley",
+    parallele: Optional[bool] = None,
+) -> Dict[UniversityKey, List[StudentKey]]:
+    """
+    Résout chaque composante avec `moteur` puis fusionne les affectations.
+
+    Avec `parallele=None`, les composantes partent dans le pool de processus
+    seulement s'il y en a plusieurs, que le marché dépasse `SEUIL_PARALLELE`
+    entrées de préférences et que la machine a plusieurs cœurs; le temps
+    total tend alors vers celui de la plus grande composante. Les compteurs
+    sont sommés (tours: maximum).
+    """
+    composantes = composantes_marche(preferences_etudiants, preferences_universites, capacites)
+    # Composantes réduites à un agent: rien à apparier
+    a_resoudre = [c for c in composantes if c[0] and c[1]]
+    if parallele is None:
+        taille = sum(len(p) for p in preferences_etudiants.values()) + \
+            sum(len(p) for p in preferences_universites.values())
+        parallele = len(a_resoudre) > 1 and taille >= SEUIL_PARALLELE and (os.cpu_count() or 1) > 1
+    if parallele:
+        resultats = _resoudre_en_parallele(a_resoudre, moteur)
+    else:
+        resultats = [_resoudre(c, moteur) for c in a_resoudre]
+
+    affectations: Dict[UniversityKey, List[StudentKey]] = {uni: [] for uni in preferences_universites}
+    totaux = {"propositions": 0, "rejets": 0, "tours": 0, "composantes": len(composantes)}
+    for sous_affectations, sous_compteurs in resultats:
+        affectations.update(sous_affectations)
+        totaux["propositions"] += sous_compteurs.get("propositions", 0)
+        totaux["rejets"] += sous_compteurs.get("rejets", 0)
+        totaux["tours"] = max(totaux["tours"], sous_compteurs.get("tours", 0))
+    if compteurs is not None:
+        compteurs.update(totaux)
+    return affectations
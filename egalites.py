@@ -0,0 +1,311 @@
+"""
+Préférences des établissements avec égalités et affectation faiblement stable.
+
+Les égalités sont des classes de rangs: `classes[u][k]` est la classe de la
+k-ième entrée de la liste de u (croissante le long de la liste); deux
+étudiants de même classe sont indifférents pour u. Départager les égalités
+puis appliquer Gale-Shapley donne une affectation faiblement stable (aucune
+paire dont les deux membres se préfèrent strictement).
+"""
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import Student, StudentKey, University, UniversityKey
+from statistiques import quantile
+from trace_propositions import TracePropositions
+
+# unique: une loterie commune à tous les établissements (STB);
+# multiple: une loterie indépendante par établissement (MTB)
+DEPARTAGES = ("unique", "multiple")
+
+Classes = Dict[UniversityKey, np.ndarray]
+
+
+def classes_strictes(preferences_universites: Dict[UniversityKey, List[StudentKey]]) -> Classes:
+    """Aucune égalité: chaque entrée est seule dans sa classe."""
+    return {u: np.arange(len(prefs), dtype=np.int32) for u, prefs in preferences_universites.items()}
+
+
+def classes_par_bandes(preferences_universites: Dict[UniversityKey, List[StudentKey]],
+                       taille_bande: int) -> Classes:
+    """Bandes de score: les `taille_bande` premiers classés sont ex aequo, puis les suivants, etc."""
+    if taille_bande < 1:
+        raise ValueError("La taille des bandes doit être >= 1")
+    return {u: np.arange(len(prefs), dtype=np.int32) // taille_bande
+            for u, prefs in preferences_universites.items()}
+
+
+def classes_depuis_groupes(groupes: Sequence[Sequence[StudentKey]]) -> Tuple[List[StudentKey], np.ndarray]:
+    """[[e3], [e1, e2], [e4]] -> liste [e3, e1, e2, e4] et classes [0, 1, 1, 2]."""
+    liste = [etu for groupe in groupes for etu in groupe]
+    classes = np.repeat(np.arange(len(groupes), dtype=np.int32), [len(g) for g in groupes])
+    return liste, classes
+
+
+def groupes_depuis_classes(liste: Sequence[StudentKey], classes: Sequence[int]) -> List[List[StudentKey]]:
+    """Inverse de `classes_depuis_groupes`."""
+    groupes: List[List[StudentKey]] = []
+    precedente = None
+    for etu, classe in zip(liste, classes):
+        if classe != precedente:
+            groupes.append([])
+            precedente = classe
+        groupes[-1].append(etu)
+    return groupes
+
+
+def verifier_classes(preferences_universites: Dict[UniversityKey, List[StudentKey]], classes: Classes) -> None:
+    """Une classe par entrée, croissante le long de chaque liste; sinon ValueError."""
+    for uni, prefs in preferences_universites.items():
+        c = classes.get(uni)
+        if c is None or len(c) != len(prefs):
+            raise ValueError(f"Classes d'égalité absentes ou de mauvaise longueur pour '{uni}'")
+        if len(c) > 1 and np.any(np.diff(c) < 0):
+            raise ValueError(f"Classes d'égalité non croissantes le long de la liste de '{uni}'")
+
+
+class MarcheAvecEgalites:
+    """
+    Marché indexé une seule fois (listes plates, voir `matching.listes_indexees`)
+    pour départager les égalités et résoudre à répétition. Les choix des
+    étudiants restent en place d'un tirage à l'autre; seuls les rangs donnés
+    par les établissements changent: classe × base + numéro de loterie, sans
+    tri ni passage par les dictionnaires de noms.
+    """
+
+    def __init__(self, preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+                 preferences_universites: Dict[UniversityKey, List[StudentKey]],
+                 classes: Classes):
+        from matching import listes_indexees
+
+        verifier_classes(preferences_universites, classes)
+        self.etudiants = list(preferences_etudiants)
+        self.universites = list(preferences_universites)
+        idx_etu = {e: i for i, e in enumerate(self.etudiants)}
+        idx_uni = {u: j for j, u in enumerate(self.universites)}
+        self.longueurs_etu, self.choix_plats = listes_indexees(preferences_etudiants, idx_uni)
+        self.longueurs_uni, self.classes_plats = listes_indexees(preferences_universites, idx_etu)
+        n, m = len(self.etudiants), len(self.universites)
+        self._unis_plats = np.repeat(np.arange(m, dtype=np.int64), self.longueurs_uni)
+        self._rangs_plats = np.concatenate([np.asarray(classes[u], dtype=np.int64) for u in self.universites]) \
+            if m else np.zeros(0, dtype=np.int64)
+        # Base > tout numéro de loterie: les classes priment, la loterie départage à l'intérieur
+        self._base = max(n, len(self.classes_plats), 1)
+        self._non_classe = (int(self._rangs_plats.max(initial=0)) + 1) * self._base
+        self._choix: Optional[np.ndarray] = None
+        self._rang_uni: Optional[np.ndarray] = None
+        nouveau = np.ones(len(self._rangs_plats), dtype=bool)
+        nouveau[1:] = (self._unis_plats[1:] != self._unis_plats[:-1]) | \
+            (self._rangs_plats[1:] != self._rangs_plats[:-1])
+        self.nb_egalites = int(len(nouveau) - nouveau.sum())
+        # Rang de chaque couple (étudiant, établissement) dans la liste de l'étudiant, par recherche dichotomique
+        longueurs = self.longueurs_etu.astype(np.int64)
+        positions = np.arange(len(self.choix_plats), dtype=np.int64) - \
+            np.repeat(np.cumsum(longueurs) - longueurs, longueurs)
+        cles = np.repeat(np.arange(n, dtype=np.int64), longueurs) * m + self.choix_plats
+        ordre = np.argsort(cles, kind="stable")
+        self._cles_etu = cles[ordre]
+        self._rangs_etu = positions[ordre] + 1
+
+    def _cles(self, strategie: str, generateur: np.random.Generator) -> np.ndarray:
+        """Rang départagé de chaque entrée des listes plates des établissements."""
+        if strategie == "unique":
+            loterie = generateur.permutation(len(self.etudiants))[self.classes_plats]
+        elif strategie == "multiple":
+            loterie = generateur.permutation(len(self.classes_plats))
+        else:
+            raise ValueError(f"Départage inconnu '{strategie}'. Départages disponibles: {', '.join(DEPARTAGES)}")
+        return self._rangs_plats * self._base + loterie
+
+    def departager(self, strategie: str, generateur: np.random.Generator) -> np.ndarray:
+        """Listes plates des établissements, égalités départagées selon `strategie` (voir DEPARTAGES)."""
+        return self.classes_plats[np.lexsort((self._cles(strategie, generateur), self._unis_plats))]
+
+    def resoudre(self, strategie: str, generateur: np.random.Generator,
+                 compteurs: Optional[Dict[str, int]] = None) -> np.ndarray:
+        """Un tirage: titulaire de chaque établissement (-1: aucun)."""
+        from matching import choix_denses, gale_shapley_denses
+
+        if self._choix is None:
+            self._longueurs, self._choix = choix_denses(self.longueurs_etu, self.choix_plats)
+            # Les entrées absentes des listes gardent le rang non classé d'un tirage à l'autre
+            self._rang_uni = np.full((len(self.universites), len(self.etudiants)), self._non_classe, dtype=np.int64)
+        self._rang_uni[self._unis_plats, self.classes_plats] = self._cles(strategie, generateur)
+        return gale_shapley_denses(self._longueurs, self._choix, self._rang_uni, self._non_classe,
+                                   compteurs=compteurs)
+
+    def tirages(self, nb: int, strategie: str = "unique", seed: Optional[int] = None) -> np.ndarray:
+        """`nb` tirages indépendants: matrice nb × m des titulaires."""
+        generateur = np.random.default_rng(seed)
+        resultats = np.empty((nb, len(self.universites)), dtype=np.int64)
+        for t in range(nb):
+            resultats[t] = self.resoudre(strategie, generateur)
+        return resultats
+
+    def rangs_etudiants(self, titulaires: np.ndarray) -> np.ndarray:
+        """Rangs obtenus par les étudiants (0: non affecté), pour un ou plusieurs tirages (… × n)."""
+        titulaires = np.atleast_2d(titulaires)
+        nb, m = titulaires.shape
+        rangs = np.zeros((nb, len(self.etudiants)), dtype=np.int64)
+        tirage, uni = np.nonzero(titulaires >= 0)
+        etu = titulaires[tirage, uni]
+        rangs[tirage, etu] = self._rangs_etu[np.searchsorted(self._cles_etu, etu * m + uni)]
+        return rangs
+
+    def affectations(self, titulaires: np.ndarray) -> Dict[UniversityKey, List[StudentKey]]:
+        return {u: [self.etudiants[t]] if t >= 0 else [] for u, t in zip(self.universites, titulaires.tolist())}
+
+    def preferences_strictes(self, plats: np.ndarray) -> Dict[UniversityKey, List[StudentKey]]:
+        """Listes des établissements (noms) après départage."""
+        bornes = np.cumsum(self.longueurs_uni).tolist()
+        debut = 0
+        preferences = {}
+        for uni, fin in zip(self.universites, bornes):
+            preferences[uni] = [self.etudiants[i] for i in plats[debut:fin].tolist()]
+            debut = fin
+        return preferences
+
+    def distribution(self, titulaires: np.ndarray) -> Dict:
+        """
+        Distribution des issues sur des tirages (nb × m): satisfaction moyenne
+        et non affectés par tirage, affectations distinctes, part des
+        étudiants dont l'établissement dépend du tirage.
+        """
+        from satisfaction import satisfactions_depuis_rangs
+
+        rangs = self.rangs_etudiants(titulaires)
+        sat = satisfactions_depuis_rangs(rangs.ravel().astype(np.float64),
+                                         np.tile(self.longueurs_etu, len(rangs))).reshape(rangs.shape)
+        n = len(self.etudiants)
+        # Établissement obtenu par chaque étudiant à chaque tirage (-1: aucun)
+        obtenu = np.full(rangs.shape, -1, dtype=np.int64)
+        tirage, uni = np.nonzero(titulaires >= 0)
+        obtenu[tirage, titulaires[tirage, uni]] = uni
+        variables = np.any(obtenu != obtenu[:1], axis=0) if len(obtenu) else np.zeros(n, dtype=bool)
+        apparies = rangs > 0
+        nb_apparies = apparies.sum(axis=1)
+        return {
+            "tirages": len(titulaires),
+            "satisfaction_etudiants": sat.mean(axis=1) if n else np.zeros(len(titulaires)),
+            "rang_moyen": np.where(nb_apparies > 0, rangs.sum(axis=1) / np.maximum(nb_apparies, 1), 0.0),
+            "premiers_choix": (rangs == 1).sum(axis=1),
+            "nb_non_affectes": n - nb_apparies,
+            "affectations_distinctes": len(np.unique(titulaires, axis=0)) if len(titulaires) else 0,
+            "part_etudiants_variables": float(variables.mean()) if n else 0.0,
+        }
+
+    def probabilites(self, titulaires: np.ndarray) -> Dict[StudentKey, Dict[UniversityKey, float]]:
+        """Fréquence de chaque (étudiant, établissement) sur les tirages."""
+        nb, m = titulaires.shape
+        tirage, uni = np.nonzero(titulaires >= 0)
+        cles, effectifs = np.unique(titulaires[tirage, uni] * m + uni, return_counts=True)
+        probas: Dict[StudentKey, Dict[UniversityKey, float]] = {}
+        for cle, effectif in zip(cles.tolist(), effectifs.tolist()):
+            probas.setdefault(self.etudiants[cle // m], {})[self.universites[cle % m]] = effectif / nb
+        return probas
+
+
+def resumer_distribution(distribution: Dict) -> Dict:
+    """Distribution (voir `MarcheAvecEgalites.distribution`) réduite à la moyenne et aux percentiles 5/50/95."""
+    resume = {cle: distribution[cle] for cle in ("tirages", "affectations_distinctes", "part_etudiants_variables")}
+    for cle in ("satisfaction_etudiants", "rang_moyen", "premiers_choix", "nb_non_affectes"):
+        valeurs = sorted(distribution[cle].tolist())
+        resume[cle] = {"moyenne": sum(valeurs) / len(valeurs) if valeurs else 0.0,
+                       "p5": quantile(valeurs, 0.05), "p50": quantile(valeurs, 0.5),
+                       "p95": quantile(valeurs, 0.95)}
+    return resume
+
+
+def affectation_avec_egalites(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    classes: Classes,
+    strategie: str = "unique",
+    seed: Optional[int] = None,
+    moteur: str = "gale_shapley_numpy",
+    compteurs: Optional[Dict[str, int]] = None,
+    trace: Optional[TracePropositions] = None,
+) -> Tuple[Dict[UniversityKey, List[StudentKey]], Dict[UniversityKey, List[StudentKey]]]:
+    """
+    Un départage selon `strategie`, puis le moteur `moteur` sur les listes
+    départagées: faiblement stable avec un moteur stable. Retourne
+    l'affectation et les listes départagées des établissements.
+    """
+    from matching import obtenir_moteur
+
+    algorithme = obtenir_moteur(moteur)
+    marche = MarcheAvecEgalites(preferences_etudiants, preferences_universites, classes)
+    strictes = marche.preferences_strictes(marche.departager(strategie, np.random.default_rng(seed)))
+    affectations = algorithme(preferences_etudiants, strictes, capacites, compteurs=compteurs, trace=trace)
+    return affectations, strictes
+
+
+def comparer_departages(
+    all_students: List[Student],
+    all_universities: List[University],
+    nb_students: int,
+    nb_universities: int,
+    taille_bande: int,
+    strategies: Sequence[str] = DEPARTAGES,
+    nb_tirages: int = 100,
+    seed: Optional[int] = None,
+    modele: str = "uniforme",
+    repetition: int = 1,
+) -> List[Dict]:
+    """
+    Génère une instance, regroupe les listes des établissements en bandes de
+    `taille_bande` ex aequo, puis tire `nb_tirages` départages par stratégie
+    (mêmes graines de loterie pour chaque stratégie).
+
+    Returns:
+        Une ligne par stratégie (quantiles des métriques sur les tirages)
+    """
+    import time
+
+    from experiences import generer_instance
+
+    rng = random.Random(seed) if seed is not None else random
+    _, _, prefs_etud, prefs_uni = generer_instance(rng, all_students, all_universities,
+                                                   nb_students, nb_universities, modele)
+    marche = MarcheAvecEgalites(prefs_etud, prefs_uni, classes_par_bandes(prefs_uni, taille_bande))
+    graine_loterie = rng.getrandbits(63)
+
+    lignes = []
+    for strategie in strategies:
+        debut = time.perf_counter()
+        titulaires = marche.tirages(nb_tirages, strategie, seed=graine_loterie)
+        duree_ms = (time.perf_counter() - debut) * 1000
+        distribution = marche.distribution(titulaires)
+        ligne = {
+            "repetition": repetition,
+            "seed": seed,
+            "nb_students": nb_students,
+            "nb_universities": nb_universities,
+            "taille_bande": taille_bande,
+            "departage": strategie,
+            "temps_par_tirage_ms": duree_ms / max(nb_tirages, 1),
+        }
+        ligne.update(resumer_distribution(distribution))
+        lignes.append(ligne)
+    return lignes
+
+
+def formater_departages(lignes: Sequence[Dict]) -> str:
+    """Tableau texte: une ligne par instance et stratégie (moyenne [p5 ; p95] sur les tirages)."""
+    entete = (f"{'n×m':<11} {'rép.':>4} {'départage':<9} {'ms/tirage':>9} {'satisfaction étu.':>26} "
+              f"{'rang moyen':>20} {'1ers choix':>10} {'distinctes':>10} {'variables':>9}")
+    sorties = [entete]
+    for l in lignes:
+        sat, rang = l["satisfaction_etudiants"], l["rang_moyen"]
+        sorties.append(
+            f"{l['nb_students']}×{l['nb_universities']:<{10 - len(str(l['nb_students']))}} "
+            f"{l['repetition']:>4} {l['departage']:<9} {l['temps_par_tirage_ms']:>9.2f} "
+            f"{sat['moyenne']:>8.4f} [{sat['p5']:.4f} ; {sat['p95']:.4f}] "
+            f"{rang['moyenne']:>6.2f} [{rang['p5']:.2f} ; {rang['p95']:.2f}] "
+            f"{l['premiers_choix']['moyenne']:>10.1f} {l['affectations_distinctes']:>10} "
+            f"{l['part_etudiants_variables']:>8.1%}"
+        )
+    return "\n".join(sorties)
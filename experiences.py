@@ -0,0 +1,391 @@
+"""Exécution des répétitions de tests (partagée entre la GUI et la ligne de commande)."""
+import math
+import random
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import SimulationData, Student, University
+from preferences import generer_preferences
+from matching import MOTEURS_STABLES, obtenir_moteur
+from satisfaction import compter_paires_bloquantes, mesurer_satisfaction_globale
+from instrumentation import Instrumentation
+from benchmark import ParametresBenchmark, chronometrer
+from statistiques import Welford, resumer_echantillons
+from cache_resultats import CacheResultats, empreinte_instance
+
+
+# Colonnes de l'export CSV des tests multiples
+CSV_FIELDNAMES = [
+    "Test", "Répétition", "Nb_Étudiants", "Nb_Établissements",
+    "Satisfaction_Étudiants", "Satisfaction_Établissements",
+    "RangMoyen_Etudiants_Obs", "RangMoyen_Etudiants_Theorique",
+    "RangMoyen_Universites_Obs", "RangMoyen_Universites_Theorique",
+    "Part_Premier_Choix_Etudiants", "Part_Premier_Choix_Etablissements",
+    "Pire_Rang_Etudiants", "Pire_Rang_Etablissements", "Gini_Etudiants", "Gini_Etablissements",
+    "Non_Affectés", "Places_Vides", "Paires_Bloquantes", "Temps_Execution_ms", "Complexite_Theorique", "Complexite_Observee",
+    "Temps_Generation_ms", "Temps_Satisfaction_ms", "Nb_Propositions", "Nb_Rejets", "Nb_Tours",
+    "Nb_Mesures", "Temps_IQR_ms", "Temps_IC95_Bas_ms", "Temps_IC95_Haut_ms",
+    "Memoire_Pic_Generation_Ko", "Memoire_Pic_Affectation_Ko", "Memoire_Pic_Satisfaction_Ko",
+    "RSS_Mo", "Octets_Par_Agent", "Depuis_Cache", "Seed",
+    "Timestamp",
+]
+
+
+# Métriques pilotant les répétitions adaptatives (nom affiché -> clé du résultat)
+METRIQUES_ADAPTATIVES = {
+    "satisfaction": "sat_students",
+    "rang": "r_etu_obs",
+    "temps": "exec_time_ms",
+}
+
+
+@dataclass(frozen=True)
+class CritereAdaptatif:
+    """
+    Critère d'arrêt des répétitions adaptatives pour une taille.
+
+    On répète tant que la largeur totale de l'IC95 de la moyenne de
+    `metrique` dépasse `largeur_ic`, dans la limite de `budget_s` secondes
+    et de `max_repetitions`.
+    """
+    metrique: str = "satisfaction"
+    largeur_ic: float = 0.01
+    budget_s: float = 60.0
+    min_repetitions: int = 3
+    max_repetitions: int = 10000
+
+    @property
+    def cle(self) -> str:
+        return METRIQUES_ADAPTATIVES[self.metrique]
+
+    def atteint(self, accumulateur: Welford, ecoule_s: float) -> bool:
+        """Vrai quand il faut arrêter de répéter."""
+        if accumulateur.n >= self.max_repetitions or ecoule_s >= self.budget_s:
+            return True
+        if accumulateur.n < max(self.min_repetitions, 2):
+            return False
+        return 2 * accumulateur.demi_largeur_ic95() <= self.largeur_ic
+
+
+def grille_marches(tailles: Sequence[int], etablissements: Optional[Sequence[int]] = None,
+                   ratios: Optional[Sequence[float]] = None) -> List[Tuple[int, int]]:
+    """
+    Marchés (n étudiants, m établissements) d'un balayage de scalabilité.
+
+    Par défaut m = n (marchés carrés); avec `etablissements`, toute la grille
+    n × m; avec `ratios`, m = round(n · ratio) pour chaque ratio (au moins 1).
+    """
+    if etablissements and ratios:
+        raise ValueError("Choisir soit une liste d'établissements, soit des ratios m/n")
+    marches: List[Tuple[int, int]] = []
+    for n in tailles:
+        if etablissements:
+            colonnes = etablissements
+        elif ratios:
+            colonnes = [max(1, round(n * r)) for r in ratios]
+        else:
+            colonnes = [n]
+        for m in colonnes:
+            if (n, m) not in marches:
+                marches.append((n, m))
+    return marches
+
+
+def entites_synthetiques(nb_students: int, nb_universities: int):
+    """Crée des étudiants/établissements numérotés (tailles au-delà des CSV)."""
+    students = [Student(full_name=f"Étudiant {i}") for i in range(1, nb_students + 1)]
+    universities = [University(name=f"Établissement {i}") for i in range(1, nb_universities + 1)]
+    return students, universities
+
+
+def graine_repetition(graine_maitresse: int, nb_students: int, nb_universities: int,
+                      repetition: int) -> int:
+    """
+    Graine d'une répétition, déduite de la graine maîtresse de la campagne.
+
+    Équivaut à l'enfant (n, m, répétition) de `SeedSequence(graine_maitresse)`:
+    flux indépendants, et une répétition peut être rejouée (ou reprise) sans
+    rejouer les autres.
+    """
+    enfant = np.random.SeedSequence(graine_maitresse,
+                                    spawn_key=(nb_students, nb_universities, repetition))
+    return int(enfant.generate_state(1, np.uint64)[0] >> np.uint64(1))
+
+
+def generer_instance(rng, all_students, all_universities, nb_students, nb_universities,
+                     modele: str = "uniforme"):
+    """Sélection des entités et génération des préférences (ordre des tirages figé)."""
+    selected_students = rng.sample(all_students, nb_students)
+    selected_universities = rng.sample(all_universities, nb_universities)
+    prefs_etud, prefs_uni = generer_preferences(
+        selected_students, selected_universities, modele=modele, rng=rng)
+    return selected_students, selected_universities, prefs_etud, prefs_uni
+
+
+def rejouer_repetition(
+    all_students: List[Student],
+    all_universities: List[University],
+    nb_students: int,
+    nb_universities: int,
+    seed: int,
+    moteur: str = "gale_shapley",
+    modele: str = "uniforme",
+    trace=None,
+) -> SimulationData:
+    """
+    Reconstruit une répétition à partir de sa graine (mêmes entités, mêmes
+    préférences, même affectation) pour l'afficher en détail. Une `trace`
+    (`TracePropositions`) reçoit le déroulé des propositions.
+    """
+    rng = random.Random(seed)
+    students, universities, prefs_etud, prefs_uni = generer_instance(
+        rng, all_students, all_universities, nb_students, nb_universities, modele)
+    capacites = {u.name: u.capacity for u in universities}
+    affectations = obtenir_moteur(moteur)(prefs_etud, prefs_uni, capacites, trace=trace)
+    stats = mesurer_satisfaction_globale(affectations, prefs_etud, prefs_uni, capacites)
+    return SimulationData(students, universities, prefs_etud, prefs_uni, affectations, stats)
+
+
+def executer_repetition(
+    all_students: List[Student],
+    all_universities: List[University],
+    nb_students: int,
+    nb_universities: int,
+    test_num: int = 1,
+    repetition: int = 1,
+    seed: Optional[int] = None,
+    moteur: str = "gale_shapley",
+    instrumentation: Optional[Instrumentation] = None,
+    benchmark: Optional[ParametresBenchmark] = None,
+    modele: str = "uniforme",
+    memoire: bool = False,
+    cache: Optional[CacheResultats] = None,
+) -> Dict:
+    """
+    Exécute une répétition complète: sélection, préférences, affectation, satisfaction.
+
+    Si `seed` est fourni, la sélection et les préférences sont reproductibles;
+    sinon le RNG global du module `random` est utilisé. `modele` choisit le
+    modèle de préférences (voir `MODELES_PREFERENCES`). Chaque phase est
+    mesurée dans `instrumentation` (créée si absente).
+
+    En mode `benchmark`, l'affectation est ré-exécutée sur la même instance
+    (échauffement, mesures répétées, GC désactivé) et `exec_time_ms` est la
+    médiane des mesures.
+
+    Avec `memoire=True`, le pic d'allocations (tracemalloc) de chaque phase et
+    la RSS finale sont relevés; tracemalloc ralentit les phases mesurées.
+
+    Avec un `cache`, l'affectation et la satisfaction d'une instance déjà vue
+    (même empreinte) ne sont pas recalculées: les temps et compteurs
+    enregistrés sont repris et `depuis_cache` vaut True. Le cache est ignoré
+    en mode benchmark, dont le but est de chronométrer le moteur.
+
+    Returns:
+        Dictionnaire de résultat (mêmes clés que `multi_test_results` de la GUI)
+    """
+    rng = random.Random(seed) if seed is not None else random
+    instr = instrumentation if instrumentation is not None else Instrumentation()
+    # Une seule session tracemalloc pour toute la répétition
+    demarre_trace = memoire and not tracemalloc.is_tracing()
+    if memoire:
+        instr.memoire = True
+    if demarre_trace:
+        tracemalloc.start()
+    try:
+        return _executer_phases(all_students, all_universities, nb_students, nb_universities,
+                                test_num, repetition, rng, moteur, instr, benchmark, modele,
+                                cache if benchmark is None else None, seed)
+    finally:
+        if demarre_trace:
+            tracemalloc.stop()
+
+
+def _executer_phases(all_students, all_universities, nb_students, nb_universities,
+                     test_num, repetition, rng, moteur, instr, benchmark, modele, cache,
+                     seed) -> Dict:
+    """Corps de `executer_repetition` (phases mesurées)."""
+    algorithme = obtenir_moteur(moteur)
+    contexte = {"test": test_num, "n": nb_students, "m": nb_universities}
+
+    # Sélection aléatoire et génération des préférences
+    with instr.span("generation", **contexte):
+        selected_students, selected_universities, prefs_etud, prefs_uni = generer_instance(
+            rng, all_students, all_universities, nb_students, nb_universities, modele)
+        capacites = {u.name: u.capacity for u in selected_universities}
+    gen_time_ms = instr.spans[-1][2] / 1e6
+
+    cle_cache = None
+    en_cache = None
+    if cache is not None:
+        with instr.span("cache", **contexte):
+            cle_cache = empreinte_instance(prefs_etud, prefs_uni, capacites, moteur)
+            en_cache = cache.obtenir(cle_cache)
+
+    if en_cache is not None:
+        affectations, stats, compteurs, exec_time_ms, sat_time_ms = en_cache
+        resume_temps = resumer_echantillons([exec_time_ms])
+    else:
+        # Affectation (temps d'exécution + compteurs de la boucle)
+        compteurs: Dict[str, int] = {}
+        with instr.span("affectation", **contexte):
+            affectations = algorithme(prefs_etud, prefs_uni, capacites, compteurs=compteurs)
+        exec_time_ms = instr.spans[-1][2] / 1e6
+
+        resume_temps = resumer_echantillons([exec_time_ms])
+        if benchmark is not None:
+            with instr.span("benchmark", **contexte):
+                echantillons = chronometrer(
+                    lambda: algorithme(prefs_etud, prefs_uni, capacites), benchmark)
+            resume_temps = resumer_echantillons(echantillons)
+            exec_time_ms = resume_temps["mediane"]
+
+        # Satisfactions
+        with instr.span("satisfaction", **contexte):
+            stats = mesurer_satisfaction_globale(affectations, prefs_etud, prefs_uni, capacites)
+        sat_time_ms = instr.spans[-1][2] / 1e6
+
+        # Stabilité: mesurée pour TTC et Boston (aucune paire bloquante pour les moteurs stables)
+        if moteur not in MOTEURS_STABLES:
+            with instr.span("stabilite", **contexte):
+                stats["paires_bloquantes"] = compter_paires_bloquantes(
+                    affectations, prefs_etud, prefs_uni, capacites)
+
+        if cache is not None:
+            cache.enregistrer(cle_cache, (affectations, stats, compteurs, exec_time_ms, sat_time_ms))
+    for nom, valeur in compteurs.items():
+        instr.incrementer(nom, valeur)
+
+    # Compter les non affectés (étudiants) et les places restées vides (marchés n ≠ m)
+    nb_assigned = sum(len(students) for students in affectations.values())
+    nb_unassigned = nb_students - nb_assigned
+    nb_places_vides = sum(capacites.values()) - nb_assigned
+
+    # Calculer la complexité théorique: O(n²) où n est le nombre d'étudiants
+    complexite_theorique = nb_students * nb_students
+    # Calculer la complexité observée (temps / opérations théoriques)
+    complexite_observee = exec_time_ms / complexite_theorique if complexite_theorique > 0 else 0
+
+    # Rangs moyens observés sur les agents appariés. Pour un marché carré sans
+    # non affecté, c'est la relation linéaire E[r] = 1 + (1 - E[S]) * (n - 1);
+    # sinon les satisfactions nulles des agents seuls fausseraient cette relation.
+    r_etu_obs = stats["rang_moyen_etudiants"]
+    r_uni_obs = stats["rang_moyen_etablissements"]
+
+    # Distributions des rangs et stabilité (None pour les moteurs stables)
+    distributions = stats["distributions"]
+    dist_etu, dist_uni = distributions["etudiants"], distributions["universites"]
+    nb_paires_bloquantes = stats["paires_bloquantes"]
+
+    # Valeurs théoriques (Pittel): proposants ~ log n, receveurs ~ n / log n
+    # Utiliser n >= 2 pour éviter log(1)=0; pour n=1, le rang attendu vaut 1
+    r_etu_th = math.log(nb_universities) if nb_universities >= 2 else 1.0
+    r_uni_th = (nb_students / math.log(nb_students)) if nb_students >= 2 else 1.0
+
+    # Mémoire (0 si non mesurée)
+    pics = {nom: m["pic_octets"] for nom, m in instr.memoire_phases.items()}
+    rss = max((m["rss_octets"] for m in instr.memoire_phases.values()), default=0)
+    nb_agents = nb_students + nb_universities
+
+    return {
+        "test_num": test_num,
+        "repetition": repetition,
+        "nb_students": nb_students,
+        "nb_universities": nb_universities,
+        "seed": seed,
+        "moteur": moteur,
+        "modele": modele,
+        "sat_students": stats["moyenne_etudiants"],
+        "sat_universities": stats["moyenne_universites"],
+        "r_etu_obs": r_etu_obs,
+        "r_etu_th": r_etu_th,
+        "r_uni_obs": r_uni_obs,
+        "r_uni_th": r_uni_th,
+        "premier_choix_etu": dist_etu["part_premier_choix"],
+        "premier_choix_uni": dist_uni["part_premier_choix"],
+        "pire_rang_etu": dist_etu["pire_rang"],
+        "pire_rang_uni": dist_uni["pire_rang"],
+        "gini_etu": dist_etu["gini"],
+        "gini_uni": dist_uni["gini"],
+        # Histogrammes à classes fixes (voir `HistogrammesRangs`), hors export CSV
+        "distributions": distributions,
+        "nb_unassigned": nb_unassigned,
+        "nb_places_vides": nb_places_vides,
+        "nb_paires_bloquantes": nb_paires_bloquantes,
+        "exec_time_ms": exec_time_ms,
+        "complexite_theorique": complexite_theorique,
+        "complexite_observee": complexite_observee,
+        "gen_time_ms": gen_time_ms,
+        "sat_time_ms": sat_time_ms,
+        "nb_propositions": compteurs.get("propositions", 0),
+        "nb_rejets": compteurs.get("rejets", 0),
+        "nb_tours": compteurs.get("tours", 0),
+        "nb_mesures": resume_temps["n"],
+        "exec_time_iqr_ms": resume_temps["iqr"],
+        "exec_time_ic95_bas_ms": resume_temps["ic95_bas"],
+        "exec_time_ic95_haut_ms": resume_temps["ic95_haut"],
+        "mem_gen_ko": pics.get("generation", 0) / 1024,
+        "mem_aff_ko": pics.get("affectation", 0) / 1024,
+        "mem_sat_ko": pics.get("satisfaction", 0) / 1024,
+        "rss_mo": rss / (1024 * 1024),
+        # Pic de la phase la plus gourmande rapporté au nombre d'agents
+        "octets_par_agent": max(pics.values(), default=0) / nb_agents if nb_agents else 0.0,
+        "depuis_cache": en_cache is not None,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def ligne_export(result: Dict, formater: bool = True) -> Dict:
+    """
+    Convertit un résultat en ligne d'export (colonnes `CSV_FIELDNAMES`).
+
+    Avec `formater=False`, les valeurs numériques restent brutes (export JSON).
+    """
+    def fmt(value, spec):
+        return format(value, spec) if formater else value
+
+    return {
+        "Test": result["test_num"],
+        "Répétition": result["repetition"],
+        "Nb_Étudiants": result["nb_students"],
+        "Nb_Établissements": result["nb_universities"],
+        "Satisfaction_Étudiants": fmt(result["sat_students"], ".4f"),
+        "Satisfaction_Établissements": fmt(result["sat_universities"], ".4f"),
+        "RangMoyen_Etudiants_Obs": fmt(result.get("r_etu_obs", 0), ".4f"),
+        "RangMoyen_Etudiants_Theorique": fmt(result.get("r_etu_th", 0), ".4f"),
+        "RangMoyen_Universites_Obs": fmt(result.get("r_uni_obs", 0), ".4f"),
+        "RangMoyen_Universites_Theorique": fmt(result.get("r_uni_th", 0), ".4f"),
+        "Part_Premier_Choix_Etudiants": fmt(result.get("premier_choix_etu", 0), ".4f"),
+        "Part_Premier_Choix_Etablissements": fmt(result.get("premier_choix_uni", 0), ".4f"),
+        "Pire_Rang_Etudiants": result.get("pire_rang_etu", 0),
+        "Pire_Rang_Etablissements": result.get("pire_rang_uni", 0),
+        "Gini_Etudiants": fmt(result.get("gini_etu", 0), ".4f"),
+        "Gini_Etablissements": fmt(result.get("gini_uni", 0), ".4f"),
+        "Non_Affectés": result["nb_unassigned"],
+        "Places_Vides": result.get("nb_places_vides", 0),
+        "Paires_Bloquantes": result.get("nb_paires_bloquantes", ""),
+        "Temps_Execution_ms": fmt(result["exec_time_ms"], ".2f"),
+        "Complexite_Theorique": result["complexite_theorique"],
+        "Complexite_Observee": fmt(result["complexite_observee"], ".8f"),
+        "Temps_Generation_ms": fmt(result.get("gen_time_ms", 0), ".3f"),
+        "Temps_Satisfaction_ms": fmt(result.get("sat_time_ms", 0), ".3f"),
+        "Nb_Propositions": result.get("nb_propositions", 0),
+        "Nb_Rejets": result.get("nb_rejets", 0),
+        "Nb_Tours": result.get("nb_tours", 0),
+        "Nb_Mesures": result.get("nb_mesures", 1),
+        "Temps_IQR_ms": fmt(result.get("exec_time_iqr_ms", 0), ".4f"),
+        "Temps_IC95_Bas_ms": fmt(result.get("exec_time_ic95_bas_ms", result["exec_time_ms"]), ".4f"),
+        "Temps_IC95_Haut_ms": fmt(result.get("exec_time_ic95_haut_ms", result["exec_time_ms"]), ".4f"),
+        "Memoire_Pic_Generation_Ko": fmt(result.get("mem_gen_ko", 0), ".1f"),
+        "Memoire_Pic_Affectation_Ko": fmt(result.get("mem_aff_ko", 0), ".1f"),
+        "Memoire_Pic_Satisfaction_Ko": fmt(result.get("mem_sat_ko", 0), ".1f"),
+        "RSS_Mo": fmt(result.get("rss_mo", 0), ".1f"),
+        "Octets_Par_Agent": fmt(result.get("octets_par_agent", 0), ".1f"),
+        "Depuis_Cache": int(result.get("depuis_cache", False)),
+        "Seed": "" if result.get("seed") is None else result["seed"],
+        "Timestamp": result["timestamp"],
+    }
@@ -1,24 +1,59 @@
 #!/usr/bin/env python3
 """Interface graphique moderne pour le système d'affectation."""
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import random
 from typing import Optional, List, Dict
 import os
+import sys
+import json
 import math
 import csv
+import threading
+import sqlite3
 from datetime import datetime
-import time
-import matplotlib
-matplotlib.use('Agg')
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from models import Student, University, SimulationData, StudentKey, UniversityKey
 from data.data_loader import load_students_from_csv, load_universities_from_csv
 from preferences import generer_preferences_etudiants, generer_preferences_universites
-from matching import algorithme_affectation
-from satisfaction import mesurer_satisfaction_globale
+from satisfaction import HistogrammesRangs, libelles_classes_rangs
+from index_recherche import IndexRecherche, LigneIndexee
+from experiences import CSV_FIELDNAMES, executer_repetition, ligne_export
+from instrumentation import Instrumentation, ouvrir_journal_env
+from benchmark import ParametresBenchmark, resumer_par_taille, formater_resume
+from complexite import analyser_complexite, formater_analyse
+from experiences import METRIQUES_ADAPTATIVES, CritereAdaptatif
+from cache_resultats import CacheResultats, empreinte_instance
+from historique import METRIQUES, HistoriqueResultats
+from reprise import JournalReprise
+from experiences import graine_repetition, grille_marches, rejouer_repetition
+from benchmark import METRIQUES_RESUME, AgregatsParMarche, matrice_par_marche
+from cli import executer_campagne, planifier
+from comparaison import comparer_moteurs, desaccords, resumer_comparaison
+from matching import MOTEURS
+from trace_propositions import NOMS_ISSUES, RejeuTrace, TracePropositions
+from preferences import MODELES_PREFERENCES
+from egalites import DEPARTAGES, classes_depuis_groupes, classes_par_bandes, classes_strictes
+
+_STARTUP_IMPORTS_DONE = time.perf_counter()
+
+# matplotlib n'est importé qu'au premier affichage des courbes
+_MATPLOTLIB = None
+
+
+def load_matplotlib():
+    """Importe matplotlib à la demande et retourne (Figure, FigureCanvasTkAgg)."""
+    global _MATPLOTLIB
+    if _MATPLOTLIB is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        _MATPLOTLIB = (Figure, FigureCanvasTkAgg)
+    return _MATPLOTLIB
 
 # Constantes locales (remplace config.py)
 class UI:
@@ -88,6 +123,12 @@ class ScrollableFrame(ttk.Frame):
 
 STUDENTS_CSV = os.path.join("data", "etudiants.csv")
 UNIVERSITIES_CSV = os.path.join("data", "universites.csv")
+HISTORIQUE_DB = os.path.join("data", "historique.sqlite")
+REPRISE_PATH = os.path.join("data", "reprise_tests.jsonl")
+# Choix des établissements en mode scalabilité
+BALAYAGE_CARRE = "m = n"
+BALAYAGE_GRILLE = "grille n × m"
+BALAYAGE_RATIOS = "ratios m / n"
 
 
 class ModernMatchingApp:
@@ -105,20 +146,51 @@ class ModernMatchingApp:
         # Données
         self.all_students = []
         self.all_universities = []
+        self.data_ready = False
         self.simulation_data: Optional[SimulationData] = None
         self.multi_test_results: List[Dict] = []
         
+        # Mesures du démarrage (ms depuis le début de l'import du module)
+        self.startup_timings = {"imports_ms": (_STARTUP_IMPORTS_DONE - _STARTUP_T0) * 1000}
+        self.exit_when_ready = False
+        
+        # Mesure des phases (MARIAGE_TRACE=chemin pour un fichier de trace)
+        self.trace_journal = ouvrir_journal_env()
+        self.instrumentation = Instrumentation(self.trace_journal)
+        # Résultats déjà calculés (mêmes préférences), disque si MARIAGE_CACHE est défini
+        self.result_cache = CacheResultats(capacite=32, dossier=os.environ.get("MARIAGE_CACHE"))
+        # Historique SQLite des tests multiples (MARIAGE_HISTORIQUE=chemin pour une autre base)
+        try:
+            self.historique = HistoriqueResultats(os.environ.get("MARIAGE_HISTORIQUE", HISTORIQUE_DB))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Historique indisponible: {e}", file=sys.stderr)
+            self.historique = None
+        
+        # Ordonnanceur des travaux (créé au premier usage) et campagnes mises en file
+        self._scheduler = None
+        self._queued_campaigns: Dict[int, Dict] = {}
+        
         # Style
         self.setup_styles()
         
         # Interface
         self.create_widgets()
+        self._mark_startup("widgets_ms")
+        self.root.after_idle(lambda: self._mark_startup("first_paint_ms"))
         
-        # Charger les données
+        # Charger les données en arrière-plan pendant l'affichage de la fenêtre
         self.load_data()
     
     def on_closing(self):
         """Gère la fermeture de l'application."""
+        if self.trace_journal is not None:
+            self.trace_journal.fermer()
+        if self.historique is not None:
+            self.historique.fermer()
+        if getattr(self, "_reprise", None) is not None:
+            self._reprise.fermer()
+        if self._scheduler is not None:
+            self._scheduler.fermer()
         self.root.quit()
         self.root.destroy()
     
@@ -215,6 +287,10 @@ class ModernMatchingApp:
         self.create_universities_tab()
         self.create_assignments_tab()
         self.create_multi_test_tab()
+        self.create_comparison_tab()
+        self.create_trace_tab()
+        self.create_history_tab()
+        self.create_jobs_tab()
     
     def add_new_simulation_button(self, parent):
         """Ajoute un bouton 'Nouvelle simulation' en bas de l'onglet."""
@@ -292,6 +368,31 @@ class ModernMatchingApp:
                         variable=self.manual_mode_var, command=self.toggle_manual_prefs)
         manual_toggle.grid(row=row, column=0, columnspan=3, sticky="w", pady=(0, 10))
 
+        row += 1
+        self.trace_props_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(card, text="Enregistrer la trace des propositions (rejeu pas à pas)",
+                        variable=self.trace_props_var).grid(row=row, column=0, columnspan=3, sticky="w", pady=(0, 10))
+
+        # Égalités des établissements (bandes de score): départage aléatoire avant l'affectation
+        row += 1
+        ties_frame = ttk.Frame(card, style="Card.TFrame")
+        ties_frame.grid(row=row, column=0, columnspan=3, sticky="w", pady=(0, 10))
+        ttk.Label(ties_frame, text="Départage des égalités:", font=UI.TEXT_FONT,
+                  background=UI.WHITE).pack(side="left", padx=(0, 5))
+        self.tie_break_var = tk.StringVar(value="aucun")
+        ttk.Combobox(ties_frame, textvariable=self.tie_break_var, state="readonly",
+                     values=("aucun",) + DEPARTAGES, width=10).pack(side="left", padx=5)
+        ttk.Label(ties_frame, text="Bandes ex aequo:", font=UI.TEXT_FONT,
+                  background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.tie_band_var = tk.IntVar(value=1)
+        ttk.Spinbox(ties_frame, from_=1, to=1000, textvariable=self.tie_band_var, width=6).pack(side="left", padx=5)
+        ttk.Label(ties_frame, text="Tirages:", font=UI.TEXT_FONT,
+                  background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.tie_draws_var = tk.IntVar(value=1)
+        ttk.Spinbox(ties_frame, from_=1, to=10000, textvariable=self.tie_draws_var, width=6).pack(side="left", padx=5)
+        ttk.Label(ties_frame, text="(unique: une loterie commune · multiple: une par établissement)",
+                  font=UI.SMALL_FONT, foreground=UI.GRAY, background=UI.WHITE).pack(side="left", padx=(10, 0))
+
         row += 1
         # Conteneur repliable pour l'édition manuelle
         self.manual_prefs_frame = ttk.Frame(card, style="Card.TFrame")
@@ -307,7 +408,8 @@ class ModernMatchingApp:
 
         # Aide + mapping
         help_label = ttk.Label(self.manual_prefs_frame,
-            text="Saisie par ligne et Entrée\nÉtudiants → 1: a,b,c (1..N)\nÉtablissements → a: 3,1,2 (a..)",
+            text="Saisie par ligne et Entrée\nÉtudiants → 1: a,b,c (1..N)\n"
+                 "Établissements → a: 3,1=2,4 (a.., 1=2: ex aequo si départage des égalités)",
             font=UI.SMALL_FONT, foreground=UI.GRAY, background=UI.WHITE, justify="left")
         help_label.pack(anchor="w", pady=(6, 0))
 
@@ -363,6 +465,7 @@ class ModernMatchingApp:
         self.manual_universities = []
         self.custom_prefs_students = {}
         self.custom_prefs_universities = {}
+        self.custom_ties_universities = {}
 
         # Traces pour mettre à jour l'éditeur quand les nombres changent
         try:
@@ -479,6 +582,8 @@ class ModernMatchingApp:
              font=(UI.BUTTON_FONT[0], 14, "bold"),
              foreground="#0f172a", background=UI.WHITE).pack(anchor="w", pady=(0, 15))
         
+        self.add_search_bar(card, "students")
+        
         self.students_tree = self.create_tree(
             card,
             columns=("name", "university", "wish", "satisfaction"),
@@ -504,6 +609,8 @@ class ModernMatchingApp:
              font=(UI.BUTTON_FONT[0], 14, "bold"),
              foreground="#0f172a", background=UI.WHITE).pack(anchor="w", pady=(0, 15))
         
+        self.add_search_bar(card, "universities")
+        
         self.universities_tree = self.create_tree(
             card,
             columns=("name", "student", "rank", "satisfaction"),
@@ -533,15 +640,15 @@ class ModernMatchingApp:
             widths=(350, 220, 120, 160)
         )
     
-    def create_tree(self, parent, columns, headings, widths):
-        """Crée un tableau avec scrollbars."""
+    def create_tree(self, parent, columns, headings, widths, show="headings"):
+        """Crée un tableau avec scrollbars (`show="tree headings"` pour une arborescence)."""
         frame = ttk.Frame(parent)
         frame.pack(fill="both", expand=True)
         
         vsb = ttk.Scrollbar(frame, orient="vertical")
         hsb = ttk.Scrollbar(frame, orient="horizontal")
         
-        tree = ttk.Treeview(frame, columns=columns, show="headings",
+        tree = ttk.Treeview(frame, columns=columns, show=show,
                            yscrollcommand=vsb.set, xscrollcommand=hsb.set)
         
         vsb.config(command=tree.yview)
@@ -560,25 +667,125 @@ class ModernMatchingApp:
         
         return tree
     
+    def add_search_bar(self, parent, key):
+        """Ajoute une barre de recherche filtrant le tableau `key` via son index."""
+        if not hasattr(self, "search_vars"):
+            self.search_vars = {}
+            self.search_info_labels = {}
+            self.search_indexes = {}
+            self._search_jobs = {}
+        
+        bar = ttk.Frame(parent, style="Card.TFrame")
+        bar.pack(fill="x", pady=(0, 10))
+        ttk.Label(bar, text="🔍 Rechercher:", font=UI.TEXT_FONT,
+                  background=UI.WHITE).pack(side="left", padx=(0, 8))
+        var = tk.StringVar()
+        entry = ttk.Entry(bar, textvariable=var, width=50)
+        entry.pack(side="left")
+        entry.bind("<KeyRelease>", lambda e: self.schedule_search(key))
+        entry.bind("<Escape>", lambda e: (var.set(""), self.apply_search(key)))
+        info = ttk.Label(bar, text="ex: marie · unassigned · rank > 10 · satisfaction < 20%",
+                         font=UI.SMALL_FONT, foreground=UI.GRAY, background=UI.WHITE)
+        info.pack(side="left", padx=10)
+        
+        self.search_vars[key] = var
+        self.search_info_labels[key] = info
+        self.search_indexes[key] = IndexRecherche()
+    
+    def schedule_search(self, key):
+        """Regroupe les frappes clavier avant de filtrer."""
+        job = self._search_jobs.get(key)
+        if job is not None:
+            self.root.after_cancel(job)
+        self._search_jobs[key] = self.root.after(120, lambda: self.apply_search(key))
+    
+    def apply_search(self, key):
+        """Affiche uniquement les lignes correspondant à la requête (sans réinsertion)."""
+        self._search_jobs[key] = None
+        tree = self.students_tree if key == "students" else self.universities_tree
+        index = self.search_indexes[key]
+        start = time.perf_counter()
+        item_ids = index.rechercher(self.search_vars[key].get())
+        # set_children détache les lignes absentes sans les supprimer
+        tree.set_children("", *item_ids)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.search_info_labels[key].config(
+            text=f"{len(item_ids)} / {len(index)} lignes ({elapsed_ms:.1f} ms)")
+    
     def load_data(self):
-        """Charge les données depuis les CSV."""
-        try:
-            self.all_students = load_students_from_csv(STUDENTS_CSV)
-            self.all_universities = load_universities_from_csv(UNIVERSITIES_CSV)
-            
-            self.students_info.config(text=f"({len(self.all_students)} disponibles)")
-            self.universities_info.config(text=f"({len(self.all_universities)} disponibles)")
-            
-            if self.all_students:
-                self.nb_students_var.set(min(UI.DEFAULT_NB_STUDENTS, len(self.all_students)))
-            if self.all_universities:
-                self.nb_universities_var.set(min(UI.DEFAULT_NB_UNIVERSITIES, len(self.all_universities)))
-                
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Impossible de charger les données:\n{str(e)}")
+        """Charge les données depuis les CSV dans un thread (la fenêtre reste réactive)."""
+        self.data_ready = False
+        self._loaded_data = None
+        self.students_info.config(text="(chargement...)")
+        self.universities_info.config(text="(chargement...)")
+        
+        def worker():
+            # Lecture des fichiers uniquement: aucun appel Tk hors du thread principal
+            try:
+                with self.instrumentation.span("chargement"):
+                    self._loaded_data = (load_students_from_csv(STUDENTS_CSV),
+                                         load_universities_from_csv(UNIVERSITIES_CSV), None)
+            except Exception as e:
+                self._loaded_data = ([], [], e)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(20, self._poll_data_loaded)
+    
+    def _poll_data_loaded(self):
+        """Applique les données chargées dès que le thread a terminé."""
+        if self._loaded_data is None:
+            self.root.after(20, self._poll_data_loaded)
+            return
+        
+        students, universities, error = self._loaded_data
+        if error is not None:
+            self.students_info.config(text="")
+            self.universities_info.config(text="")
+            messagebox.showerror("Erreur", f"Impossible de charger les données:\n{str(error)}")
+            return
+        
+        self.all_students = students
+        self.all_universities = universities
+        self.data_ready = True
+        
+        self.students_info.config(text=f"({len(self.all_students)} disponibles)")
+        self.universities_info.config(text=f"({len(self.all_universities)} disponibles)")
+        
+        if self.all_students:
+            self.nb_students_var.set(min(UI.DEFAULT_NB_STUDENTS, len(self.all_students)))
+        if self.all_universities:
+            self.nb_universities_var.set(min(UI.DEFAULT_NB_UNIVERSITIES, len(self.all_universities)))
+        
+        self._mark_startup("data_ms")
+    
+    def ensure_data_ready(self):
+        """Prévient l'utilisateur si les CSV sont encore en cours de chargement."""
+        if not self.data_ready:
+            messagebox.showinfo("Patience", "Chargement des données en cours, réessayez dans un instant.")
+        return self.data_ready
+    
+    def _mark_startup(self, step):
+        """Enregistre une étape du démarrage et publie les mesures une fois complètes."""
+        if step in self.startup_timings:
+            return
+        self.startup_timings[step] = (time.perf_counter() - _STARTUP_T0) * 1000
+        if "first_paint_ms" not in self.startup_timings or "data_ms" not in self.startup_timings:
+            return
+        
+        # Suivi: MARIAGE_STARTUP_LOG=chemin ajoute une ligne JSON par démarrage
+        log_path = os.environ.get("MARIAGE_STARTUP_LOG")
+        record = dict(self.startup_timings, timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        if log_path:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        if self.exit_when_ready:
+            print(json.dumps(record))
+            self.on_closing()
     
     def run_simulation(self):
         """Lance la simulation."""
+        if not self.ensure_data_ready():
+            return
         try:
             nb_students = self.nb_students_var.get()
             nb_universities = self.nb_universities_var.get()
@@ -614,35 +821,102 @@ class ModernMatchingApp:
             # Capacités
             capacites = {u.name: u.capacity for u in selected_universities}
             
-            # Algorithme d'affectation
-            affectations = algorithme_affectation(prefs_etud, prefs_uni, capacites)
-            
-            # Satisfactions
-            stats = mesurer_satisfaction_globale(affectations, prefs_etud, prefs_uni, capacites)
-            
-            # Stocker les données
-            self.simulation_data = SimulationData(
-                students=selected_students,
-                universities=selected_universities,
-                preferences_students=prefs_etud,
-                preferences_universities=prefs_uni,
-                assignments=affectations,
-                satisfaction_stats=stats
-            )
+            # Égalités des établissements: saisies (mode manuel) ou bandes de score
+            departage = self.tie_break_var.get()
+            classes = None
+            if departage in DEPARTAGES:
+                if self.manual_mode_var.get():
+                    classes = self.build_manual_university_classes(prefs_uni)
+                else:
+                    classes = classes_par_bandes(prefs_uni, max(self.tie_band_var.get(), 1))
             
-            # Mettre à jour l'affichage
-            self.update_results()
-            
-            # Passer aux résultats
-            self.notebook.select(1)
+            # Affectation et satisfactions (réutilisées si l'instance a déjà été calculée,
+            # sauf si la trace des propositions est demandée ou les égalités tirées au sort);
+            # sinon travail interactif de l'ordonnanceur, prioritaire sur les campagnes en file
+            avec_trace = self.trace_props_var.get()
+            cle_cache = empreinte_instance(prefs_etud, prefs_uni, capacites)
+            en_cache = self.result_cache.obtenir(cle_cache) if not avec_trace and classes is None else None
+            instance = (selected_students, selected_universities, prefs_etud, prefs_uni, cle_cache)
+            if en_cache is not None:
+                affectations, stats = en_cache
+                self._finish_simulation(instance, affectations, stats, None, depuis_cache=True)
+                return
+            from ordonnanceur import PRIORITE_INTERACTIVE, travail_simulation
+            options = {"trace": avec_trace}
+            if classes is not None:
+                options.update(classes=classes, departage=departage, tirages=max(self.tie_draws_var.get(), 1))
+            travail = self._ordonnanceur().soumettre(
+                travail_simulation, (prefs_etud, prefs_uni, capacites), options,
+                nom=f"Simulation {nb_students}×{nb_universities}", priorite=PRIORITE_INTERACTIVE,
+                delai_s=self.job_timeout_var.get() or None)
+            self.root.after(50, self._poll_simulation, travail, instance)
             
-            self.status_label.config(text="✅ Simulation terminée avec succès!")
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la simulation:\n{str(e)}")
+            self.status_label.config(text="❌ Erreur lors de la simulation")
             self.run_button.config(state="normal")
-            
+    
+    def _poll_simulation(self, travail, instance):
+        """Attend (sans bloquer l'interface) la fin du travail de simulation."""
+        from ordonnanceur import TERMINE
+        if not travail.termine:
+            self.root.after(50, self._poll_simulation, travail, instance)
+            return
+        if travail.etat != TERMINE:
+            self.status_label.config(text=f"❌ Simulation {travail.etat}: {travail.erreur or ''}")
+            self.run_button.config(state="normal")
+            return
+        affectations, stats, trace, egalites = travail.resultat
+        try:
+            self._finish_simulation(instance, affectations, stats, trace, depuis_cache=False, egalites=egalites)
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la simulation:\n{str(e)}")
             self.status_label.config(text="❌ Erreur lors de la simulation")
             self.run_button.config(state="normal")
+    
+    def _finish_simulation(self, instance, affectations, stats, trace, depuis_cache, egalites=None):
+        """Mémorise et affiche le résultat d'une simulation."""
+        selected_students, selected_universities, prefs_etud, prefs_uni, cle_cache = instance
+        if egalites is not None:
+            # Résultat d'un tirage: affiché avec les listes départagées, jamais mis en cache
+            prefs_uni = egalites["preferences_universites"]
+        elif not depuis_cache:
+            self.result_cache.enregistrer(cle_cache, (affectations, stats))
+        if trace is not None:
+            self.load_trace(trace)
+        
+        # Stocker les données
+        self.simulation_data = SimulationData(
+            students=selected_students,
+            universities=selected_universities,
+            preferences_students=prefs_etud,
+            preferences_universities=prefs_uni,
+            assignments=affectations,
+            satisfaction_stats=stats
+        )
+        
+        # Mettre à jour l'affichage
+        with self.instrumentation.span("rendu", n=len(selected_students)):
+            self.update_results()
+        render_ms = self.instrumentation.spans[-1][2] / 1e6
+        
+        # Passer aux résultats
+        self.notebook.select(1)
+        
+        origine = " · résultat en cache" if depuis_cache else ""
+        if egalites is not None:
+            origine += (f" · départage {egalites['departage']}, "
+                        f"{egalites['paires_bloquantes_faibles']} paire(s) bloquante(s) au sens faible")
+            distribution = egalites["distribution"]
+            if distribution:
+                sat = distribution["satisfaction_etudiants"]
+                origine += (f"\n{distribution['tirages']} tirages: satisfaction étudiants {sat['moyenne']:.3f} "
+                            f"[p5 {sat['p5']:.3f} ; p95 {sat['p95']:.3f}] · "
+                            f"{distribution['affectations_distinctes']} affectations distinctes · "
+                            f"{distribution['part_etudiants_variables']:.0%} des étudiants dépendent du tirage")
+        self.status_label.config(
+            text=f"✅ Simulation terminée avec succès! (affichage: {render_ms:.0f} ms{origine})")
+        self.run_button.config(state="normal")
 
     # =====================
     # Préférences manuelles
@@ -746,7 +1020,10 @@ class ModernMatchingApp:
             return
         left, right = line.split(':', 1)
         letter = (left.strip().lower() or '')
-        order_idxs = [t.strip() for t in right.split(',') if t.strip()]
+        order_idxs = [t.strip() for t in right.replace('=', ',').split(',') if t.strip()]
+        # Classe d'égalité de chaque indice saisi: "1=2" place 1 et 2 ex aequo
+        tie_classes = {i.strip(): c for c, group in enumerate(t for t in right.split(',') if t.strip())
+                       for i in group.split('=') if i.strip()}
         # mapping
         letters = [chr(ord('a') + i) for i in range(min(len(self.manual_universities), 26))]
         if letter not in letters:
@@ -765,9 +1042,12 @@ class ModernMatchingApp:
             if si not in seen:
                 seen.append(si)
         self.custom_prefs_universities[uni_name] = [self.manual_students[int(i)-1].full_name for i in seen]
+        self.custom_ties_universities[uni_name] = {self.manual_students[int(i)-1].full_name: c
+                                                   for i, c in tie_classes.items() if i in idx_set}
         # clear
         self.university_line_var.set('')
-        self.university_line_info.config(text=f"Enregistré pour établi. {letter} → {','.join(order_idxs) if order_idxs else 'tous'}")
+        saisie = ','.join(t.strip() for t in right.split(',') if t.strip())
+        self.university_line_info.config(text=f"Enregistré pour établi. {letter} → {saisie or 'tous'}")
 
     def load_student_prefs(self, etu_name: str):
         self.student_prefs_listbox.delete(0, tk.END)
@@ -878,6 +1158,23 @@ class ModernMatchingApp:
                     order.append(x)
             result[u.name] = order
         return result
+
+    def build_manual_university_classes(self, prefs_uni):
+        """
+        Classes d'égalité saisies (a: 3,1=2,4), les étudiants non cités formant
+        une dernière classe; ordre strict pour les établissements sans saisie.
+        Les listes de `prefs_uni` sont réordonnées par classe.
+        """
+        classes = classes_strictes(prefs_uni)
+        for uni, order in prefs_uni.items():
+            saisies = self.custom_ties_universities.get(uni)
+            if not saisies:
+                continue
+            groupes = {}
+            for etu in order:
+                groupes.setdefault(saisies.get(etu, len(order)), []).append(etu)
+            order[:], classes[uni] = classes_depuis_groupes([groupes[c] for c in sorted(groupes)])
+        return classes
     
     def update_results(self):
         """Met à jour l'affichage des résultats."""
@@ -931,17 +1228,22 @@ class ModernMatchingApp:
             self.universities_prefs_tree.insert("", "end", values=(i, uni_name, prefs_nums), tags=(tag,))
         
         # Tous les étudiants
-        self.clear_tree(self.students_tree)
+        self.clear_search_tree("students", self.students_tree)
+        students_rows = []
         for i, student in enumerate(data.students):
             etu_name = student.full_name
             sat = data.satisfaction_stats["satisfactions_etudiants"].get(etu_name, 0.0)
             uni = assignment_map.get(etu_name, "Non affecté")
             wish = "-" if uni == "Non affecté" else str(data.preferences_students[etu_name].index(uni) + 1)
             tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            self.students_tree.insert("", "end", values=(etu_name, uni, wish, f"{sat:.1%}"), tags=(tag,))
+            item = self.students_tree.insert("", "end", values=(etu_name, uni, wish, f"{sat:.1%}"), tags=(tag,))
+            students_rows.append(LigneIndexee(
+                item, (etu_name, uni), None if wish == "-" else int(wish), sat, uni != "Non affecté"))
+        self.search_indexes["students"].construire(students_rows)
         
         # Toutes les universités
-        self.clear_tree(self.universities_tree)
+        self.clear_search_tree("universities", self.universities_tree)
+        universities_rows = []
         row_index = 0
         for university in data.universities:
             uni_name = university.name
@@ -957,17 +1259,29 @@ class ModernMatchingApp:
                     else:
                         rang = "?"
                     tag = 'evenrow' if row_index % 2 == 0 else 'oddrow'
-                    self.universities_tree.insert("", "end", 
+                    item = self.universities_tree.insert("", "end", 
                         values=(uni_name, etu_name, f"{rang}°", f"{sat:.1%}"),
                         tags=(tag,))
+                    universities_rows.append(LigneIndexee(
+                        item, (uni_name, etu_name), rang if rang != "?" else None, sat, True))
                     row_index += 1
             else:
                 # Si aucun étudiant affecté, afficher une ligne vide
                 tag = 'evenrow' if row_index % 2 == 0 else 'oddrow'
-                self.universities_tree.insert("", "end", 
+                item = self.universities_tree.insert("", "end", 
                     values=(uni_name, "Aucun", "-", f"{sat:.1%}"),
                     tags=(tag,))
+                universities_rows.append(LigneIndexee(item, (uni_name,), None, sat, False))
                 row_index += 1
+        self.search_indexes["universities"].construire(universities_rows)
+        
+        # Réappliquer les filtres en cours sur les nouvelles lignes
+        for key in ("students", "universities"):
+            if self.search_vars[key].get().strip():
+                self.apply_search(key)
+            else:
+                self.search_info_labels[key].config(
+                    text=f"{len(self.search_indexes[key])} lignes · ex: unassigned · rank > 10 · satisfaction < 20%")
         
         # Affectations détaillées
         self.clear_tree(self.assignments_tree)
@@ -983,9 +1297,17 @@ class ModernMatchingApp:
                 i += 1
     
     def clear_tree(self, tree):
-        """Vide un tableau."""
-        for item in tree.get_children():
-            tree.delete(item)
+        """Vide un tableau (une seule commande Tk pour toutes les lignes)."""
+        tree.delete(*tree.get_children())
+    
+    def clear_search_tree(self, key, tree):
+        """Vide un tableau indexé, y compris les lignes masquées par un filtre."""
+        index = self.search_indexes[key]
+        hidden = [ligne.item_id for ligne in index.lignes if tree.exists(ligne.item_id)]
+        if hidden:
+            tree.delete(*hidden)
+        self.clear_tree(tree)
+        index.construire([])
     
     def create_multi_test_tab(self):
         """Crée l'onglet de tests multiples."""
@@ -1066,6 +1388,82 @@ class ModernMatchingApp:
         # Cacher le mode scalabilité par défaut
         self.scalability_frame.pack_forget()
         
+        # Mode benchmark (mesures de temps robustes)
+        bench_frame = ttk.Frame(config_grid, style="Card.TFrame")
+        bench_frame.grid(row=2, column=0, columnspan=3, sticky="w", pady=5)
+        
+        self.benchmark_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bench_frame, text="Mode benchmark (GC désactivé)",
+                        variable=self.benchmark_var).pack(side="left", padx=(10, 5))
+        
+        self.memory_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bench_frame, text="Mesurer la mémoire (ralentit)",
+                        variable=self.memory_var).pack(side="left", padx=(10, 5))
+        
+        ttk.Label(bench_frame, text="Échauffement:", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.bench_warmup_var = tk.IntVar(value=2)
+        ttk.Spinbox(bench_frame, from_=0, to=20, textvariable=self.bench_warmup_var, width=6).pack(side="left", padx=5)
+        
+        ttk.Label(bench_frame, text="Mesures / instance:", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.bench_measures_var = tk.IntVar(value=10)
+        ttk.Spinbox(bench_frame, from_=1, to=200, textvariable=self.bench_measures_var, width=6).pack(side="left", padx=5)
+        
+        # Répétitions adaptatives (jusqu'à un IC95 cible)
+        adaptive_frame = ttk.Frame(config_grid, style="Card.TFrame")
+        adaptive_frame.grid(row=3, column=0, columnspan=3, sticky="w", pady=5)
+        
+        self.adaptive_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(adaptive_frame, text="Répétitions adaptatives",
+                        variable=self.adaptive_var).pack(side="left", padx=(10, 5))
+        
+        ttk.Label(adaptive_frame, text="Métrique:", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.adaptive_metric_var = tk.StringVar(value="satisfaction")
+        ttk.Combobox(adaptive_frame, textvariable=self.adaptive_metric_var, state="readonly",
+                     values=sorted(METRIQUES_ADAPTATIVES), width=12).pack(side="left", padx=5)
+        
+        ttk.Label(adaptive_frame, text="Largeur IC95:", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.adaptive_width_var = tk.DoubleVar(value=0.01)
+        ttk.Entry(adaptive_frame, textvariable=self.adaptive_width_var, width=8).pack(side="left", padx=5)
+        
+        ttk.Label(adaptive_frame, text="Budget / taille (s):", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.adaptive_budget_var = tk.IntVar(value=30)
+        ttk.Spinbox(adaptive_frame, from_=1, to=3600, textvariable=self.adaptive_budget_var, width=6).pack(side="left", padx=5)
+        
+        # Marchés déséquilibrés (scalabilité) et exécution en parallèle
+        sweep_frame = ttk.Frame(config_grid, style="Card.TFrame")
+        sweep_frame.grid(row=4, column=0, columnspan=3, sticky="w", pady=5)
+        
+        ttk.Label(sweep_frame, text="Établissements (scalabilité):", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(10, 5))
+        self.sweep_mode_var = tk.StringVar(value=BALAYAGE_CARRE)
+        ttk.Combobox(sweep_frame, textvariable=self.sweep_mode_var, state="readonly",
+                     values=(BALAYAGE_CARRE, BALAYAGE_GRILLE, BALAYAGE_RATIOS), width=14).pack(side="left", padx=5)
+        self.sweep_values_var = tk.StringVar(value="0.9, 1, 1.1")
+        ttk.Entry(sweep_frame, textvariable=self.sweep_values_var, width=22).pack(side="left", padx=5)
+        
+        ttk.Label(sweep_frame, text="Processus:", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.multi_workers_var = tk.IntVar(value=1)
+        ttk.Spinbox(sweep_frame, from_=1, to=os.cpu_count() or 1, textvariable=self.multi_workers_var, width=4).pack(side="left", padx=5)
+        
+        ttk.Label(sweep_frame, text="Préférences:", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.multi_model_var = tk.StringVar(value="uniforme")
+        ttk.Combobox(sweep_frame, textvariable=self.multi_model_var, state="readonly",
+                     values=MODELES_PREFERENCES, width=10).pack(side="left", padx=5)
+        
+        # Mécanisme (Gale-Shapley, TTC, Boston...): paires bloquantes dans les résultats
+        ttk.Label(sweep_frame, text="Moteur:", font=UI.TEXT_FONT, 
+                 background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.multi_engine_var = tk.StringVar(value="gale_shapley")
+        ttk.Combobox(sweep_frame, textvariable=self.multi_engine_var, state="readonly",
+                     values=list(MOTEURS), width=22).pack(side="left", padx=5)
+        
         # Boutons (compacts)
         button_frame = ttk.Frame(config_card, style="Card.TFrame")
         button_frame.pack(pady=(10, 0))
@@ -1089,6 +1487,36 @@ class ModernMatchingApp:
                         state="disabled")
         self.multi_export_button.pack(side="left", padx=3)
         
+        # Reprise d'une campagne interrompue (point de reprise sur disque)
+        self.multi_resume_button = tk.Button(button_frame, text="⏯ REPRENDRE", 
+                        font=(UI.BUTTON_FONT[0], 10, "bold"),
+                        bg="#d97706", fg=UI.WHITE, 
+                        activebackground="#b45309", activeforeground=UI.WHITE,
+                        cursor="hand2", relief="flat", padx=20, pady=10,
+                        borderwidth=0, highlightthickness=0,
+                        command=lambda: self.run_multi_test(reprendre=True),
+                        state="normal" if os.path.exists(REPRISE_PATH) else "disabled")
+        self.multi_resume_button.pack(side="left", padx=3)
+        
+        self.multi_replay_button = tk.Button(button_frame, text="🔁 REJOUER LA LIGNE", 
+                        font=(UI.BUTTON_FONT[0], 10, "bold"),
+                        bg="#0891b2", fg=UI.WHITE, 
+                        activebackground="#0e7490", activeforeground=UI.WHITE,
+                        cursor="hand2", relief="flat", padx=20, pady=10,
+                        borderwidth=0, highlightthickness=0,
+                        command=self.replay_selected_result)
+        self.multi_replay_button.pack(side="left", padx=3)
+        
+        # Campagne mise en file de l'ordonnanceur (suivi dans l'onglet « Travaux »)
+        self.multi_queue_button = tk.Button(button_frame, text="📥 EN FILE", 
+                        font=(UI.BUTTON_FONT[0], 10, "bold"),
+                        bg="#475569", fg=UI.WHITE, 
+                        activebackground="#334155", activeforeground=UI.WHITE,
+                        cursor="hand2", relief="flat", padx=20, pady=10,
+                        borderwidth=0, highlightthickness=0,
+                        command=self.queue_multi_test)
+        self.multi_queue_button.pack(side="left", padx=3)
+        
         # Status
         self.multi_status_label = ttk.Label(config_card, text="", font=UI.SMALL_FONT, 
                          foreground=UI.SECONDARY_COLOR, background=UI.WHITE)
@@ -1102,23 +1530,59 @@ class ModernMatchingApp:
              font=(UI.BUTTON_FONT[0], 12, "bold"),
              foreground="#0f172a", background=UI.WHITE).pack(anchor="w", pady=(0, 10))
         
+        # Résumé du temps d'exécution par taille (médiane, IQR, IC95)
+        self.multi_summary_label = ttk.Label(results_card, text="", font=UI.SMALL_FONT,
+                                             foreground="#334155", background=UI.WHITE, justify="left")
+        self.multi_summary_label.pack(anchor="w", pady=(0, 8))
+        
+        # Résumé en flux par marché (repliable) et lignes par répétition (optionnelles)
+        summary_bar = ttk.Frame(results_card, style="Card.TFrame")
+        summary_bar.pack(fill="x", pady=(0, 5))
+        self.multi_summary_toggle = ttk.Button(summary_bar, text="▾ Résumé par taille",
+                                               command=self.toggle_multi_summary)
+        self.multi_summary_toggle.pack(side="left")
+        self.show_repetitions_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(summary_bar, text="Afficher chaque répétition",
+                        variable=self.show_repetitions_var,
+                        command=self.toggle_multi_rows).pack(side="left", padx=(15, 5))
+        
+        self.multi_summary_frame = ttk.Frame(results_card, style="Card.TFrame")
+        self.multi_summary_frame.pack(fill="both", expand=True, pady=(0, 8))
+        self.multi_summary_tree = self.create_tree(
+            self.multi_summary_frame,
+            columns=("n", "moyenne", "ecart_type", "min", "p05", "p50", "p95", "max"),
+            headings=("Rép.", "Moyenne", "Écart-type", "Min", "P5", "Médiane", "P95", "Max"),
+            widths=(60, 100, 100, 90, 90, 90, 90, 90),
+            show="tree headings"
+        )
+        self.multi_summary_tree.heading("#0", text="Marché n × m / métrique")
+        self.multi_summary_tree.column("#0", width=260)
+        self.multi_summary_tree.configure(height=7)
+        self.multi_aggregates = AgregatsParMarche()
+        self._summary_dirty = set()
+        self._summary_update_job = None
+        
         self.multi_results_tree = self.create_tree(
             results_card,
-            columns=("test", "nb_etu", "nb_uni", "sat_etu", "sat_uni", "r_etu", "r_uni", "temps", "complexite"),
-            headings=("Test #", "Étudiants", "Établ.", "Sat. Étu.", "Sat. Établ.", "Rang Étud. (obs/th)", "Rang Univ. (obs/th)", "Temps (ms)", "Complexité"),
-            widths=(60, 80, 80, 100, 110, 140, 150, 90, 120)
+            columns=("test", "nb_etu", "nb_uni", "sat_etu", "sat_uni", "r_etu", "r_uni", "seuls", "bloquantes", "temps", "complexite",
+                     "t_gen", "t_sat", "compteurs", "memoire", "rss", "seed"),
+            headings=("Test #", "Étudiants", "Établ.", "Sat. Étu.", "Sat. Établ.", "Rang Étud. (obs/th)", "Rang Univ. (obs/th)", "Non aff. / Vides", "Paires bloq.", "Temps (ms)", "Complexité",
+                      "Génér. (ms)", "Satisf. (ms)", "Prop. / Rejets / Tours", "Pic Ko (gén/aff/sat)", "RSS (Mo)", "Graine"),
+            widths=(60, 80, 80, 100, 110, 140, 150, 110, 90, 90, 120, 90, 90, 150, 150, 80, 170)
         )
+        # Double-clic: rejouer la répétition dans les onglets détaillés
+        self.multi_results_tree.bind("<Double-1>", lambda e: self.replay_selected_result())
         
         # Card pour la courbe (séparée avec plus d'espace)
         curve_card = ttk.Frame(content_frame, style="Card.TFrame", padding=15)
         curve_card.grid(row=2, column=0, sticky="nsew", pady=(10, 0))
         
-        ttk.Label(curve_card, text="COURBE DE SATISFACTION", 
+        ttk.Label(curve_card, text="COURBES : SATISFACTION · TEMPS · RANGS", 
              font=(UI.BUTTON_FONT[0], 12, "bold"),
              foreground="#0f172a", background=UI.WHITE).pack(anchor="w", pady=(0, 10))
         
         # Bouton pour afficher la courbe
-        self.show_curve_button = tk.Button(curve_card, text="📈 Afficher la courbe", 
+        self.show_curve_button = tk.Button(curve_card, text="📈 Actualiser les courbes", 
                         font=(UI.BUTTON_FONT[0], 10, "bold"),
                         bg="#2563eb", fg=UI.WHITE, 
                         activebackground="#1d4ed8", activeforeground=UI.WHITE,
@@ -1128,6 +1592,28 @@ class ModernMatchingApp:
                         state="disabled")
         self.show_curve_button.pack(pady=(0, 10))
         
+        self.heatmap_button = tk.Button(curve_card, text="🗺️ Carte de chaleur n × m", 
+                        font=(UI.BUTTON_FONT[0], 10, "bold"),
+                        bg="#ea580c", fg=UI.WHITE, 
+                        activebackground="#c2410c", activeforeground=UI.WHITE,
+                        cursor="hand2", relief="flat", padx=20, pady=10,
+                        borderwidth=0, highlightthickness=0,
+                        command=self.show_heatmap,
+                        state="disabled")
+        self.heatmap_button.pack(pady=(0, 10))
+        
+        self.distribution_button = tk.Button(curve_card, text="📊 Distributions des rangs", 
+                        font=(UI.BUTTON_FONT[0], 10, "bold"),
+                        bg="#0d9488", fg=UI.WHITE, 
+                        activebackground="#0f766e", activeforeground=UI.WHITE,
+                        cursor="hand2", relief="flat", padx=20, pady=10,
+                        borderwidth=0, highlightthickness=0,
+                        command=self.show_rank_distribution,
+                        state="disabled")
+        self.distribution_button.pack(pady=(0, 10))
+        self.rank_histograms = HistogrammesRangs()
+        self.distribution_canvas = None
+        
         # Zone pour afficher la courbe
         self.curve_frame = ttk.Frame(curve_card, style="Card.TFrame")
         self.curve_frame.pack(fill="both", expand=True)
@@ -1141,28 +1627,105 @@ class ModernMatchingApp:
             self.simple_frame.pack_forget()
             self.scalability_frame.pack(side="left", fill="x", expand=True)
     
-    def run_multi_test(self):
-        """Lance les tests multiples."""
+    def _campaign_config(self):
+        """Configuration des tests multiples (conservée dans le point de reprise)."""
+        return {
+            "mode": self.test_mode_var.get(),
+            "nb_students": self.multi_nb_students_var.get(),
+            "nb_universities": self.multi_nb_universities_var.get(),
+            "repetitions": self.multi_repetitions_var.get(),
+            "sizes": self.sizes_var.get(),
+            "scalability_repetitions": self.scalability_repetitions_var.get(),
+            "sweep_mode": self.sweep_mode_var.get(),
+            "sweep_values": self.sweep_values_var.get(),
+            "workers": self.multi_workers_var.get(),
+            "modele": self.multi_model_var.get(),
+            "moteur": self.multi_engine_var.get(),
+            "benchmark": self.benchmark_var.get(),
+            "bench_warmup": self.bench_warmup_var.get(),
+            "bench_measures": self.bench_measures_var.get(),
+            "memory": self.memory_var.get(),
+            "adaptive": self.adaptive_var.get(),
+            "adaptive_metric": self.adaptive_metric_var.get(),
+            "adaptive_width": self.adaptive_width_var.get(),
+            "adaptive_budget": self.adaptive_budget_var.get(),
+        }
+    
+    def _apply_campaign_config(self, config):
+        """Restaure dans le formulaire la configuration d'une campagne reprise."""
+        variables = {
+            "mode": self.test_mode_var, "nb_students": self.multi_nb_students_var,
+            "nb_universities": self.multi_nb_universities_var, "repetitions": self.multi_repetitions_var,
+            "sizes": self.sizes_var, "scalability_repetitions": self.scalability_repetitions_var,
+            "sweep_mode": self.sweep_mode_var, "sweep_values": self.sweep_values_var,
+            "workers": self.multi_workers_var, "modele": self.multi_model_var,
+            "moteur": self.multi_engine_var,
+            "benchmark": self.benchmark_var, "bench_warmup": self.bench_warmup_var,
+            "bench_measures": self.bench_measures_var, "memory": self.memory_var,
+            "adaptive": self.adaptive_var, "adaptive_metric": self.adaptive_metric_var,
+            "adaptive_width": self.adaptive_width_var, "adaptive_budget": self.adaptive_budget_var,
+        }
+        for cle, var in variables.items():
+            if cle in config:
+                var.set(config[cle])
+    
+    def run_multi_test(self, reprendre=False):
+        """Lance les tests multiples (ou reprend la campagne interrompue)."""
+        if not self.ensure_data_ready():
+            return
+        reprise = None
+        if reprendre:
+            reprise = JournalReprise.charger(REPRISE_PATH)
+            if reprise is None:
+                messagebox.showwarning("Attention", "Aucune campagne interrompue à reprendre")
+                self.multi_resume_button.config(state="disabled")
+                return
+            self._apply_campaign_config(reprise.config)
         try:
             mode = self.test_mode_var.get()
             
             # Vider les résultats précédents
-            self.multi_test_results = []
-            self.clear_tree(self.multi_results_tree)
+            self.reset_multi_results()
+            
+            self._adaptive_criterion = None
+            if self.adaptive_var.get():
+                self._adaptive_criterion = CritereAdaptatif(
+                    metrique=self.adaptive_metric_var.get(),
+                    largeur_ic=self.adaptive_width_var.get(),
+                    budget_s=self.adaptive_budget_var.get(),
+                )
             
-            # Réinitialiser les données pour la courbe
-            self.sat_students_list = []
-            self.sat_universities_list = []
-            self.sizes_list = []
+            self._benchmark_params = None
+            if self.benchmark_var.get():
+                self._benchmark_params = ParametresBenchmark(
+                    echauffement=self.bench_warmup_var.get(),
+                    mesures=self.bench_measures_var.get(),
+                )
+            self._measure_memory = self.memory_var.get()
+            self._preference_model = self.multi_model_var.get()
+            self._engine = self.multi_engine_var.get()
             
-            # Nettoyer la zone de courbe
-            for widget in self.curve_frame.winfo_children():
-                widget.destroy()
+            # Point de reprise: graine maîtresse et répétitions terminées
+            if reprise is None:
+                config = self._campaign_config()
+                config["campagne"] = f"gui-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                config["seed"] = random.SystemRandom().getrandbits(63)
+                reprise = JournalReprise.creer(REPRISE_PATH, config)
+            elif self.historique is not None:
+                # Réafficher les répétitions déjà faites
+                for result in self.historique.repetitions_campagne(reprise.config["campagne"]):
+                    self._show_multi_result(result)
+            self._reprise = reprise
+            self._campaign_id = reprise.config["campagne"]
+            self._master_seed = reprise.config["seed"]
             
             self.multi_status_label.config(text="⏳ Tests en cours...")
             self.multi_run_button.config(state="disabled")
+            self.multi_resume_button.config(state="disabled")
             self.multi_export_button.config(state="disabled")
             self.show_curve_button.config(state="disabled")
+            self.heatmap_button.config(state="disabled")
+            self.distribution_button.config(state="disabled")
             self.root.update()
             
             test_num = 1
@@ -1175,167 +1738,1126 @@ class ModernMatchingApp:
                 
                 if nb_students > len(self.all_students) or nb_universities > len(self.all_universities):
                     messagebox.showwarning("Attention", "Nombre insuffisant de données disponibles")
-                    self.multi_run_button.config(state="normal")
+                    self._abandon_multi_test(reprise, reprendre)
                     return
                 
                 test_num = self._run_tests_for_size(nb_students, nb_universities, repetitions, test_num)
                 
             else:
-                # Mode scalabilité : plusieurs tailles
-                sizes_str = self.sizes_var.get()
+                # Mode scalabilité : plusieurs marchés (n, m)
                 try:
-                    sizes = [int(s.strip()) for s in sizes_str.split(',')]
-                except:
-                    messagebox.showerror("Erreur", "Format invalide pour les tailles (utilisez: 10, 50, 100)")
-                    self.multi_run_button.config(state="normal")
+                    sizes = [int(s.strip()) for s in self.sizes_var.get().split(',')]
+                    marches = self._sweep_markets(sizes)
+                except ValueError:
+                    messagebox.showerror("Erreur", "Format invalide pour les tailles (utilisez: 10, 50, 100) "
+                                                   "ou les établissements (50, 100 / ratios 0.9, 1.1)")
+                    self._abandon_multi_test(reprise, reprendre)
                     return
                 
                 repetitions = self.scalability_repetitions_var.get()
                 
-                for size in sizes:
-                    if size > len(self.all_students) or size > len(self.all_universities):
-                        messagebox.showwarning("Attention", f"Taille {size} ignorée: données insuffisantes")
+                valides = []
+                for n, m in marches:
+                    if n > len(self.all_students) or m > len(self.all_universities):
+                        messagebox.showwarning("Attention", f"Marché {n}×{m} ignoré: données insuffisantes")
                         continue
-                    
-                    test_num = self._run_tests_for_size(size, size, repetitions, test_num)
+                    valides.append((n, m))
+                
+                workers = self.multi_workers_var.get()
+                if workers > 1 and self._adaptive_criterion is None and self._benchmark_params is None:
+                    test_num = self._run_tests_parallel(valides, repetitions, workers)
+                else:
+                    for n, m in valides:
+                        test_num = self._run_tests_for_size(n, m, repetitions, test_num)
             
+            # Campagne achevée: le point de reprise n'est plus utile
+            reprise.terminer()
+            if self._summary_update_job is not None:
+                self.root.after_cancel(self._summary_update_job)
+            self.update_multi_summary()
+            self._reprise = None
+            if self.historique is not None:
+                self.historique.vider()
+            self.show_satisfaction_curve()
+            summary = "Temps d'affectation par taille:\n" + formater_resume(resumer_par_taille(self.multi_test_results))
+            if self._measure_memory:
+                summary += "\nPic mémoire par agent:\n" + formater_resume(
+                    resumer_par_taille(self.multi_test_results, "octets_par_agent"), unite="o/agent")
+            if mode == "scalability":
+                summary += "\nComplexité empirique:\n" + self.update_complexity_fit()
+            self.multi_summary_label.config(text=summary)
             self.multi_status_label.config(
                 text=f"✅ {len(self.multi_test_results)} tests terminés avec succès!")
-            self.multi_run_button.config(state="normal")
-            self.multi_export_button.config(state="normal")
-            self.show_curve_button.config(state="normal")
+            self._restore_multi_buttons()
             
         except Exception as e:
+            if reprise is not None:
+                reprise.fermer()
             messagebox.showerror("Erreur", f"Erreur lors des tests:\n{str(e)}")
             self.multi_status_label.config(text="❌ Erreur lors des tests")
-            self.multi_run_button.config(state="normal")
+            self._restore_multi_buttons()
+    
+    def _abandon_multi_test(self, reprise, reprendre):
+        """Saisie invalide avant la première répétition: point de reprise conservé s'il s'agissait d'une reprise."""
+        if reprendre:
+            reprise.fermer()
+        else:
+            reprise.terminer()
+        self._reprise = None
+        self.multi_status_label.config(text="")
+        self._restore_multi_buttons()
+    
+    def _restore_multi_buttons(self):
+        """Réactive les boutons des tests multiples selon les résultats affichés et le point de reprise."""
+        a_resultats = bool(self.multi_test_results)
+        self.multi_run_button.config(state="normal")
+        self.multi_resume_button.config(state="normal" if os.path.exists(REPRISE_PATH) else "disabled")
+        self.multi_export_button.config(state="normal" if a_resultats else "disabled")
+        self.show_curve_button.config(state="normal" if a_resultats else "disabled")
+        self.heatmap_button.config(
+            state="normal" if a_resultats and self.test_mode_var.get() == "scalability" else "disabled")
+        self.distribution_button.config(state="normal" if self.rank_histograms.repetitions else "disabled")
+    
+    def queue_multi_test(self):
+        """Met la configuration courante en file de l'ordonnanceur (campagne de fond)."""
+        if not self.ensure_data_ready():
+            return
+        try:
+            if self.test_mode_var.get() == "simple":
+                marches = [(self.multi_nb_students_var.get(), self.multi_nb_universities_var.get())]
+                repetitions = self.multi_repetitions_var.get()
+            else:
+                sizes = [int(s.strip()) for s in self.sizes_var.get().split(',')]
+                marches = self._sweep_markets(sizes)
+                repetitions = self.scalability_repetitions_var.get()
+            delai_s = self.job_timeout_var.get() or None
+        except (ValueError, tk.TclError):
+            messagebox.showerror("Erreur", "Configuration invalide pour la campagne")
+            return
+        valides = [(n, m) for n, m in marches
+                   if n <= len(self.all_students) and m <= len(self.all_universities)]
+        if len(valides) < len(marches):
+            messagebox.showwarning("Attention", f"{len(marches) - len(valides)} marché(s) ignoré(s): "
+                                                "données insuffisantes")
+        if not valides:
+            return
+        from ordonnanceur import travail_campagne
+        taches = planifier(valides, repetitions, random.SystemRandom().getrandbits(63))
+        campagne = f"file-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        travail = self._ordonnanceur().soumettre(
+            travail_campagne, (taches,),
+            {"moteur": self.multi_engine_var.get(), "modele": self.multi_model_var.get(),
+             "workers": self.multi_workers_var.get(),
+             "memoire": self.memory_var.get()},
+            nom=f"Campagne {self.multi_engine_var.get()} {', '.join(f'{n}×{m}' for n, m in valides)} "
+                f"· {repetitions} rép.",
+            delai_s=delai_s, progressif=True)
+        # Répétitions attendues et déjà écrites dans l'historique
+        self._queued_campaigns[travail.id] = {"campagne": campagne, "taches": len(taches), "enregistres": 0}
+        self.multi_status_label.config(text=f"📥 Campagne #{travail.id} en file (onglet « Travaux »)")
+    
+    def reset_multi_results(self):
+        """Vide les résultats, le résumé, les histogrammes et les courbes des tests multiples."""
+        self.multi_test_results = []
+        self.clear_tree(self.multi_results_tree)
+        self.reset_multi_summary()
+        self.rank_histograms.vider()
+        self.multi_summary_label.config(text="")
+        
+        # Réinitialiser les données pour la courbe
+        self.sat_students_list = []
+        self.sat_universities_list = []
+        self.sizes_list = []
+        
+        # Vider les courbes (la figure est conservée)
+        self.reset_curve_figure()
     
     def _run_tests_for_size(self, nb_students, nb_universities, repetitions, test_num):
-        """Lance les tests pour une taille donnée."""
-        for rep in range(repetitions):
-            # Sélection aléatoire pour cette répétition
-            selected_students = random.sample(self.all_students, nb_students)
-            selected_universities = random.sample(self.all_universities, nb_universities)
-            
-            # Générer les préférences
-            prefs_etud = generer_preferences_etudiants(selected_students, selected_universities)
-            prefs_uni = generer_preferences_universites(selected_students, selected_universities)
-            capacites = {u.name: u.capacity for u in selected_universities}
-            
-            # Mesurer le temps d'exécution
-            start_time = time.time()
-            affectations = algorithme_affectation(prefs_etud, prefs_uni, capacites)
-            end_time = time.time()
-            exec_time_ms = (end_time - start_time) * 1000
-            
-            # Satisfactions
-            stats = mesurer_satisfaction_globale(affectations, prefs_etud, prefs_uni, capacites)
-            
-            # Stocker les données pour la courbe
-            self.sat_students_list.append(stats["moyenne_etudiants"])
-            self.sat_universities_list.append(stats["moyenne_universites"])
-            self.sizes_list.append(nb_students)
-            
-            # Compter les non affectés
-            nb_assigned = sum(len(students) for students in affectations.values())
-            nb_unassigned = nb_students - nb_assigned
+        """
+        Lance les tests pour une taille donnée (nombre fixe ou adaptatif de répétitions).
+        
+        Les répétitions déjà présentes dans le point de reprise sont sautées.
+        """
+        critere = self._adaptive_criterion
+        reprise = self._reprise
+        if critere is not None:
+            accumulateur = reprise.accumulateur(nb_students, nb_universities, critere.cle)
+        start = time.perf_counter()
+        rep = 0
+        while True:
+            if critere is None:
+                if rep >= repetitions:
+                    break
+            elif critere.atteint(accumulateur, time.perf_counter() - start):
+                break
             
-            # Calculer la complexité théorique: O(n²) où n est le nombre d'étudiants
-            complexite_theorique = nb_students * nb_students
-            # Calculer la complexité observée (temps / opérations théoriques)
-            complexite_observee = exec_time_ms / complexite_theorique if complexite_theorique > 0 else 0
+            rep += 1
+            if reprise.est_termine(nb_students, nb_universities, rep):
+                test_num += 1
+                continue
             
-            # Rangs moyens observés (via relation linéaire avec la satisfaction moyenne)
-            # E[r] = 1 + (1 - E[S]) * (n - 1)
-            r_etu_obs = 1 + (1 - stats["moyenne_etudiants"]) * (nb_universities - 1)
-            r_uni_obs = 1 + (1 - stats["moyenne_universites"]) * (nb_students - 1)
-
-            # Valeurs théoriques (Pittel): proposants ~ log n, receveurs ~ n / log n
-            # Utiliser n >= 2 pour éviter log(1)=0; pour n=1, le rang attendu vaut 1
-            r_etu_th = math.log(nb_universities) if nb_universities >= 2 else 1.0
-            r_uni_th = (nb_students / math.log(nb_students)) if nb_students >= 2 else 1.0
-            
-            # Stocker les résultats
-            result = {
-                "test_num": test_num,
-                "repetition": rep + 1,
-                "nb_students": nb_students,
-                "nb_universities": nb_universities,
-                "sat_students": stats["moyenne_etudiants"],
-                "sat_universities": stats["moyenne_universites"],
-                "r_etu_obs": r_etu_obs,
-                "r_etu_th": r_etu_th,
-                "r_uni_obs": r_uni_obs,
-                "r_uni_th": r_uni_th,
-                "nb_unassigned": nb_unassigned,
-                "exec_time_ms": exec_time_ms,
-                "complexite_theorique": complexite_theorique,
-                "complexite_observee": complexite_observee,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            self.multi_test_results.append(result)
-            
-            # Afficher dans le tableau
-            tag = 'evenrow' if (test_num - 1) % 2 == 0 else 'oddrow'
-            self.multi_results_tree.insert("", "end", 
-                values=(
-                    test_num,
-                    nb_students,
-                    nb_universities,
-                    f"{stats['moyenne_etudiants']:.1%}",
-                    f"{stats['moyenne_universites']:.1%}",
-                    f"{r_etu_obs:.2f} / {r_etu_th:.2f}",
-                    f"{r_uni_obs:.2f} / {r_uni_th:.2f}",
-                    f"{exec_time_ms:.2f}",
-                    f"{complexite_observee:.6f} ms/n²"
-                ),
-                tags=(tag,))
+            result = executer_repetition(
+                self.all_students, self.all_universities,
+                nb_students, nb_universities,
+                test_num=test_num, repetition=rep,
+                seed=graine_repetition(self._master_seed, nb_students, nb_universities, rep),
+                moteur=self._engine,
+                instrumentation=Instrumentation(self.trace_journal),
+                benchmark=self._benchmark_params,
+                modele=self._preference_model,
+                memoire=self._measure_memory,
+            )
+            if critere is not None:
+                accumulateur.ajouter(result[critere.cle])
+                self.multi_status_label.config(
+                    text=f"⏳ {nb_students}×{nb_universities}: {accumulateur.n} répétitions, "
+                         f"IC95 ±{accumulateur.demi_largeur_ic95():.4g} ({critere.metrique})")
             
+            self._record_multi_result(result)
             test_num += 1
-            self.root.update()
         
         return test_num
     
-    def show_satisfaction_curve(self):
-        """Affiche la courbe de comparaison satisfaction étudiants vs universités."""
-        # Nettoyer la zone
-        for widget in self.curve_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.sat_students_list or not self.sat_universities_list:
-            ttk.Label(self.curve_frame, text="Aucune donnée à afficher", 
-                     font=UI.SMALL_FONT, background=UI.WHITE).pack(pady=20)
+    def _run_tests_parallel(self, marches, repetitions, workers):
+        """
+        Lance toutes les répétitions des marchés en `workers` processus (nombre
+        fixe de répétitions); les résultats arrivent dans l'ordre du plan.
+        """
+        taches = planifier(marches, repetitions, self._master_seed)
+        a_faire = [t for t in taches if not self._reprise.est_termine(t[2], t[3], t[1])]
+        results = executer_campagne(
+            a_faire, self.all_students, self.all_universities, moteur=self._engine, workers=workers,
+            journal=self.trace_journal, modele=self._preference_model, memoire=self._measure_memory,
+        )
+        for i, result in enumerate(results, start=1):
+            self.multi_status_label.config(
+                text=f"⏳ {result['nb_students']}×{result['nb_universities']}: "
+                     f"{i}/{len(a_faire)} répétitions ({workers} processus)")
+            self._record_multi_result(result)
+        return len(taches) + 1
+    
+    def _record_multi_result(self, result):
+        """Enregistre une répétition (historique puis reprise) et l'affiche."""
+        if self.historique is not None:
+            self.historique.ajouter(result, self._campaign_id)
+            # Le point de reprise ne doit pas devancer l'historique
+            self.historique.vider()
+        self._reprise.enregistrer(result)
+        self._show_multi_result(result)
+        self.schedule_curve_update()
+        self.root.update()
+    
+    def _sweep_markets(self, sizes):
+        """Marchés (n, m) du balayage de scalabilité selon le choix des établissements."""
+        mode = self.sweep_mode_var.get()
+        if mode == BALAYAGE_CARRE:
+            return grille_marches(sizes)
+        valeurs = [v.strip() for v in self.sweep_values_var.get().split(",") if v.strip()]
+        if mode == BALAYAGE_GRILLE:
+            etablissements = [int(v) for v in valeurs]
+            if not etablissements or min(etablissements) < 1:
+                raise ValueError("établissements")
+            return grille_marches(sizes, etablissements=etablissements)
+        ratios = [float(v) for v in valeurs]
+        if not ratios or min(ratios) <= 0:
+            raise ValueError("ratios")
+        return grille_marches(sizes, ratios=ratios)
+    
+    def _show_multi_result(self, result):
+        """Ajoute une répétition aux résultats, aux données des courbes et au tableau."""
+        self.multi_test_results.append(result)
+        
+        # Stocker les données pour la courbe
+        self.sat_students_list.append(result["sat_students"])
+        self.sat_universities_list.append(result["sat_universities"])
+        self.sizes_list.append(result["nb_students"])
+        
+        # Histogrammes de rangs cumulés (absents des lignes relues de l'historique)
+        if "distributions" in result:
+            self.rank_histograms.ajouter(result["distributions"])
+        
+        # Agrégats en flux du marché (tableau résumé mis à jour par lots)
+        self._summary_dirty.add(self.multi_aggregates.ajouter(result))
+        if self._summary_update_job is None:
+            self._summary_update_job = self.root.after(250, self.update_multi_summary)
+        
+        # Afficher dans le tableau (optionnel: coûteux pour des milliers de répétitions)
+        if self.show_repetitions_var.get():
+            self._insert_multi_row(len(self.multi_test_results) - 1, result)
+    
+    def _insert_multi_row(self, index, result):
+        """Insère la ligne d'une répétition (iid = position dans `multi_test_results`)."""
+        test_num = result["test_num"]
+        memoire = bool(result.get("mem_gen_ko"))
+        tag = 'evenrow' if (test_num - 1) % 2 == 0 else 'oddrow'
+        self.multi_results_tree.insert("", "end", iid=str(index),
+            values=(
+                test_num,
+                result["nb_students"],
+                result["nb_universities"],
+                f"{result['sat_students']:.1%}",
+                f"{result['sat_universities']:.1%}",
+                f"{result['r_etu_obs']:.2f} / {result['r_etu_th']:.2f}",
+                f"{result['r_uni_obs']:.2f} / {result['r_uni_th']:.2f}",
+                f"{result['nb_unassigned']} / {result.get('nb_places_vides') or 0}",
+                "—" if result.get("nb_paires_bloquantes") is None else result["nb_paires_bloquantes"],
+                f"{result['exec_time_ms']:.2f}",
+                f"{result['complexite_observee']:.6f} ms/n²",
+                f"{result['gen_time_ms']:.2f}",
+                f"{result['sat_time_ms']:.2f}",
+                f"{result['nb_propositions']} / {result['nb_rejets']} / {result['nb_tours']}",
+                f"{result['mem_gen_ko']:.0f} / {result['mem_aff_ko']:.0f} / {result['mem_sat_ko']:.0f}"
+                if memoire else "—",
+                f"{result['rss_mo']:.1f}" if memoire else "—",
+                "—" if result.get("seed") is None else result["seed"]
+            ),
+            tags=(tag,))
+    
+    def update_multi_summary(self):
+        """Rafraîchit les lignes du résumé des marchés modifiés depuis le dernier rafraîchissement."""
+        self._summary_update_job = None
+        tree = self.multi_summary_tree
+        formats = {"sat_students": "{:.2%}", "sat_universities": "{:.2%}", "exec_time_ms": "{:.3f}"}
+        for n, m in sorted(self._summary_dirty):
+            parent = f"{n}x{m}"
+            resumes = self.multi_aggregates.resume((n, m))
+            repetitions = next(iter(resumes.values()))["n"]
+            if not tree.exists(parent):
+                tree.insert("", "end", iid=parent, text=f"{n} × {m}", open=True)
+            tree.item(parent, values=(repetitions,))
+            for metrique, r in resumes.items():
+                fmt = formats.get(metrique, "{:.2f}")
+                values = (r["n"],) + tuple(fmt.format(r[c]) for c in
+                                           ("moyenne", "ecart_type", "min", "p05", "p50", "p95", "max"))
+                iid = f"{parent}/{metrique}"
+                if tree.exists(iid):
+                    tree.item(iid, values=values)
+                else:
+                    tree.insert(parent, "end", iid=iid, text=METRIQUES_RESUME[metrique], values=values)
+        self._summary_dirty.clear()
+    
+    def reset_multi_summary(self):
+        """Vide les agrégats et le tableau résumé."""
+        if self._summary_update_job is not None:
+            self.root.after_cancel(self._summary_update_job)
+            self._summary_update_job = None
+        self.multi_aggregates.vider()
+        self._summary_dirty.clear()
+        self.clear_tree(self.multi_summary_tree)
+    
+    def toggle_multi_summary(self):
+        """Replie ou déplie le tableau résumé."""
+        if self.multi_summary_frame.winfo_ismapped():
+            self.multi_summary_frame.pack_forget()
+            self.multi_summary_toggle.config(text="▸ Résumé par taille")
+        else:
+            self.multi_summary_frame.pack(fill="both", expand=True, pady=(0, 8),
+                                          before=self.multi_results_tree.master)
+            self.multi_summary_toggle.config(text="▾ Résumé par taille")
+    
+    def toggle_multi_rows(self):
+        """Affiche ou masque les lignes par répétition."""
+        self.clear_tree(self.multi_results_tree)
+        if self.show_repetitions_var.get():
+            for index, result in enumerate(self.multi_test_results):
+                self._insert_multi_row(index, result)
+    
+    def replay_selected_result(self):
+        """Rejoue la répétition sélectionnée (via sa graine) dans les onglets détaillés."""
+        selection = self.multi_results_tree.selection()
+        if not selection:
+            messagebox.showinfo("Information", "Sélectionnez une ligne du tableau à rejouer")
+            return
+        result = self.multi_test_results[int(selection[0])]
+        if result.get("seed") is None:
+            messagebox.showwarning("Attention", "Cette répétition n'a pas de graine enregistrée")
+            return
+        try:
+            trace = TracePropositions() if self.trace_props_var.get() else None
+            start = time.perf_counter()
+            self.simulation_data = rejouer_repetition(
+                self.all_students, self.all_universities,
+                result["nb_students"], result["nb_universities"], result["seed"],
+                moteur=result.get("moteur") or "gale_shapley",
+                modele=result.get("modele") or "uniforme",
+                trace=trace,
+            )
+            replay_ms = (time.perf_counter() - start) * 1000
+            if trace is not None:
+                self.load_trace(trace)
+            with self.instrumentation.span("rendu", n=result["nb_students"]):
+                self.update_results()
+            stats = self.simulation_data.satisfaction_stats
+            identique = math.isclose(stats["moyenne_etudiants"], result["sat_students"])
+            self.status_label.config(
+                text=f"🔁 Test #{result['test_num']} rejoué en {replay_ms:.0f} ms (graine {result['seed']})"
+                     + ("" if identique else " ⚠️ satisfaction différente de la ligne"))
+            self.notebook.select(1)
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors du rejeu:\n{str(e)}")
+    
+    def ensure_curve_figure(self):
+        """Crée une seule fois la figure persistante (3 panneaux) dans `curve_frame`."""
+        if getattr(self, "curve_canvas", None) is not None:
             return
         
-        # Créer la figure matplotlib
-        fig = Figure(figsize=(10, 5), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        # Tracer les courbes
-        ax.plot(range(1, len(self.sat_students_list) + 1), 
-                [s * 100 for s in self.sat_students_list], 
-                marker='o', linewidth=2, markersize=6, 
-                color='#3b82f6', label='Satisfaction Étudiants')
-        ax.plot(range(1, len(self.sat_universities_list) + 1), 
-                [s * 100 for s in self.sat_universities_list], 
-                marker='s', linewidth=2, markersize=6, 
-                color='#10b981', label='Satisfaction Établissements')
-        
-        # Configuration du graphique
-        ax.set_xlabel('Numéro de test', fontsize=10)
-        ax.set_ylabel('Satisfaction (%)', fontsize=10)
-        ax.set_title('Comparaison Satisfaction Étudiants vs Établissements', 
-                    fontsize=12, fontweight='bold', pad=15)
-        ax.legend(loc='best', fontsize=9)
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.set_ylim(0, 100)
+        Figure, FigureCanvasTkAgg = load_matplotlib()
+        fig = Figure(figsize=(12, 5), dpi=100)
+        ax_sat = fig.add_subplot(131)
+        ax_time = fig.add_subplot(132)
+        ax_rank = fig.add_subplot(133)
+        
+        # Satisfaction par test
+        line_sat_etu, = ax_sat.plot([], [], marker='o', linewidth=2, markersize=4,
+                                    color='#3b82f6', label='Satisfaction Étudiants')
+        line_sat_uni, = ax_sat.plot([], [], marker='s', linewidth=2, markersize=4,
+                                    color='#10b981', label='Satisfaction Établissements')
+        ax_sat.set_xlabel('Numéro de test', fontsize=9)
+        ax_sat.set_ylabel('Satisfaction (%)', fontsize=9)
+        ax_sat.set_title('Satisfaction Étudiants vs Établissements', fontsize=10, fontweight='bold')
+        ax_sat.legend(loc='best', fontsize=8)
+        ax_sat.grid(True, alpha=0.3, linestyle='--')
+        ax_sat.set_ylim(0, 100)
+        
+        # Temps d'exécution en fonction de n (log-log)
+        line_time, = ax_time.plot([], [], linestyle='none', marker='.', markersize=4,
+                                  color='#7c3aed', alpha=0.5, label='Répétitions')
+        line_time_med, = ax_time.plot([], [], marker='o', linewidth=2, markersize=5,
+                                      color='#4c1d95', label='Médiane par n')
+        line_time_fit, = ax_time.plot([], [], linestyle='--', linewidth=1.5,
+                                      color='#dc2626', label='Ajustement a·n^k')
+        ax_time.set_xscale('log')
+        ax_time.set_yscale('log')
+        ax_time.set_xlim(1, 1000)
+        ax_time.set_ylim(0.01, 1000)
+        ax_time.set_xlabel('n (étudiants)', fontsize=9)
+        ax_time.set_ylabel('Temps (ms)', fontsize=9)
+        ax_time.set_title("Temps d'exécution vs n", fontsize=10, fontweight='bold')
+        ax_time.legend(loc='best', fontsize=8)
+        ax_time.grid(True, which='both', alpha=0.3, linestyle='--')
+        
+        # Rangs observés vs théoriques (Pittel)
+        line_rank_etu, = ax_rank.plot([], [], linestyle='none', marker='o', markersize=4,
+                                      color='#3b82f6', label='Étudiants (log n)')
+        line_rank_uni, = ax_rank.plot([], [], linestyle='none', marker='s', markersize=4,
+                                      color='#10b981', label='Établissements (n / log n)')
+        line_rank_ref, = ax_rank.plot([], [], linestyle='--', linewidth=1, color='#6b7280',
+                                      label='obs = th')
+        ax_rank.set_xscale('log')
+        ax_rank.set_yscale('log')
+        ax_rank.set_xlim(1, 1000)
+        ax_rank.set_ylim(1, 1000)
+        ax_rank.set_xlabel('Rang théorique', fontsize=9)
+        ax_rank.set_ylabel('Rang observé', fontsize=9)
+        ax_rank.set_title('Rangs observés vs Pittel', fontsize=10, fontweight='bold')
+        ax_rank.legend(loc='best', fontsize=8)
+        ax_rank.grid(True, which='both', alpha=0.3, linestyle='--')
         
         fig.tight_layout()
         
-        # Intégrer dans tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self.curve_frame)
-        canvas.draw()
+        self.curve_figure = fig
+        self.curve_axes = {"sat": ax_sat, "time": ax_time, "rank": ax_rank}
+        self.curve_lines = {
+            "sat_etu": line_sat_etu, "sat_uni": line_sat_uni,
+            "time": line_time, "time_med": line_time_med, "time_fit": line_time_fit,
+            "rank_etu": line_rank_etu, "rank_uni": line_rank_uni, "rank_ref": line_rank_ref,
+        }
+        self._curve_update_job = None
+        
+        # Intégrer dans tkinter (une seule fois)
+        self.curve_canvas = FigureCanvasTkAgg(fig, master=self.curve_frame)
+        self.curve_canvas.get_tk_widget().pack(fill="both", expand=True)
+    
+    def reset_curve_figure(self):
+        """Vide les données des courbes sans reconstruire la figure."""
+        self.ensure_curve_figure()
+        for line in self.curve_lines.values():
+            line.set_data([], [])
+        self.curve_canvas.draw_idle()
+    
+    def schedule_curve_update(self, delay_ms=250):
+        """Planifie une mise à jour des courbes (au plus une toutes les `delay_ms`)."""
+        if getattr(self, "curve_canvas", None) is None or self._curve_update_job is not None:
+            return
+        self._curve_update_job = self.root.after(delay_ms, self.update_curve_data)
+    
+    def update_curve_data(self):
+        """Met à jour les courbes avec set_data puis draw_idle."""
+        self._curve_update_job = None
+        lines = self.curve_lines
+        results = self.multi_test_results
+        
+        x = list(range(1, len(self.sat_students_list) + 1))
+        lines["sat_etu"].set_data(x, [s * 100 for s in self.sat_students_list])
+        lines["sat_uni"].set_data(x, [s * 100 for s in self.sat_universities_list])
+        
+        points = [(r["nb_students"], r["exec_time_ms"]) for r in results if r["exec_time_ms"] > 0]
+        lines["time"].set_data([p[0] for p in points], [p[1] for p in points])
+        by_size = {}
+        for n, t in points:
+            by_size.setdefault(n, []).append(t)
+        sizes = sorted(by_size)
+        medians = [sorted(by_size[n])[len(by_size[n]) // 2] for n in sizes]
+        lines["time_med"].set_data(sizes, medians)
+        
+        lines["rank_etu"].set_data([r["r_etu_th"] for r in results], [r["r_etu_obs"] for r in results])
+        lines["rank_uni"].set_data([r["r_uni_th"] for r in results], [r["r_uni_obs"] for r in results])
+        bounds = [v for r in results for v in (r["r_etu_th"], r["r_uni_th"], r["r_etu_obs"], r["r_uni_obs"]) if v > 0]
+        if bounds:
+            lines["rank_ref"].set_data([min(bounds), max(bounds)], [min(bounds), max(bounds)])
+        
+        has_data = {"sat": bool(x), "time": bool(points), "rank": bool(bounds)}
+        for key, ax in self.curve_axes.items():
+            if has_data[key]:
+                ax.relim()
+                ax.set_autoscale_on(True)
+                ax.autoscale_view(scaley=(key != "sat"))
+        if x:
+            self.curve_axes["sat"].set_xlim(0.5, len(x) + 0.5)
+        
+        self.curve_canvas.draw_idle()
+    
+    def update_complexity_fit(self):
+        """Ajuste la complexité empirique (scalabilité) et trace l'ajustement."""
+        analyse = analyser_complexite(self.multi_test_results)
+        self.ensure_curve_figure()
+        line = self.curve_lines["time_fit"]
+        if not analyse:
+            line.set_data([], [])
+            self.curve_canvas.draw_idle()
+            return formater_analyse(analyse)
+        # Série tracée: celle qui couvre le plus de tailles (toutes figurent dans le rapport)
+        serie, metriques = max(analyse.items(), key=lambda item: len(item[1]["temps"]["tailles"]))
+        fit = metriques["temps"]["loglog"]
+        sizes = metriques["temps"]["tailles"]
+        if len(sizes) >= 2 and not math.isnan(fit["exposant"]):
+            xs = [min(sizes) * (max(sizes) / min(sizes)) ** (i / 50) for i in range(51)]
+            line.set_data(xs, [fit["coefficient"] * x ** fit["exposant"] for x in xs])
+            suffixe = f" ({serie})" if len(analyse) > 1 else ""
+            line.set_label(f"Ajustement n^{fit['exposant']:.2f}{suffixe}")
+            self.curve_axes["time"].legend(loc='best', fontsize=8)
+        else:
+            line.set_data([], [])
+        self.curve_canvas.draw_idle()
+        return formater_analyse(analyse)
+    
+    def show_heatmap(self):
+        """Cartes de chaleur (n × m ou n × ratio) de la satisfaction et du temps."""
+        results = self.multi_test_results
+        if not results:
+            return
+        import numpy as np
+        Figure, FigureCanvasTkAgg = load_matplotlib()
+        par_ratio = self.sweep_mode_var.get() == BALAYAGE_RATIOS
+        
+        window = tk.Toplevel(self.root)
+        window.title("Cartes de chaleur n × m")
+        window.geometry("1300x480")
+        fig = Figure(figsize=(13, 4.5), dpi=100)
+        panneaux = (("sat_students", "Satisfaction étudiants", "moyenne", "{:.0%}", "Blues"),
+                    ("sat_universities", "Satisfaction établissements", "moyenne", "{:.0%}", "Greens"),
+                    ("exec_time_ms", "Temps médian (ms)", "mediane", "{:.3g}", "Purples"))
+        for i, (cle, titre, statistique, fmt, cmap) in enumerate(panneaux, start=1):
+            lignes, colonnes, matrice = matrice_par_marche(results, cle, par_ratio, statistique)
+            valeurs = np.ma.masked_invalid(np.array(
+                [[np.nan if v is None else v for v in ligne] for ligne in matrice], dtype=float))
+            ax = fig.add_subplot(1, 3, i)
+            image = ax.imshow(valeurs, cmap=cmap, aspect="auto", origin="lower")
+            fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+            ax.set_xticks(range(len(colonnes)))
+            ax.set_xticklabels([str(c) for c in colonnes], fontsize=8)
+            ax.set_yticks(range(len(lignes)))
+            ax.set_yticklabels([str(n) for n in lignes], fontsize=8)
+            ax.set_xlabel("m / n" if par_ratio else "m (établissements)", fontsize=9)
+            ax.set_ylabel("n (étudiants)", fontsize=9)
+            ax.set_title(titre, fontsize=10, fontweight='bold')
+            if len(lignes) * len(colonnes) <= 100:
+                for y, ligne in enumerate(matrice):
+                    for x, v in enumerate(ligne):
+                        if v is not None:
+                            ax.text(x, y, fmt.format(v), ha="center", va="center", fontsize=7)
+        fig.tight_layout()
+        canvas = FigureCanvasTkAgg(fig, master=window)
         canvas.get_tk_widget().pack(fill="both", expand=True)
+        canvas.draw_idle()
+    
+    def show_rank_distribution(self):
+        """Remplace les courbes par les distributions cumulées des rangs obtenus."""
+        if self.distribution_canvas is None:
+            Figure, FigureCanvasTkAgg = load_matplotlib()
+            fig = Figure(figsize=(12, 5), dpi=100)
+            fig.add_subplot(121)
+            fig.add_subplot(122)
+            self.distribution_canvas = FigureCanvasTkAgg(fig, master=self.curve_frame)
+        ax_hist, ax_ind = self.distribution_canvas.figure.axes
+        ax_hist.cla()
+        ax_ind.cla()
+        
+        histos = self.rank_histograms
+        resumes = {cote: histos.resume(cote) for cote in histos.COTES}
+        derniere = max((i for r in resumes.values() for i, p in enumerate(r["parts"]) if p > 0), default=0)
+        libelles = libelles_classes_rangs()[:derniere + 1]
+        x = list(range(len(libelles)))
+        couleurs = {"etudiants": '#3b82f6', "universites": '#10b981'}
+        noms = {"etudiants": "Étudiants", "universites": "Établissements"}
+        for decalage, cote in ((-0.2, "etudiants"), (0.2, "universites")):
+            ax_hist.bar([i + decalage for i in x], [p * 100 for p in resumes[cote]["parts"][:derniere + 1]],
+                        width=0.4, color=couleurs[cote], label=noms[cote])
+        ax_hist.set_xticks(x)
+        ax_hist.set_xticklabels(libelles, rotation=45, fontsize=8)
+        ax_hist.set_xlabel('Rang obtenu (classes log2)', fontsize=9)
+        ax_hist.set_ylabel('Part des agents appariés (%)', fontsize=9)
+        ax_hist.set_title(f'Rangs obtenus ({histos.repetitions} répétitions)', fontsize=10, fontweight='bold')
+        ax_hist.legend(loc='best', fontsize=8)
+        ax_hist.grid(True, axis='y', alpha=0.3, linestyle='--')
+        
+        indicateurs = ("Premier choix (%)", "Gini × 100")
+        for decalage, cote in ((-0.2, "etudiants"), (0.2, "universites")):
+            r = resumes[cote]
+            ax_ind.bar([i + decalage for i in range(len(indicateurs))],
+                       [r["part_premier_choix"] * 100, r["gini"] * 100], width=0.4, color=couleurs[cote],
+                       label=f"{noms[cote]} (pire rang {r['pire_rang']}, {r['non_apparies']} non appariés au total)")
+        ax_ind.set_xticks(range(len(indicateurs)))
+        ax_ind.set_xticklabels(indicateurs, fontsize=9)
+        ax_ind.set_title('Premier choix et inégalité', fontsize=10, fontweight='bold')
+        ax_ind.legend(loc='best', fontsize=8)
+        ax_ind.grid(True, axis='y', alpha=0.3, linestyle='--')
+        
+        self.distribution_canvas.figure.tight_layout()
+        if getattr(self, "curve_canvas", None) is not None:
+            self.curve_canvas.get_tk_widget().pack_forget()
+        self.distribution_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.distribution_canvas.draw_idle()
+    
+    def show_satisfaction_curve(self):
+        """Affiche (ou rafraîchit) les courbes de la figure persistante."""
+        self.ensure_curve_figure()
+        if self.distribution_canvas is not None and self.distribution_canvas.get_tk_widget().winfo_ismapped():
+            self.distribution_canvas.get_tk_widget().pack_forget()
+            self.curve_canvas.get_tk_widget().pack(fill="both", expand=True)
+        if self._curve_update_job is not None:
+            self.root.after_cancel(self._curve_update_job)
+            self._curve_update_job = None
+        self.update_curve_data()
+    
+    def create_comparison_tab(self):
+        """Crée l'onglet de comparaison des moteurs sur des instances identiques."""
+        comparison_frame = ttk.Frame(self.notebook, style="Modern.TFrame", padding=20)
+        self.notebook.add(comparison_frame, text="⚖️ Comparaison moteurs")
+        
+        config_card = ttk.Frame(comparison_frame, style="Card.TFrame", padding=15)
+        config_card.pack(fill="x", pady=(0, 10))
+        
+        ttk.Label(config_card, text="COMPARAISON DES MOTEURS", 
+             font=(UI.BUTTON_FONT[0], 12, "bold"),
+             foreground="#0f172a", background=UI.WHITE).pack(anchor="w", pady=(0, 5))
+        ttk.Label(config_card, text="Chaque instance est générée une fois puis résolue par chaque moteur sélectionné "
+                                    "(le premier sert de référence)",
+             font=UI.SMALL_FONT, foreground=UI.GRAY, background=UI.WHITE).pack(anchor="w", pady=(0, 10))
+        
+        row = ttk.Frame(config_card, style="Card.TFrame")
+        row.pack(fill="x")
+        ttk.Label(row, text="Tailles:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(10, 5))
+        self.comparison_sizes_var = tk.StringVar(value="50, 100, 200, 500")
+        ttk.Entry(row, textvariable=self.comparison_sizes_var, width=22).pack(side="left", padx=5)
+        ttk.Label(row, text="Répétitions:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.comparison_repetitions_var = tk.IntVar(value=3)
+        ttk.Spinbox(row, from_=1, to=100, textvariable=self.comparison_repetitions_var, width=6).pack(side="left", padx=5)
+        self.comparison_memory_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(row, text="Mémoire (ralentit)",
+                        variable=self.comparison_memory_var).pack(side="left", padx=(15, 5))
+        ttk.Label(row, text="Préférences:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.comparison_model_var = tk.StringVar(value="uniforme")
+        ttk.Combobox(row, textvariable=self.comparison_model_var, state="readonly",
+                     values=MODELES_PREFERENCES, width=10).pack(side="left", padx=5)
+        
+        engines_row = ttk.Frame(config_card, style="Card.TFrame")
+        engines_row.pack(fill="x", pady=(8, 0))
+        ttk.Label(engines_row, text="Moteurs:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(10, 5))
+        self.comparison_engine_vars = {}
+        for nom in MOTEURS:
+            var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(engines_row, text=nom, variable=var).pack(side="left", padx=5)
+            self.comparison_engine_vars[nom] = var
+        
+        self.comparison_run_button = tk.Button(engines_row, text="⚖️ COMPARER", 
+                        font=(UI.BUTTON_FONT[0], 10, "bold"),
+                        bg="#7c3aed", fg=UI.WHITE, 
+                        activebackground="#6d28d9", activeforeground=UI.WHITE,
+                        cursor="hand2", relief="flat", padx=20, pady=6,
+                        borderwidth=0, highlightthickness=0,
+                        command=self.run_engine_comparison)
+        self.comparison_run_button.pack(side="right", padx=10)
+        
+        self.comparison_status_label = ttk.Label(config_card, text="", font=UI.SMALL_FONT, 
+                         foreground=UI.SECONDARY_COLOR, background=UI.WHITE)
+        self.comparison_status_label.pack(anchor="w", pady=(5, 0))
+        
+        results_card = ttk.Frame(comparison_frame, style="Card.TFrame", padding=15)
+        results_card.pack(fill="both", expand=True)
+        
+        self.comparison_tree = self.create_tree(
+            results_card,
+            columns=("taille", "moteur", "reps", "temps", "propositions", "memoire", "acceleration", "verification"),
+            headings=("n × m", "Moteur", "Répét.", "Temps médian (ms)", "Propositions", "Pic Ko",
+                      "Accélération", "Vérification"),
+            widths=(90, 190, 60, 130, 110, 90, 100, 160)
+        )
+        
+        self.comparison_curve_frame = ttk.Frame(results_card, style="Card.TFrame")
+        self.comparison_curve_frame.pack(fill="both", expand=True, pady=(10, 0))
+        self.comparison_canvas = None
+    
+    def run_engine_comparison(self):
+        """Compare les moteurs sélectionnés sur les mêmes instances."""
+        if not self.ensure_data_ready():
+            return
+        moteurs = [nom for nom, var in self.comparison_engine_vars.items() if var.get()]
+        if not moteurs:
+            messagebox.showwarning("Attention", "Sélectionnez au moins un moteur")
+            return
+        try:
+            sizes = [int(t.strip()) for t in self.comparison_sizes_var.get().split(",") if t.strip()]
+        except ValueError:
+            messagebox.showerror("Erreur", "Format invalide pour les tailles (utilisez: 10, 50, 100)")
+            return
+        
+        repetitions = self.comparison_repetitions_var.get()
+        master_seed = random.SystemRandom().getrandbits(63)
+        lignes = []
+        self.comparison_run_button.config(state="disabled")
+        try:
+            for size in sizes:
+                if size > len(self.all_students) or size > len(self.all_universities):
+                    messagebox.showwarning("Attention", f"Taille {size} ignorée: données insuffisantes")
+                    continue
+                for rep in range(1, repetitions + 1):
+                    self.comparison_status_label.config(text=f"⏳ n={size}, répétition {rep}/{repetitions}...")
+                    self.root.update()
+                    lignes.extend(comparer_moteurs(
+                        self.all_students, self.all_universities, size, size, moteurs,
+                        seed=graine_repetition(master_seed, size, size, rep),
+                        modele=self.comparison_model_var.get(),
+                        memoire=self.comparison_memory_var.get(), repetition=rep))
+            
+            resume = resumer_comparaison(lignes)
+            self.clear_tree(self.comparison_tree)
+            for i, r in enumerate(resume):
+                verification = ("identique" if r["identique"] else "différent") + \
+                    (" · stable" if r["stable"] else f" · instable ({r['paires_bloquantes']:.0f} paires bloquantes)")
+                self.comparison_tree.insert("", "end", values=(
+                    f"{r['nb_students']} × {r['nb_universities']}", r["moteur"], r["repetitions"],
+                    f"{r['exec_time_ms']:.3f}", f"{r['nb_propositions']:.0f}",
+                    f"{r['mem_aff_ko']:.0f}" if self.comparison_memory_var.get() else "—",
+                    f"{r['acceleration']:.2f}x", verification,
+                ), tags=('evenrow' if i % 2 == 0 else 'oddrow',))
+            self.show_comparison_curve(resume)
+            
+            problemes = list(dict.fromkeys(desaccords(lignes)))
+            if problemes:
+                self.comparison_status_label.config(text="⚠️ " + " · ".join(problemes[:3]))
+            else:
+                self.comparison_status_label.config(
+                    text=f"✅ {len(lignes)} exécutions, résultats cohérents (référence: {moteurs[0]})")
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la comparaison:\n{str(e)}")
+            self.comparison_status_label.config(text="❌ Erreur lors de la comparaison")
+        finally:
+            self.comparison_run_button.config(state="normal")
+    
+    def show_comparison_curve(self, resume):
+        """Temps médian et accélération par moteur en fonction de n."""
+        if self.comparison_canvas is None:
+            Figure, FigureCanvasTkAgg = load_matplotlib()
+            fig = Figure(figsize=(12, 3.8), dpi=100)
+            fig.add_subplot(121)
+            fig.add_subplot(122)
+            self.comparison_canvas = FigureCanvasTkAgg(fig, master=self.comparison_curve_frame)
+            self.comparison_canvas.get_tk_widget().pack(fill="both", expand=True)
+        ax_time, ax_speed = self.comparison_canvas.figure.axes
+        ax_time.cla()
+        ax_speed.cla()
+        
+        par_moteur = {}
+        for r in resume:
+            par_moteur.setdefault(r["moteur"], []).append(r)
+        for moteur, points in par_moteur.items():
+            points.sort(key=lambda r: r["nb_students"])
+            ns = [r["nb_students"] for r in points]
+            ax_time.plot(ns, [r["exec_time_ms"] for r in points], marker='o', linewidth=2, markersize=4, label=moteur)
+            ax_speed.plot(ns, [r["acceleration"] for r in points], marker='o', linewidth=2, markersize=4, label=moteur)
+        
+        if resume:
+            ax_time.set_xscale('log')
+            ax_time.set_yscale('log')
+            ax_speed.set_xscale('log')
+        ax_time.set_xlabel('n (étudiants)', fontsize=9)
+        ax_time.set_ylabel('Temps médian (ms)', fontsize=9)
+        ax_time.set_title("Temps par moteur", fontsize=10, fontweight='bold')
+        ax_speed.set_xlabel('n (étudiants)', fontsize=9)
+        ax_speed.set_ylabel('Accélération vs référence', fontsize=9)
+        ax_speed.set_title("Accélération par moteur", fontsize=10, fontweight='bold')
+        for ax in (ax_time, ax_speed):
+            ax.grid(True, which='both', alpha=0.3, linestyle='--')
+            if resume:
+                ax.legend(loc='best', fontsize=8)
+        self.comparison_canvas.figure.tight_layout()
+        self.comparison_canvas.draw_idle()
+    
+    def create_trace_tab(self):
+        """Crée l'onglet de rejeu pas à pas de la trace des propositions."""
+        trace_frame = ttk.Frame(self.notebook, style="Modern.TFrame", padding=20)
+        self.notebook.add(trace_frame, text="🎞️ Trace")
+        
+        card = ttk.Frame(trace_frame, style="Card.TFrame", padding=20)
+        card.pack(fill="both", expand=True)
+        
+        ttk.Label(card, text="REJEU DES PROPOSITIONS", 
+             font=(UI.BUTTON_FONT[0], 14, "bold"),
+             foreground="#0f172a", background=UI.WHITE).pack(anchor="w", pady=(0, 5))
+        self.trace_info_label = ttk.Label(card, text="Aucune trace: cochez l'option dans les paramètres puis lancez une simulation",
+                                          font=UI.SMALL_FONT, foreground=UI.GRAY, background=UI.WHITE)
+        self.trace_info_label.pack(anchor="w", pady=(0, 10))
+        
+        controls = ttk.Frame(card, style="Card.TFrame")
+        controls.pack(fill="x", pady=(0, 10))
+        for text, command in (("⏮", lambda: self.trace_goto(0)),
+                              ("◀", lambda: self.trace_goto(self.trace_replay.position - 1)),
+                              ("▶", lambda: self.trace_goto(self.trace_replay.position + 1)),
+                              ("⏭", lambda: self.trace_goto(len(self.trace_replay.evenements)))):
+            ttk.Button(controls, text=text, width=3,
+                       command=lambda c=command: self.trace_replay is not None and c()).pack(side="left", padx=2)
+        self.trace_play_button = ttk.Button(controls, text="⏵ Lecture", command=self.toggle_trace_play)
+        self.trace_play_button.pack(side="left", padx=(10, 5))
+        ttk.Label(controls, text="Pas / image:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(10, 5))
+        self.trace_speed_var = tk.IntVar(value=1)
+        ttk.Spinbox(controls, from_=1, to=10000, textvariable=self.trace_speed_var, width=6).pack(side="left", padx=5)
+        ttk.Button(controls, text="📂 Charger CSV", command=self.import_trace).pack(side="right", padx=3)
+        ttk.Button(controls, text="💾 Exporter CSV", command=self.export_trace).pack(side="right", padx=3)
+        
+        self.trace_scale = tk.Scale(card, from_=0, to=0, orient="horizontal", showvalue=True,
+                                    bg=UI.WHITE, highlightthickness=0,
+                                    command=lambda v: self.trace_replay is not None and self.trace_goto(int(v)))
+        self.trace_scale.pack(fill="x", pady=(0, 5))
+        self.trace_event_label = ttk.Label(card, text="", font=UI.TEXT_FONT, background=UI.WHITE)
+        self.trace_event_label.pack(anchor="w", pady=(0, 10))
+        
+        self.trace_tree = self.create_tree(
+            card,
+            columns=("university", "student"),
+            headings=("Établissement", "Étudiant retenu (provisoire)"),
+            widths=(400, 400)
+        )
+        self.trace = None
+        self.trace_replay = None
+        self._trace_job = None
+    
+    def load_trace(self, trace):
+        """Affiche une trace dans l'onglet de rejeu (position initiale: début)."""
+        self.trace = trace
+        self.trace_replay = RejeuTrace(trace)
+        tree = self.trace_tree
+        self.clear_tree(tree)
+        for j, uni in enumerate(trace.universites):
+            tree.insert("", "end", iid=str(j), values=(uni, ""),
+                        tags=('evenrow' if j % 2 == 0 else 'oddrow',))
+        perdus = f", {trace.perdus} plus anciens perdus (tampon plein)" if trace.perdus else ""
+        self.trace_info_label.config(
+            text=f"{len(trace)} événements, {len(trace.etudiants)} étudiants, "
+                 f"{len(trace.universites)} établissements{perdus}")
+        self.trace_scale.config(to=len(self.trace_replay.evenements))
+        self.trace_goto(0)
+    
+    def trace_goto(self, position):
+        """Place le rejeu à `position` et met à jour les lignes modifiées."""
+        replay = self.trace_replay
+        trace = self.trace
+        for j in replay.aller_a(position):
+            etu = replay.titulaires.get(j)
+            self.trace_tree.set(str(j), "student", "" if etu is None else trace.etudiants[etu])
+        if int(self.trace_scale.get()) != replay.position:
+            self.trace_scale.set(replay.position)
+        if replay.position == 0:
+            self.trace_event_label.config(text="Début: aucun étudiant retenu")
+            return
+        tour, etu, uni, issue = replay.evenements[replay.position - 1]
+        self.trace_event_label.config(
+            text=f"Événement {replay.position}/{len(replay.evenements)} · tour {tour} · "
+                 f"{trace.etudiants[etu]} → {trace.universites[uni]} : {NOMS_ISSUES[issue]}")
+        self.trace_tree.see(str(uni))
+        self.trace_tree.selection_set(str(uni))
+    
+    def toggle_trace_play(self):
+        """Lecture automatique de la trace (un pas par image)."""
+        if self._trace_job is not None:
+            self.root.after_cancel(self._trace_job)
+            self._trace_job = None
+            self.trace_play_button.config(text="⏵ Lecture")
+            return
+        if self.trace_replay is None:
+            return
+        self.trace_play_button.config(text="⏸ Pause")
+        
+        def step():
+            replay = self.trace_replay
+            if replay is None or replay.position >= len(replay.evenements):
+                self._trace_job = None
+                self.trace_play_button.config(text="⏵ Lecture")
+                return
+            self.trace_goto(replay.position + max(self.trace_speed_var.get(), 1))
+            self._trace_job = self.root.after(40, step)
+        
+        step()
+    
+    def export_trace(self):
+        """Exporte la trace courante en CSV."""
+        if self.trace is None:
+            messagebox.showwarning("Attention", "Aucune trace à exporter")
+            return
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile=f"trace_propositions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        if filename:
+            try:
+                self.trace.exporter_csv(filename)
+            except OSError as e:
+                messagebox.showerror("Erreur", f"Erreur lors de l'export:\n{str(e)}")
+    
+    def import_trace(self):
+        """Charge une trace CSV exportée (rejeu sans relancer l'algorithme)."""
+        filename = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if filename:
+            try:
+                self.load_trace(TracePropositions.charger_csv(filename))
+            except (OSError, KeyError, ValueError) as e:
+                messagebox.showerror("Erreur", f"Trace illisible:\n{str(e)}")
+    
+    def create_history_tab(self):
+        """Crée l'onglet historique (base SQLite des tests multiples)."""
+        history_frame = ttk.Frame(self.notebook, style="Modern.TFrame", padding=20)
+        self.notebook.add(history_frame, text="🗄️ Historique")
+        
+        card = ttk.Frame(history_frame, style="Card.TFrame", padding=20)
+        card.pack(fill="both", expand=True)
+        
+        ttk.Label(card, text="HISTORIQUE DES TESTS", 
+             font=(UI.BUTTON_FONT[0], 14, "bold"),
+             foreground="#0f172a", background=UI.WHITE).pack(anchor="w", pady=(0, 5))
+        
+        self.history_info_label = ttk.Label(card, text="", font=UI.SMALL_FONT,
+                                            foreground=UI.GRAY, background=UI.WHITE)
+        self.history_info_label.pack(anchor="w", pady=(0, 10))
+        
+        # Filtres (appliqués par SQLite, seules les lignes affichées sont chargées)
+        filters = ttk.Frame(card, style="Card.TFrame")
+        filters.pack(fill="x", pady=(0, 10))
+        
+        ttk.Label(filters, text="Moteur:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(0, 5))
+        self.history_engine_var = tk.StringVar(value="")
+        self.history_engine_combo = ttk.Combobox(filters, textvariable=self.history_engine_var, width=14)
+        self.history_engine_combo.pack(side="left", padx=5)
+        
+        ttk.Label(filters, text="Modèle:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.history_model_var = tk.StringVar(value="")
+        self.history_model_combo = ttk.Combobox(filters, textvariable=self.history_model_var, width=12)
+        self.history_model_combo.pack(side="left", padx=5)
+        
+        ttk.Label(filters, text="n min:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.history_nmin_var = tk.StringVar(value="")
+        ttk.Entry(filters, textvariable=self.history_nmin_var, width=7).pack(side="left", padx=5)
+        
+        ttk.Label(filters, text="n max:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.history_nmax_var = tk.StringVar(value="")
+        ttk.Entry(filters, textvariable=self.history_nmax_var, width=7).pack(side="left", padx=5)
+        
+        ttk.Label(filters, text="Métrique:", font=UI.TEXT_FONT, background=UI.WHITE).pack(side="left", padx=(15, 5))
+        self.history_metric_var = tk.StringVar(value="sat_students")
+        ttk.Combobox(filters, textvariable=self.history_metric_var, state="readonly",
+                     values=METRIQUES, width=16).pack(side="left", padx=5)
+        
+        tk.Button(filters, text="Dernières lignes", font=(UI.BUTTON_FONT[0], 9, "bold"),
+                  bg="#2563eb", fg=UI.WHITE, relief="flat", padx=12, pady=4, cursor="hand2",
+                  command=self.load_history_rows).pack(side="left", padx=(15, 3))
+        tk.Button(filters, text="Agréger", font=(UI.BUTTON_FONT[0], 9, "bold"),
+                  bg="#7c3aed", fg=UI.WHITE, relief="flat", padx=12, pady=4, cursor="hand2",
+                  command=self.load_history_aggregates).pack(side="left", padx=3)
+        
+        self.history_tree = self.create_tree(
+            card,
+            columns=("c1", "c2", "c3", "c4", "c5", "c6", "c7", "c8"),
+            headings=("", "", "", "", "", "", "", ""),
+            widths=(150, 110, 100, 80, 80, 110, 110, 160)
+        )
+    
+    def _history_filters(self):
+        """Filtres saisis dans l'onglet historique."""
+        def entier(texte):
+            texte = texte.strip()
+            return int(texte) if texte else None
+        return {
+            "moteur": self.history_engine_var.get().strip() or None,
+            "modele": self.history_model_var.get().strip() or None,
+            "n_min": entier(self.history_nmin_var.get()),
+            "n_max": entier(self.history_nmax_var.get()),
+        }
+    
+    def _fill_history_tree(self, headings, rows):
+        """Remplace les en-têtes et le contenu du tableau historique."""
+        tree = self.history_tree
+        for col, heading in zip(tree["columns"], list(headings) + [""] * len(tree["columns"])):
+            tree.heading(col, text=heading)
+        self.clear_tree(tree)
+        for i, row in enumerate(rows):
+            tree.insert("", "end", values=row, tags=('evenrow' if i % 2 == 0 else 'oddrow',))
+    
+    def _refresh_history_choices(self):
+        self.history_engine_combo["values"] = [""] + self.historique.valeurs_distinctes("moteur")
+        self.history_model_combo["values"] = [""] + self.historique.valeurs_distinctes("modele")
+        self.history_info_label.config(
+            text=f"{len(self.historique)} répétitions enregistrées · {self.historique.path}")
+    
+    def load_history_rows(self):
+        """Affiche les dernières répétitions correspondant aux filtres."""
+        if self.historique is None:
+            messagebox.showwarning("Attention", "Historique indisponible")
+            return
+        try:
+            rows = self.historique.requeter(limite=500, **self._history_filters())
+        except ValueError:
+            messagebox.showerror("Erreur", "n min / n max doivent être des entiers")
+            return
+        metrique = self.history_metric_var.get()
+        self._fill_history_tree(
+            ("Date", "Campagne", "Moteur", "n", "m", "Sat. Étu.", "Temps (ms)", metrique),
+            [(r["timestamp"], r["campagne"] or "", r["moteur"] or "", r["nb_students"], r["nb_universities"],
+              f"{r['sat_students']:.1%}", f"{r['exec_time_ms']:.2f}",
+              "" if r.get(metrique) is None else f"{r[metrique]:.6g}")
+             for r in rows])
+        self._refresh_history_choices()
+    
+    def load_history_aggregates(self):
+        """Affiche les agrégats par (moteur, modèle, taille), calculés par SQLite."""
+        if self.historique is None:
+            messagebox.showwarning("Attention", "Historique indisponible")
+            return
+        metrique = self.history_metric_var.get()
+        try:
+            groupes = self.historique.agreger((metrique,), **self._history_filters())
+        except ValueError as e:
+            messagebox.showerror("Erreur", str(e))
+            return
+        self._fill_history_tree(
+            ("Moteur", "Modèle", "n × m", "Répét.", "Moyenne", "Écart-type", "Min", "Max"),
+            [(g["moteur"] or "", g["modele"] or "", f"{g['nb_students']} × {g['nb_universities']}", g["n"],
+              *(("" if g[metrique][k] is None else f"{g[metrique][k]:.6g}")
+                for k in ("moyenne", "ecart_type", "min", "max")))
+             for g in groupes])
+        self._refresh_history_choices()
+    
+    def create_jobs_tab(self):
+        """Crée l'onglet de suivi des travaux de l'ordonnanceur."""
+        jobs_frame = ttk.Frame(self.notebook, style="Modern.TFrame", padding=20)
+        self.notebook.add(jobs_frame, text="🗂️ Travaux")
+        
+        card = ttk.Frame(jobs_frame, style="Card.TFrame", padding=20)
+        card.pack(fill="both", expand=True)
+        
+        ttk.Label(card, text="TRAVAUX EN FILE", 
+             font=(UI.BUTTON_FONT[0], 14, "bold"),
+             foreground="#0f172a", background=UI.WHITE).pack(anchor="w", pady=(0, 5))
+        
+        ttk.Label(card, text="Les simulations uniques sont prioritaires: elles suspendent les campagnes en cours",
+             font=UI.SMALL_FONT, foreground=UI.GRAY, background=UI.WHITE).pack(anchor="w", pady=(0, 10))
+        
+        controls = ttk.Frame(card, style="Card.TFrame")
+        controls.pack(fill="x", pady=(0, 10))
+        
+        ttk.Label(controls, text="Délai max (s, 0 = aucun):", font=UI.TEXT_FONT,
+                  background=UI.WHITE).pack(side="left", padx=(0, 5))
+        self.job_timeout_var = tk.IntVar(value=0)
+        ttk.Spinbox(controls, from_=0, to=86400, increment=30, textvariable=self.job_timeout_var,
+                    width=8).pack(side="left", padx=5)
+        
+        tk.Button(controls, text="Annuler", font=(UI.BUTTON_FONT[0], 9, "bold"),
+                  bg="#dc2626", fg=UI.WHITE, relief="flat", padx=12, pady=4, cursor="hand2",
+                  command=self.cancel_selected_job).pack(side="left", padx=(15, 3))
+        tk.Button(controls, text="Afficher les résultats", font=(UI.BUTTON_FONT[0], 9, "bold"),
+                  bg="#7c3aed", fg=UI.WHITE, relief="flat", padx=12, pady=4, cursor="hand2",
+                  command=self.show_job_results).pack(side="left", padx=3)
+        
+        self.jobs_tree = self.create_tree(
+            card,
+            columns=("id", "nom", "priorite", "etat", "progression", "duree", "calcul", "erreur"),
+            headings=("#", "Travail", "Priorité", "État", "Progression", "Durée (s)", "Calcul (s)", "Erreur"),
+            widths=(40, 320, 70, 100, 100, 80, 80, 260)
+        )
+    
+    def _ordonnanceur(self):
+        """Ordonnanceur des travaux, créé au premier usage (démarrage inchangé)."""
+        if self._scheduler is None:
+            from ordonnanceur import Ordonnanceur
+            self._scheduler = Ordonnanceur(emplacements=1)
+            self.refresh_jobs()
+        return self._scheduler
+    
+    def refresh_jobs(self):
+        """Met à jour le tableau des travaux et archive les répétitions reçues des campagnes."""
+        from ordonnanceur import PRIORITE_INTERACTIVE
+        tree = self.jobs_tree
+        for i, travail in enumerate(self._scheduler.travaux()):
+            suivi = self._queued_campaigns.get(travail.id)
+            messages = list(travail.messages)
+            if suivi is not None:
+                if self.historique is not None and len(messages) > suivi["enregistres"]:
+                    for result in messages[suivi["enregistres"]:]:
+                        self.historique.ajouter(result, suivi["campagne"])
+                    self.historique.vider()
+                suivi["enregistres"] = len(messages)
+                progression = f"{len(messages)} / {suivi['taches']}"
+            else:
+                progression = "—"
+            values = (travail.id, travail.nom,
+                      "interactive" if travail.priorite == PRIORITE_INTERACTIVE else "fond",
+                      travail.etat, progression, f"{travail.duree_s:.1f}", f"{travail.temps_calcul_s:.1f}",
+                      travail.erreur or "")
+            iid = str(travail.id)
+            if tree.exists(iid):
+                tree.item(iid, values=values)
+            else:
+                tree.insert("", "end", iid=iid, values=values, tags=('evenrow' if i % 2 == 0 else 'oddrow',))
+        self._jobs_refresh_job = self.root.after(500, self.refresh_jobs)
+    
+    def cancel_selected_job(self):
+        """Annule le travail sélectionné (en file ou en cours)."""
+        selection = self.jobs_tree.selection()
+        if not selection:
+            messagebox.showinfo("Information", "Sélectionnez un travail à annuler")
+            return
+        self._scheduler.annuler(int(selection[0]))
+    
+    def show_job_results(self):
+        """Affiche dans les tests multiples les répétitions reçues d'une campagne en file."""
+        selection = self.jobs_tree.selection()
+        suivi = self._queued_campaigns.get(int(selection[0])) if selection else None
+        if suivi is None:
+            messagebox.showinfo("Information", "Sélectionnez une campagne mise en file")
+            return
+        travail = next(t for t in self._scheduler.travaux() if t.id == int(selection[0]))
+        messages = list(travail.messages)
+        if not messages:
+            messagebox.showinfo("Information", "Aucune répétition terminée pour l'instant")
+            return
+        self.reset_multi_results()
+        for result in messages:
+            self._show_multi_result(result)
+        self.update_multi_summary()
+        self.show_satisfaction_curve()
+        self.multi_status_label.config(
+            text=f"📥 Campagne #{travail.id}: {len(messages)} / {suivi['taches']} répétitions ({travail.etat})")
+        self.multi_export_button.config(state="normal")
+        self.show_curve_button.config(state="normal")
+        self.distribution_button.config(state="normal" if self.rank_histograms.repetitions else "disabled")
+        self.notebook.select(5)
     
     def export_multi_test_results(self):
         """Exporte les résultats des tests multiples en CSV."""
@@ -1356,35 +2878,11 @@ class ModernMatchingApp:
             
             # Écrire le CSV
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    "Test", "Répétition", "Nb_Étudiants", "Nb_Établissements", 
-                    "Satisfaction_Étudiants", "Satisfaction_Établissements", 
-                    "RangMoyen_Etudiants_Obs", "RangMoyen_Etudiants_Theorique",
-                    "RangMoyen_Universites_Obs", "RangMoyen_Universites_Theorique",
-                    "Non_Affectés", "Temps_Execution_ms", "Complexite_Theorique", "Complexite_Observee",
-                    "Timestamp"
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
                 
                 writer.writeheader()
                 for result in self.multi_test_results:
-                    writer.writerow({
-                        "Test": result["test_num"],
-                        "Répétition": result["repetition"],
-                        "Nb_Étudiants": result["nb_students"],
-                        "Nb_Établissements": result["nb_universities"],
-                        "Satisfaction_Étudiants": f"{result['sat_students']:.4f}",
-                        "Satisfaction_Établissements": f"{result['sat_universities']:.4f}",
-                        "RangMoyen_Etudiants_Obs": f"{result.get('r_etu_obs', 0):.4f}",
-                        "RangMoyen_Etudiants_Theorique": f"{result.get('r_etu_th', 0):.4f}",
-                        "RangMoyen_Universites_Obs": f"{result.get('r_uni_obs', 0):.4f}",
-                        "RangMoyen_Universites_Theorique": f"{result.get('r_uni_th', 0):.4f}",
-                        "Non_Affectés": result["nb_unassigned"],
-                        "Temps_Execution_ms": f"{result['exec_time_ms']:.2f}",
-                        "Complexite_Theorique": result["complexite_theorique"],
-                        "Complexite_Observee": f"{result['complexite_observee']:.8f}",
-                        "Timestamp": result["timestamp"]
-                    })
+                    writer.writerow(ligne_export(result))
             
             messagebox.showinfo("Succès", f"Résultats exportés vers:\n{filename}")
             
@@ -1393,9 +2891,13 @@ class ModernMatchingApp:
 
 
 def main():
-    """Point d'entrée de l'application."""
+    """Point d'entrée de l'application.
+
+    `--startup-time` affiche les temps de démarrage (JSON) puis ferme la fenêtre.
+    """
     root = tk.Tk()
     app = ModernMatchingApp(root)
+    app.exit_when_ready = "--startup-time" in sys.argv
     root.mainloop()
 
 
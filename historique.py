@@ -0,0 +1,193 @@
+"""Historique des répétitions dans une base SQLite locale (ajout seul, requêtes indexées)."""
+import os
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Colonnes stockées: clé du résultat (voir `executer_repetition`) -> type SQL
+COLONNES: Dict[str, str] = {
+    "campagne": "TEXT",
+    "test_num": "INTEGER",
+    "repetition": "INTEGER",
+    "seed": "INTEGER",
+    "moteur": "TEXT",
+    "modele": "TEXT",
+    "nb_students": "INTEGER",
+    "nb_universities": "INTEGER",
+    "sat_students": "REAL",
+    "sat_universities": "REAL",
+    "r_etu_obs": "REAL",
+    "r_etu_th": "REAL",
+    "r_uni_obs": "REAL",
+    "r_uni_th": "REAL",
+    "premier_choix_etu": "REAL",
+    "premier_choix_uni": "REAL",
+    "pire_rang_etu": "INTEGER",
+    "pire_rang_uni": "INTEGER",
+    "gini_etu": "REAL",
+    "gini_uni": "REAL",
+    "nb_unassigned": "INTEGER",
+    "nb_places_vides": "INTEGER",
+    "nb_paires_bloquantes": "INTEGER",
+    "exec_time_ms": "REAL",
+    "complexite_theorique": "INTEGER",
+    "complexite_observee": "REAL",
+    "gen_time_ms": "REAL",
+    "sat_time_ms": "REAL",
+    "nb_propositions": "INTEGER",
+    "nb_rejets": "INTEGER",
+    "nb_tours": "INTEGER",
+    "nb_mesures": "INTEGER",
+    "exec_time_iqr_ms": "REAL",
+    "exec_time_ic95_bas_ms": "REAL",
+    "exec_time_ic95_haut_ms": "REAL",
+    "mem_gen_ko": "REAL",
+    "mem_aff_ko": "REAL",
+    "mem_sat_ko": "REAL",
+    "rss_mo": "REAL",
+    "octets_par_agent": "REAL",
+    "depuis_cache": "INTEGER",
+    "timestamp": "TEXT",
+}
+
+# Métriques agrégeables (colonnes numériques hors identifiants)
+METRIQUES = tuple(
+    cle for cle, type_sql in COLONNES.items()
+    if type_sql != "TEXT" and cle not in ("test_num", "repetition", "seed", "nb_students", "nb_universities")
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS repetitions (
+    id INTEGER PRIMARY KEY,
+    {", ".join(f"{cle} {type_sql}" for cle, type_sql in COLONNES.items())}
+);
+CREATE INDEX IF NOT EXISTS idx_moteur_n ON repetitions (moteur, nb_students);
+CREATE INDEX IF NOT EXISTS idx_timestamp ON repetitions (timestamp);
+"""
+
+
+class HistoriqueResultats:
+    """
+    Base SQLite des répétitions, en ajout seul.
+
+    Les lignes sont accumulées puis écrites par lots de `taille_lot` dans une
+    seule transaction; `vider()` force l'écriture du lot en cours.
+    """
+
+    def __init__(self, path: str, taille_lot: int = 200):
+        self.path = path
+        self.taille_lot = taille_lot
+        dossier = os.path.dirname(os.path.abspath(path))
+        os.makedirs(dossier, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Base créée par une version antérieure: ajouter les colonnes manquantes
+        existantes = {ligne[1] for ligne in self._conn.execute("PRAGMA table_info(repetitions)")}
+        with self._conn:
+            for cle, type_sql in COLONNES.items():
+                if cle not in existantes:
+                    self._conn.execute(f"ALTER TABLE repetitions ADD COLUMN {cle} {type_sql}")
+        self._lot: List[Tuple] = []
+        self._insertion = (
+            f"INSERT INTO repetitions ({', '.join(COLONNES)}) "
+            f"VALUES ({', '.join('?' for _ in COLONNES)})"
+        )
+
+    def ajouter(self, result: Dict, campagne: Optional[str] = None) -> None:
+        """Ajoute une répétition (écrite au prochain lot complet)."""
+        ligne = dict(result, campagne=campagne)
+        self._lot.append(tuple(
+            int(v) if isinstance(v, bool) else v
+            for v in (ligne.get(cle) for cle in COLONNES)
+        ))
+        if len(self._lot) >= self.taille_lot:
+            self.vider()
+
+    def vider(self) -> None:
+        """Écrit le lot en cours dans une transaction."""
+        if not self._lot:
+            return
+        with self._conn:
+            self._conn.executemany(self._insertion, self._lot)
+        self._lot = []
+
+    def fermer(self) -> None:
+        self.vider()
+        self._conn.close()
+
+    @staticmethod
+    def _filtres(moteur: Optional[str] = None, modele: Optional[str] = None,
+                 n_min: Optional[int] = None, n_max: Optional[int] = None,
+                 depuis: Optional[str] = None) -> Tuple[str, list]:
+        conditions, params = [], []
+        for condition, valeur in (("moteur = ?", moteur), ("modele = ?", modele),
+                                  ("nb_students >= ?", n_min), ("nb_students <= ?", n_max),
+                                  ("timestamp >= ?", depuis)):
+            if valeur not in (None, ""):
+                conditions.append(condition)
+                params.append(valeur)
+        clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return clause, params
+
+    def requeter(self, limite: int = 500, **filtres) -> List[Dict]:
+        """Dernières répétitions correspondant aux filtres (les plus récentes d'abord)."""
+        self.vider()
+        clause, params = self._filtres(**filtres)
+        curseur = self._conn.execute(
+            f"SELECT {', '.join(COLONNES)} FROM repetitions{clause} ORDER BY id DESC LIMIT ?",
+            params + [limite])
+        return [dict(zip(COLONNES, ligne)) for ligne in curseur]
+
+    def repetitions_campagne(self, campagne: str) -> List[Dict]:
+        """Toutes les répétitions d'une campagne, dans l'ordre d'insertion."""
+        self.vider()
+        curseur = self._conn.execute(
+            f"SELECT {', '.join(COLONNES)} FROM repetitions WHERE campagne = ? ORDER BY id", (campagne,))
+        return [dict(zip(COLONNES, ligne)) for ligne in curseur]
+
+    def agreger(self, metriques: Sequence[str] = ("sat_students", "exec_time_ms"),
+                **filtres) -> List[Dict]:
+        """
+        Agrégats par (moteur, modèle, n, m) calculés par SQLite: effectif,
+        moyenne, écart-type, min et max de chaque métrique.
+        """
+        self.vider()
+        inconnues = set(metriques) - set(METRIQUES)
+        if inconnues:
+            raise ValueError(f"Métriques inconnues: {', '.join(sorted(inconnues))}")
+        clause, params = self._filtres(**filtres)
+        colonnes = []
+        for m in metriques:
+            colonnes += [f"AVG({m})", f"AVG({m} * {m})", f"MIN({m})", f"MAX({m})"]
+        curseur = self._conn.execute(
+            f"SELECT moteur, modele, nb_students, nb_universities, COUNT(*), {', '.join(colonnes)} "
+            f"FROM repetitions{clause} GROUP BY moteur, modele, nb_students, nb_universities "
+            f"ORDER BY moteur, modele, nb_students, nb_universities",
+            params)
+        groupes = []
+        for ligne in curseur:
+            moteur, modele, n, m, effectif = ligne[:5]
+            groupe = {"moteur": moteur, "modele": modele, "nb_students": n,
+                      "nb_universities": m, "n": effectif}
+            for i, metrique in enumerate(metriques):
+                moyenne, moyenne_carres, minimum, maximum = ligne[5 + 4 * i: 9 + 4 * i]
+                variance = 0.0
+                if effectif > 1 and moyenne is not None:
+                    variance = max(moyenne_carres - moyenne * moyenne, 0.0) * effectif / (effectif - 1)
+                groupe[metrique] = {"moyenne": moyenne, "ecart_type": variance ** 0.5,
+                                    "min": minimum, "max": maximum}
+            groupes.append(groupe)
+        return groupes
+
+    def valeurs_distinctes(self, colonne: str) -> List:
+        """Valeurs distinctes d'une colonne texte (listes des filtres)."""
+        if colonne not in ("moteur", "modele", "campagne"):
+            raise ValueError(f"Colonne non filtrable: {colonne}")
+        self.vider()
+        return [v for (v,) in self._conn.execute(
+            f"SELECT DISTINCT {colonne} FROM repetitions WHERE {colonne} IS NOT NULL ORDER BY 1")]
+
+    def __len__(self) -> int:
+        self.vider()
+        return self._conn.execute("SELECT COUNT(*) FROM repetitions").fetchone()[0]
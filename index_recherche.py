@@ -0,0 +1,163 @@
+"""Index de recherche pour filtrer rapidement les tableaux de résultats."""
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class LigneIndexee:
+    """Ligne d'un tableau telle que vue par l'index."""
+    item_id: str
+    noms: Tuple[str, ...]
+    rang: Optional[int]
+    satisfaction: float
+    affecte: bool
+
+
+def normaliser(texte: str) -> str:
+    """Met en minuscules et retire les accents pour la comparaison."""
+    decompose = unicodedata.normalize("NFKD", texte.lower())
+    return "".join(c for c in decompose if not unicodedata.combining(c))
+
+
+def _trigrammes(texte: str) -> Set[str]:
+    return {texte[i:i + 3] for i in range(len(texte) - 2)}
+
+
+_CHAMPS = {
+    "rank": "rang",
+    "rang": "rang",
+    "voeu": "rang",
+    "wish": "rang",
+    "priorite": "rang",
+    "satisfaction": "satisfaction",
+    "sat": "satisfaction",
+}
+
+_RE_COMPARAISON = re.compile(
+    r"\b(rank|rang|voeu|wish|priorite|satisfaction|sat)\s*(<=|>=|==|=|<|>)\s*(\d+(?:[.,]\d+)?)\s*(%?)"
+)
+_RE_NON_AFFECTE = re.compile(r"\b(unassigned|non[ -]?affecte?e?s?|aucun)\b")
+_RE_AFFECTE = re.compile(r"\b(assigned|affecte?e?s?)\b")
+
+
+class IndexRecherche:
+    """
+    Index en mémoire sur les lignes d'un tableau de résultats.
+
+    - noms: index de trigrammes (sous-chaînes) et liste triée des mots (préfixes)
+    - rang et satisfaction: valeurs triées interrogées par dichotomie
+
+    Les requêtes combinent des clauses (toutes doivent être vérifiées):
+        "unassigned", "rank > 10", "satisfaction < 20%", "marie"
+    """
+
+    def __init__(self, lignes: Iterable[LigneIndexee] = ()):
+        self.construire(lignes)
+
+    def construire(self, lignes: Iterable[LigneIndexee]) -> None:
+        """(Re)construit l'index à partir des lignes du tableau."""
+        self.lignes: List[LigneIndexee] = list(lignes)
+        self._noms: List[str] = []
+        self._trigrammes: Dict[str, Set[int]] = {}
+        mots: List[Tuple[str, int]] = []
+
+        for pos, ligne in enumerate(self.lignes):
+            nom = normaliser(" ".join(ligne.noms))
+            self._noms.append(nom)
+            for tri in _trigrammes(nom):
+                self._trigrammes.setdefault(tri, set()).add(pos)
+            for mot in nom.split():
+                mots.append((mot, pos))
+
+        mots.sort()
+        self._mots = [m for m, _ in mots]
+        self._mots_pos = [p for _, p in mots]
+
+        self._tri: Dict[str, Tuple[List[float], List[int]]] = {}
+        for champ in ("rang", "satisfaction"):
+            paires = sorted(
+                (getattr(ligne, champ), pos)
+                for pos, ligne in enumerate(self.lignes)
+                if getattr(ligne, champ) is not None
+            )
+            self._tri[champ] = ([v for v, _ in paires], [p for _, p in paires])
+
+        self._non_affectes = {pos for pos, ligne in enumerate(self.lignes) if not ligne.affecte}
+
+    def __len__(self) -> int:
+        return len(self.lignes)
+
+    # ---------------------
+    # Requêtes élémentaires
+    # ---------------------
+    def par_nom(self, texte: str) -> Set[int]:
+        """Lignes dont un nom contient `texte` (préfixe de mot si < 3 caractères)."""
+        texte = normaliser(texte).strip()
+        if not texte:
+            return set(range(len(self.lignes)))
+        if len(texte) < 3:
+            debut = bisect_left(self._mots, texte)
+            fin = bisect_left(self._mots, texte + "￿")
+            return set(self._mots_pos[debut:fin])
+
+        candidats: Optional[Set[int]] = None
+        for tri in sorted(_trigrammes(texte), key=lambda t: len(self._trigrammes.get(t, ()))):
+            postings = self._trigrammes.get(tri)
+            if not postings:
+                return set()
+            candidats = set(postings) if candidats is None else candidats & postings
+            if not candidats:
+                return set()
+        return {pos for pos in candidats if texte in self._noms[pos]}
+
+    def par_valeur(self, champ: str, operateur: str, valeur: float) -> Set[int]:
+        """Lignes dont `champ` vérifie `operateur valeur` (recherche dichotomique)."""
+        valeurs, positions = self._tri[champ]
+        if operateur == "<":
+            debut, fin = 0, bisect_left(valeurs, valeur)
+        elif operateur == "<=":
+            debut, fin = 0, bisect_right(valeurs, valeur)
+        elif operateur == ">":
+            debut, fin = bisect_right(valeurs, valeur), len(valeurs)
+        elif operateur == ">=":
+            debut, fin = bisect_left(valeurs, valeur), len(valeurs)
+        else:
+            debut, fin = bisect_left(valeurs, valeur - 1e-9), bisect_right(valeurs, valeur + 1e-9)
+        return set(positions[debut:fin])
+
+    # ---------------------
+    # Requête complète
+    # ---------------------
+    def rechercher(self, requete: str) -> List[str]:
+        """Retourne les identifiants des lignes correspondantes, dans l'ordre du tableau."""
+        texte = normaliser(requete or "")
+        resultat: Optional[Set[int]] = None
+
+        def restreindre(ensemble: Set[int]) -> None:
+            nonlocal resultat
+            resultat = ensemble if resultat is None else resultat & ensemble
+
+        for match in _RE_COMPARAISON.finditer(texte):
+            champ = _CHAMPS[match.group(1)]
+            valeur = float(match.group(3).replace(",", "."))
+            if champ == "satisfaction" and (match.group(4) or valeur > 1):
+                valeur /= 100.0
+            restreindre(self.par_valeur(champ, match.group(2), valeur))
+        texte = _RE_COMPARAISON.sub(" ", texte)
+
+        if _RE_NON_AFFECTE.search(texte):
+            restreindre(self._non_affectes)
+            texte = _RE_NON_AFFECTE.sub(" ", texte)
+        if _RE_AFFECTE.search(texte):
+            restreindre(set(range(len(self.lignes))) - self._non_affectes)
+            texte = _RE_AFFECTE.sub(" ", texte)
+
+        for mot in texte.split():
+            restreindre(self.par_nom(mot))
+
+        if resultat is None:
+            return [ligne.item_id for ligne in self.lignes]
+        return [self.lignes[pos].item_id for pos in sorted(resultat)]
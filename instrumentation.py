@@ -0,0 +1,136 @@
+"""Mesure légère des phases du pipeline (durées perf_counter_ns et compteurs)."""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# (nom, début ns, durée ns)
+Span = Tuple[str, int, int]
+
+# Phases mesurées par le pipeline (seuls noms de span acceptés)
+PHASES = ("chargement", "generation", "cache", "affectation", "benchmark", "satisfaction", "stabilite",
+          "rendu")
+
+
+class JournalTrace:
+    """
+    Fichier de trace au format « Trace Event » (chrome://tracing, Perfetto).
+
+    Les événements sont écrits au fil de l'eau; le crochet fermant du tableau
+    JSON est optionnel pour ce format, le fichier reste donc lisible même si
+    le programme est interrompu.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write("[\n")
+
+    def ecrire(self, spans: List[Span], pid: Optional[int] = None,
+               tid: Optional[int] = None, args: Optional[Dict] = None) -> None:
+        """Ajoute des spans (événements complets, horodatés en µs)."""
+        pid = os.getpid() if pid is None else pid
+        tid = threading.get_ident() if tid is None else tid
+        with self._lock:
+            for nom, debut_ns, duree_ns in spans:
+                event = {"name": nom, "ph": "X", "ts": debut_ns / 1000, "dur": duree_ns / 1000,
+                         "pid": pid, "tid": tid}
+                if args:
+                    event["args"] = args
+                self._file.write(json.dumps(event, ensure_ascii=False) + ",\n")
+            self._file.flush()
+
+    def fermer(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.write("{}]\n")
+                self._file.close()
+
+
+def rss_octets() -> int:
+    """
+    Mémoire résidente actuelle du processus (octets).
+
+    Lit /proc/self/statm sous Linux; sinon utilise psutil s'il est installé,
+    et à défaut le pic ru_maxrss (0 si rien n'est disponible).
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sous macOS, en kilo-octets ailleurs
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+    except ImportError:
+        return 0
+
+
+class Instrumentation:
+    """
+    Accumule les durées par phase et des compteurs nommés.
+
+    Avec `memoire=True`, chaque span mesure aussi le pic d'allocations Python
+    (tracemalloc) et la RSS en fin de phase. tracemalloc ralentit fortement
+    l'exécution: les durées mesurées dans ce mode ne sont pas comparables.
+    """
+
+    def __init__(self, journal: Optional[JournalTrace] = None, memoire: bool = False):
+        self.journal = journal
+        self.durees_ns: Dict[str, int] = {}
+        self.compteurs: Dict[str, int] = {}
+        self.spans: List[Span] = []
+        self.memoire = memoire
+        # nom -> {"pic_octets": ..., "rss_octets": ...} (dernière mesure)
+        self.memoire_phases: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def span(self, nom: str, **args) -> Iterator[None]:
+        """Mesure la durée (et la mémoire si demandé) du bloc `with` sous le nom `nom` (voir PHASES)."""
+        if nom not in PHASES:
+            raise ValueError(f"Phase inconnue '{nom}'. Phases: {', '.join(PHASES)}")
+        demarre_trace = False
+        if self.memoire:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                demarre_trace = True
+            tracemalloc.reset_peak()
+            memoire_initiale = tracemalloc.get_traced_memory()[0]
+        debut = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duree = time.perf_counter_ns() - debut
+            self.durees_ns[nom] = self.durees_ns.get(nom, 0) + duree
+            self.spans.append((nom, debut, duree))
+            if self.memoire:
+                pic = tracemalloc.get_traced_memory()[1] - memoire_initiale
+                self.memoire_phases[nom] = {"pic_octets": max(pic, 0), "rss_octets": rss_octets()}
+                if demarre_trace:
+                    tracemalloc.stop()
+            if self.journal is not None:
+                self.journal.ecrire([(nom, debut, duree)], args=args or None)
+
+    def incrementer(self, nom: str, valeur: int = 1) -> None:
+        self.compteurs[nom] = self.compteurs.get(nom, 0) + valeur
+
+    def duree_ms(self, nom: str) -> float:
+        return self.durees_ns.get(nom, 0) / 1e6
+
+
+def ouvrir_journal_env(variable: str = "MARIAGE_TRACE") -> Optional[JournalTrace]:
+    """Ouvre le journal de trace indiqué par la variable d'environnement, s'il y en a un."""
+    path = os.environ.get(variable)
+    return JournalTrace(path) if path else None
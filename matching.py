@@ -1,68 +1,654 @@
 """Algorithme de Gale-Shapley pour le mariage stable."""
-from typing import Dict, List
+from collections import deque
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Tuple
 
 from models import StudentKey, UniversityKey
+from trace_propositions import ACCEPTEE, DELOGE, REJETEE, TracePropositions
 
 
-def algorithme_affectation(
-    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+def _verifier_capacites(
     preferences_universites: Dict[UniversityKey, List[StudentKey]],
     capacites: Dict[UniversityKey, int],
-) -> Dict[UniversityKey, List[StudentKey]]:
-    
-    # Validation stricte des capacités: toutes doivent être = 1
+) -> None:
+    """Le mode actuel impose une capacité de 1 par université."""
     for uni in preferences_universites:
         if capacites.get(uni, 1) != 1:
             raise ValueError(
                 f"Capacité invalide détectée pour '{uni}' (={capacites.get(uni)}). Le mode actuel impose capacity=1 pour chaque université."
             )
 
+
+def _rangs(preferences: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+    """Table de rangs: rangs[a][b] = position de b dans la liste de a."""
+    return {a: {b: r for r, b in enumerate(prefs)} for a, prefs in preferences.items()}
+
+
+def algorithme_affectation(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    compteurs: Optional[Dict[str, int]] = None,
+    trace: Optional[TracePropositions] = None,
+) -> Dict[UniversityKey, List[StudentKey]]:
+    """
+    Gale-Shapley par tours (étudiants proposants).
+
+    Si `compteurs` est fourni, il reçoit le nombre de propositions, de rejets
+    et de tours ("propositions", "rejets", "tours"). Si `trace` est fournie,
+    chaque proposition y est enregistrée avec son issue.
+    """
+    # Validation stricte des capacités: toutes doivent être = 1
+    _verifier_capacites(preferences_universites, capacites)
+
     affectations: Dict[UniversityKey, List[StudentKey]] = {uni: [] for uni in preferences_universites}
     rang_voeux: Dict[StudentKey, int] = {etu: 0 for etu in preferences_etudiants}
-    etudiants_sans_affect = list(preferences_etudiants.keys())
+    rangs = _rangs(preferences_universites)
+    # Étudiants libres ayant encore un vœu (dict ordonné: ajout/retrait en O(1));
+    # ceux qui ont épuisé leur liste en sortent et restent non affectés
+    etudiants_sans_affect = dict.fromkeys(etu for etu, prefs in preferences_etudiants.items() if prefs)
+    nb_propositions = nb_rejets = nb_tours = 0
+    if trace is not None:
+        ids_etu, ids_uni = trace.preparer(preferences_etudiants, preferences_universites)
 
     while etudiants_sans_affect:
         candidatures: Dict[UniversityKey, List[StudentKey]] = {}
+        nb_tours += 1
 
         # Étape 1 : chaque étudiant propose à la prochaine université de sa liste
-        for etu in etudiants_sans_affect[:]:
-            prefs = preferences_etudiants[etu]
-            if rang_voeux[etu] >= len(prefs):
-                continue
-            uni = prefs[rang_voeux[etu]]
+        for etu in etudiants_sans_affect:
+            uni = preferences_etudiants[etu][rang_voeux[etu]]
 
             if uni not in candidatures:
                 candidatures[uni] = []
             candidatures[uni].append(etu)
+            nb_propositions += 1
 
         # Étape 2 : chaque université examine ses candidats et actuels pour garder les meilleurs
         for uni, candidats in candidatures.items():
             capacite = capacites.get(uni, 1)
 
-            # Pool des candidats actuels + nouveaux
+            # Pool des candidats actuels + nouveaux (listes incomplètes: un
+            # candidat non classé par l'université est refusé d'office)
+            rangs_uni = rangs[uni]
             pool = affectations[uni] + candidats
+            acceptables = [e for e in pool if e in rangs_uni]
 
             # Trier selon les priorités de l'université
-            pool_tries = sorted(pool, key=lambda e: preferences_universites[uni].index(e))
+            pool_tries = sorted(acceptables, key=rangs_uni.__getitem__)
 
             # Garder les meilleurs, rejeter les autres
             nouveaux_acceptes = pool_tries[:capacite]
             rejetes = [e for e in pool if e not in nouveaux_acceptes]
 
+            if trace is not None:
+                j = ids_uni[uni]
+                for etu in candidats:
+                    trace.ajouter(nb_tours, ids_etu[etu], j, ACCEPTEE if etu in nouveaux_acceptes else REJETEE)
+                for etu in affectations[uni]:
+                    if etu in rejetes:
+                        trace.ajouter(nb_tours, ids_etu[etu], j, DELOGE)
+
             affectations[uni] = nouveaux_acceptes
+            nb_rejets += len(rejetes)
 
             # Mettre à jour les statuts
             for rej in rejetes:
                 rang_voeux[rej] += 1
-                if rej not in etudiants_sans_affect:
-                    etudiants_sans_affect.append(rej)
+                if rang_voeux[rej] < len(preferences_etudiants[rej]):
+                    etudiants_sans_affect[rej] = None
+                else:
+                    etudiants_sans_affect.pop(rej, None)
 
             for acc in nouveaux_acceptes:
-                if acc in etudiants_sans_affect:
-                    etudiants_sans_affect.remove(acc)
+                etudiants_sans_affect.pop(acc, None)
+
+    if compteurs is not None:
+        compteurs["propositions"] = nb_propositions
+        compteurs["rejets"] = nb_rejets
+        compteurs["tours"] = nb_tours
+
+    return affectations
+
+
+def affectation_file(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    compteurs: Optional[Dict[str, int]] = None,
+    trace: Optional[TracePropositions] = None,
+) -> Dict[UniversityKey, List[StudentKey]]:
+    """
+    Gale-Shapley avec file d'étudiants libres (étudiants proposants).
+
+    Une proposition à la fois, comparaisons en O(1) via une table de rangs:
+    O(n·m) pour la table puis O(1) par proposition. Même résultat que
+    `algorithme_affectation` (l'appariement optimal pour les étudiants est unique).
+    Dans la trace, le « tour » d'une proposition est son rang dans la liste du proposant.
+    """
+    _verifier_capacites(preferences_universites, capacites)
+    rangs = _rangs(preferences_universites)
+    titulaire: Dict[UniversityKey, StudentKey] = {}
+    prochain = dict.fromkeys(preferences_etudiants, 0)
+    libres = deque(preferences_etudiants)
+    nb_propositions = nb_rejets = 0
+    if trace is not None:
+        ids_etu, ids_uni = trace.preparer(preferences_etudiants, preferences_universites)
+
+    while libres:
+        etu = libres.popleft()
+        prefs = preferences_etudiants[etu]
+        if prochain[etu] >= len(prefs):
+            continue
+        uni = prefs[prochain[etu]]
+        prochain[etu] += 1
+        nb_propositions += 1
+
+        rangs_uni = rangs[uni]
+        actuel = titulaire.get(uni)
+        if etu not in rangs_uni:
+            # Étudiant non classé par l'université: refus
+            issue = REJETEE
+            nb_rejets += 1
+            libres.append(etu)
+        elif actuel is None:
+            issue = ACCEPTEE
+            titulaire[uni] = etu
+        elif rangs_uni[etu] < rangs_uni[actuel]:
+            issue = ACCEPTEE
+            titulaire[uni] = etu
+            nb_rejets += 1
+            libres.append(actuel)
+            if trace is not None:
+                trace.ajouter(prochain[etu], ids_etu[actuel], ids_uni[uni], DELOGE)
+        else:
+            issue = REJETEE
+            nb_rejets += 1
+            libres.append(etu)
+        if trace is not None:
+            trace.ajouter(prochain[etu], ids_etu[etu], ids_uni[uni], issue)
+
+    if compteurs is not None:
+        compteurs["propositions"] = nb_propositions
+        compteurs["rejets"] = nb_rejets
+        compteurs["tours"] = max(prochain.values(), default=0)
+
+    return {uni: [titulaire[uni]] if uni in titulaire else [] for uni in preferences_universites}
 
-        # Arrêter si personne ne peut proposer
-        if all(rang_voeux[etu] >= len(preferences_etudiants[etu]) for etu in etudiants_sans_affect):
+
+def listes_indexees(preferences: Dict[str, List[str]], index: Dict[str, int]):
+    """
+    Listes de préférences en tableaux plats int32: longueur de chaque liste
+    et indices (selon `index`) de toutes les entrées, listes bout à bout.
+    """
+    import numpy as np
+
+    longueurs = np.fromiter(map(len, preferences.values()), dtype=np.int32, count=len(preferences))
+    plats = np.fromiter(map(index.__getitem__, chain.from_iterable(preferences.values())),
+                        dtype=np.int32, count=int(longueurs.sum()))
+    return longueurs, plats
+
+
+def _positions(longueurs):
+    """Position de chaque entrée dans sa liste (listes plates bout à bout)."""
+    import numpy as np
+
+    debuts = np.cumsum(longueurs, dtype=np.int64) - longueurs
+    return np.arange(int(longueurs.sum()), dtype=np.int32) - np.repeat(debuts, longueurs).astype(np.int32)
+
+
+def choix_denses(longueurs_etu, choix_plats):
+    """Longueurs des listes des étudiants (int64) et matrice de leurs choix (n × liste la plus longue, -1 au-delà)."""
+    import numpy as np
+
+    n = len(longueurs_etu)
+    longueurs = longueurs_etu.astype(np.int64)
+    choix = np.full((n, int(longueurs.max(initial=0))), -1, dtype=np.int32)
+    choix[np.repeat(np.arange(n), longueurs), _positions(longueurs_etu)] = choix_plats
+    return longueurs, choix
+
+
+def _tableaux_denses(longueurs_etu, choix_plats, longueurs_uni, classes_plats):
+    """
+    Longueurs et matrice des choix des étudiants (voir `choix_denses`) et
+    matrice des rangs donnés par les universités (m × n, rang n = étudiant
+    non classé).
+    """
+    import numpy as np
+
+    n, m = len(longueurs_etu), len(longueurs_uni)
+    longueurs, choix = choix_denses(longueurs_etu, choix_plats)
+    rang_uni = np.full((m, n), n, dtype=np.int32)
+    rang_uni[np.repeat(np.arange(m), longueurs_uni), classes_plats] = _positions(longueurs_uni)
+    return longueurs, choix, rang_uni
+
+
+def gale_shapley_tableaux(longueurs_etu, choix_plats, longueurs_uni, classes_plats,
+                          compteurs: Optional[Dict[str, int]] = None,
+                          trace: Optional[TracePropositions] = None):
+    """
+    Gale-Shapley par tours vectorisé sur des listes indexées (voir
+    `listes_indexees`): retourne le titulaire de chaque université (-1: aucun).
+
+    Chaque tour traite toutes les propositions en une fois: la meilleure
+    candidature par université est obtenue par `np.minimum.at` sur la
+    matrice des rangs (m × n).
+    """
+    longueurs, choix, rang_uni = _tableaux_denses(longueurs_etu, choix_plats, longueurs_uni, classes_plats)
+    return gale_shapley_denses(longueurs, choix, rang_uni, len(longueurs_etu), compteurs=compteurs, trace=trace)
+
+
+def gale_shapley_denses(longueurs, choix, rang_uni, non_classe: int,
+                        compteurs: Optional[Dict[str, int]] = None,
+                        trace: Optional[TracePropositions] = None):
+    """
+    Cœur de `gale_shapley_tableaux` sur les tableaux denses (voir
+    `_tableaux_denses`): un rang plus petit est préféré, `non_classe` est le
+    rang (supérieur à tous les autres) des étudiants absents d'une liste.
+    """
+    import numpy as np
+
+    n, m = len(longueurs), len(rang_uni)
+    titulaire = np.full(m, -1, dtype=np.int64)
+    rang_titulaire = np.full(m, non_classe, dtype=np.int64)
+    prochain = np.zeros(n, dtype=np.int64)
+    libres = np.arange(n, dtype=np.int64)
+    nb_propositions = nb_rejets = nb_tours = 0
+
+    while True:
+        libres = libres[prochain[libres] < longueurs[libres]]
+        if libres.size == 0:
             break
+        nb_tours += 1
+        unis = choix[libres, prochain[libres]]
+        rangs = rang_uni[unis, libres]
+        nb_propositions += libres.size
+
+        meilleur = rang_titulaire.copy()
+        np.minimum.at(meilleur, unis, rangs)
+        gagnant = (rangs == meilleur[unis]) & (rangs < rang_titulaire[unis])
+
+        unis_gagnees = unis[gagnant]
+        anciens = titulaire[unis_gagnees]
+        if trace is not None:
+            trace.ajouter_lot(nb_tours, libres, unis, np.where(gagnant, ACCEPTEE, REJETEE))
+            delogees = anciens >= 0
+            trace.ajouter_lot(nb_tours, anciens[delogees], unis_gagnees[delogees],
+                              np.full(int(delogees.sum()), DELOGE))
+        anciens = anciens[anciens >= 0]
+        titulaire[unis_gagnees] = libres[gagnant]
+        rang_titulaire[unis_gagnees] = rangs[gagnant]
+
+        perdants = libres[~gagnant]
+        prochain[perdants] += 1
+        prochain[anciens] += 1
+        nb_rejets += perdants.size + anciens.size
+        libres = np.concatenate((perdants, anciens))
+
+    if compteurs is not None:
+        compteurs["propositions"] = int(nb_propositions)
+        compteurs["rejets"] = int(nb_rejets)
+        compteurs["tours"] = nb_tours
+    return titulaire
+
+
+def affectation_numpy(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    compteurs: Optional[Dict[str, int]] = None,
+    trace: Optional[TracePropositions] = None,
+) -> Dict[UniversityKey, List[StudentKey]]:
+    """Gale-Shapley par tours vectorisé avec NumPy (étudiants proposants), voir `gale_shapley_tableaux`."""
+    _verifier_capacites(preferences_universites, capacites)
+    etudiants = list(preferences_etudiants)
+    universites = list(preferences_universites)
+    idx_etu = {e: i for i, e in enumerate(etudiants)}
+    idx_uni = {u: j for j, u in enumerate(universites)}
+    if trace is not None:
+        trace.preparer(etudiants, universites)
+    titulaire = gale_shapley_tableaux(*listes_indexees(preferences_etudiants, idx_uni),
+                                      *listes_indexees(preferences_universites, idx_etu),
+                                      compteurs=compteurs, trace=trace)
+    return {u: [etudiants[t]] if t >= 0 else [] for u, t in zip(universites, titulaire.tolist())}
+
+
+def affectation_universites_proposantes(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    compteurs: Optional[Dict[str, int]] = None,
+    trace: Optional[TracePropositions] = None,
+) -> Dict[UniversityKey, List[StudentKey]]:
+    """
+    Gale-Shapley avec file, universités proposantes.
+
+    Donne l'appariement stable optimal pour les universités (en général
+    différent de celui des moteurs à étudiants proposants). Dans la trace,
+    DELOGE marque l'université libérée par l'étudiant.
+    """
+    _verifier_capacites(preferences_universites, capacites)
+    rangs = _rangs(preferences_etudiants)
+    partenaire: Dict[StudentKey, UniversityKey] = {}
+    prochain = dict.fromkeys(preferences_universites, 0)
+    libres = deque(preferences_universites)
+    nb_propositions = nb_rejets = 0
+    if trace is not None:
+        ids_etu, ids_uni = trace.preparer(preferences_etudiants, preferences_universites)
 
+    while libres:
+        uni = libres.popleft()
+        prefs = preferences_universites[uni]
+        if prochain[uni] >= len(prefs):
+            continue
+        etu = prefs[prochain[uni]]
+        prochain[uni] += 1
+        nb_propositions += 1
+
+        rangs_etu = rangs[etu]
+        actuelle = partenaire.get(etu)
+        if uni not in rangs_etu:
+            issue = REJETEE
+            nb_rejets += 1
+            libres.append(uni)
+        elif actuelle is None:
+            issue = ACCEPTEE
+            partenaire[etu] = uni
+        elif rangs_etu[uni] < rangs_etu[actuelle]:
+            issue = ACCEPTEE
+            partenaire[etu] = uni
+            nb_rejets += 1
+            libres.append(actuelle)
+            if trace is not None:
+                trace.ajouter(prochain[uni], ids_etu[etu], ids_uni[actuelle], DELOGE)
+        else:
+            issue = REJETEE
+            nb_rejets += 1
+            libres.append(uni)
+        if trace is not None:
+            trace.ajouter(prochain[uni], ids_etu[etu], ids_uni[uni], issue)
+
+    if compteurs is not None:
+        compteurs["propositions"] = nb_propositions
+        compteurs["rejets"] = nb_rejets
+        compteurs["tours"] = max(prochain.values(), default=0)
+
+    affectations: Dict[UniversityKey, List[StudentKey]] = {uni: [] for uni in preferences_universites}
+    for etu, uni in partenaire.items():
+        affectations[uni].append(etu)
     return affectations
+
+
+def affectation_top_trading_cycles(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    compteurs: Optional[Dict[str, int]] = None,
+    trace: Optional[TracePropositions] = None,
+) -> Dict[UniversityKey, List[StudentKey]]:
+    """
+    Top Trading Cycles: chaque étudiant pointe vers sa meilleure université
+    restante, chaque université vers son meilleur étudiant restant; les
+    étudiants d'un cycle obtiennent l'université pointée et sortent du marché.
+
+    Efficace au sens de Pareto pour les étudiants et non manipulable, mais
+    pas stable en général. Seules les paires mutuellement acceptables sont
+    considérées (listes incomplètes).
+
+    Les cycles sont détectés en suivant les pointeurs sur une pile conservée
+    d'un cycle à l'autre: chaque agent est empilé une fois et chaque pointeur
+    ne fait qu'avancer, d'où O(n + m + longueur des listes), O(n²) au pire.
+    Compteurs: pointeurs suivis ("propositions"), entrées sautées car
+    l'agent est parti ou n'accepte pas ("rejets"), cycles ("tours"). Dans la
+    trace, chaque échange d'un cycle est une proposition ACCEPTEE.
+    """
+    _verifier_capacites(preferences_universites, capacites)
+    n, m = len(preferences_etudiants), len(preferences_universites)
+    # Listes incomplètes: ensembles acceptés, pour sauter les paires non mutuelles
+    acceptes_etu = acceptes_uni = None
+    if any(len(p) != m for p in preferences_etudiants.values()) or \
+            any(len(p) != n for p in preferences_universites.values()):
+        acceptes_etu = {e: set(p) for e, p in preferences_etudiants.items()}
+        acceptes_uni = {u: set(p) for u, p in preferences_universites.items()}
+    if trace is not None:
+        ids_etu, ids_uni = trace.preparer(preferences_etudiants, preferences_universites)
+
+    pointeur_etu = dict.fromkeys(preferences_etudiants, 0)
+    pointeur_uni = dict.fromkeys(preferences_universites, 0)
+    partis_etu: set = set()
+    partis_uni: set = set()
+    # Position dans la pile des agents empilés; étudiants aux positions paires
+    position_etu: Dict[StudentKey, int] = {}
+    position_uni: Dict[UniversityKey, int] = {}
+    partenaire: Dict[StudentKey, UniversityKey] = {}
+    pile: list = []
+    nb_pointeurs = nb_sautes = nb_cycles = 0
+
+    for depart in preferences_etudiants:
+        if depart in partis_etu:
+            continue
+        position_etu[depart] = 0
+        pile.append(depart)
+        while pile:
+            k = len(pile) - 1
+            agent = pile[k]
+            if k % 2 == 0:
+                prefs, pointeurs, partis, acceptes, positions = (
+                    preferences_etudiants[agent], pointeur_etu, partis_uni, acceptes_uni, position_uni)
+            else:
+                prefs, pointeurs, partis, acceptes, positions = (
+                    preferences_universites[agent], pointeur_uni, partis_etu, acceptes_etu, position_etu)
+            # Avancer le pointeur jusqu'au meilleur partenaire restant et acceptant
+            p = debut = pointeurs[agent]
+            while p < len(prefs) and (prefs[p] in partis or (acceptes is not None and agent not in acceptes[prefs[p]])):
+                p += 1
+            pointeurs[agent] = p
+            nb_sautes += p - debut
+            if p == len(prefs):
+                # Plus personne: l'agent sort seul, son prédécesseur repointera
+                (partis_uni if k % 2 else partis_etu).add(agent)
+                del (position_uni if k % 2 else position_etu)[agent]
+                pile.pop()
+                continue
+            cible = prefs[p]
+            nb_pointeurs += 1
+            debut_cycle = positions.get(cible)
+            if debut_cycle is None:
+                positions[cible] = len(pile)
+                pile.append(cible)
+                continue
+            # Cycle pile[debut_cycle:]: chaque étudiant obtient l'université qu'il pointe
+            nb_cycles += 1
+            for i in range(debut_cycle, len(pile)):
+                membre = pile[i]
+                if i % 2 == 0:
+                    uni = preferences_etudiants[membre][pointeur_etu[membre]]
+                    partenaire[membre] = uni
+                    partis_etu.add(membre)
+                    del position_etu[membre]
+                    if trace is not None:
+                        trace.ajouter(nb_cycles, ids_etu[membre], ids_uni[uni], ACCEPTEE)
+                else:
+                    partis_uni.add(membre)
+                    del position_uni[membre]
+            del pile[debut_cycle:]
+
+    if compteurs is not None:
+        compteurs["propositions"] = nb_pointeurs
+        compteurs["rejets"] = nb_sautes
+        compteurs["tours"] = nb_cycles
+
+    affectations: Dict[UniversityKey, List[StudentKey]] = {uni: [] for uni in preferences_universites}
+    for etu, uni in partenaire.items():
+        affectations[uni].append(etu)
+    return affectations
+
+
+def boston_tableaux(longueurs_etu, choix_plats, longueurs_uni, classes_plats,
+                    compteurs: Optional[Dict[str, int]] = None,
+                    trace: Optional[TracePropositions] = None):
+    """
+    Mécanisme de Boston (acceptation immédiate) vectorisé sur des listes
+    indexées (voir `listes_indexees`): retourne le titulaire de chaque
+    université (-1: aucun).
+
+    Au tour k, chaque étudiant non affecté candidate à son k-ième choix,
+    même si l'université est déjà pourvue; chaque université libre accepte
+    définitivement sa meilleure candidature du tour.
+    """
+    import numpy as np
+
+    n, m = len(longueurs_etu), len(longueurs_uni)
+    longueurs, choix, rang_uni = _tableaux_denses(longueurs_etu, choix_plats, longueurs_uni, classes_plats)
+
+    titulaire = np.full(m, -1, dtype=np.int64)
+    libres = np.arange(n, dtype=np.int64)
+    nb_propositions = nb_rejets = nb_tours = 0
+
+    for k in range(choix.shape[1]):
+        libres = libres[longueurs[libres] > k]
+        if libres.size == 0:
+            break
+        nb_tours += 1
+        unis = choix[libres, k]
+        rangs = rang_uni[unis, libres]
+        nb_propositions += libres.size
+
+        # Candidatures recevables: université encore libre, étudiant classé
+        recevables = (titulaire[unis] < 0) & (rangs < n)
+        meilleur = np.full(m, n, dtype=np.int32)
+        np.minimum.at(meilleur, unis[recevables], rangs[recevables])
+        gagnant = recevables & (rangs == meilleur[unis])
+        if trace is not None:
+            trace.ajouter_lot(nb_tours, libres, unis, np.where(gagnant, ACCEPTEE, REJETEE))
+
+        titulaire[unis[gagnant]] = libres[gagnant]
+        nb_rejets += libres.size - int(gagnant.sum())
+        libres = libres[~gagnant]
+
+    if compteurs is not None:
+        compteurs["propositions"] = int(nb_propositions)
+        compteurs["rejets"] = int(nb_rejets)
+        compteurs["tours"] = nb_tours
+    return titulaire
+
+
+def affectation_boston(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    compteurs: Optional[Dict[str, int]] = None,
+    trace: Optional[TracePropositions] = None,
+) -> Dict[UniversityKey, List[StudentKey]]:
+    """Mécanisme de Boston (acceptation immédiate, non stable en général), voir `boston_tableaux`."""
+    _verifier_capacites(preferences_universites, capacites)
+    etudiants = list(preferences_etudiants)
+    universites = list(preferences_universites)
+    idx_etu = {e: i for i, e in enumerate(etudiants)}
+    idx_uni = {u: j for j, u in enumerate(universites)}
+    if trace is not None:
+        trace.preparer(etudiants, universites)
+    titulaire = boston_tableaux(*listes_indexees(preferences_etudiants, idx_uni),
+                                *listes_indexees(preferences_universites, idx_etu),
+                                compteurs=compteurs, trace=trace)
+    return {u: [etudiants[t]] if t >= 0 else [] for u, t in zip(universites, titulaire.tolist())}
+
+
+def affectation_composantes(
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    compteurs: Optional[Dict[str, int]] = None,
+    trace: Optional[TracePropositions] = None,
+) -> Dict[UniversityKey, List[StudentKey]]:
+    """
+    Gale-Shapley par tours sur chaque composante connexe du graphe
+    d'acceptabilité (listes incomplètes, préférences régionales), les grandes
+    instances étant résolues en parallèle (voir `decomposition`).
+
+    Avec une `trace`, le marché est résolu d'un bloc par `algorithme_affectation`
+    (une trace unique, aux identifiants du marché entier).
+    """
+    if trace is not None:
+        return algorithme_affectation(preferences_etudiants, preferences_universites, capacites,
+                                      compteurs=compteurs, trace=trace)
+    from decomposition import affectation_par_composantes
+
+    _verifier_capacites(preferences_universites, capacites)
+    return affectation_par_composantes(preferences_etudiants, preferences_universites, capacites,
+                                       compteurs=compteurs)
+
+
+def paires_bloquantes(
+    affectations: Dict[UniversityKey, List[StudentKey]],
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Optional[Dict[UniversityKey, int]] = None,
+    limite: Optional[int] = None,
+) -> List[Tuple[StudentKey, UniversityKey]]:
+    """
+    Paires (étudiant, université) qui se préfèrent mutuellement à leur
+    affectation; vide si l'affectation est stable. S'arrête après `limite` paires.
+    """
+    capacites = capacites or {}
+    rangs_uni = _rangs(preferences_universites)
+    affectation_etu = {etu: uni for uni, etus in affectations.items() for etu in etus}
+    # Rang du moins bon admis par université (len(prefs) si place libre)
+    seuil = {}
+    for uni, prefs in preferences_universites.items():
+        admis = affectations.get(uni, [])
+        if len(admis) < capacites.get(uni, 1):
+            seuil[uni] = len(prefs)
+        else:
+            seuil[uni] = max(rangs_uni[uni][e] for e in admis)
+
+    paires = []
+    for etu, prefs in preferences_etudiants.items():
+        actuelle = affectation_etu.get(etu)
+        for uni in prefs:
+            if uni == actuelle:
+                break
+            rang = rangs_uni.get(uni, {}).get(etu)
+            if rang is not None and rang < seuil[uni]:
+                paires.append((etu, uni))
+                if limite is not None and len(paires) >= limite:
+                    return paires
+    return paires
+
+
+def est_stable(affectations, preferences_etudiants, preferences_universites, capacites=None) -> bool:
+    """Vrai si l'affectation n'a aucune paire bloquante."""
+    return not paires_bloquantes(affectations, preferences_etudiants, preferences_universites,
+                                 capacites, limite=1)
+
+
+# Moteurs d'affectation disponibles (nom -> fonction de même signature,
+# avec des arguments optionnels `compteurs` et `trace`)
+MoteurAffectation = Callable[..., Dict[UniversityKey, List[StudentKey]]]
+
+MOTEURS: Dict[str, MoteurAffectation] = {
+    "gale_shapley": algorithme_affectation,
+    "gale_shapley_file": affectation_file,
+    "gale_shapley_numpy": affectation_numpy,
+    "gale_shapley_composantes": affectation_composantes,
+    "universites_proposantes": affectation_universites_proposantes,
+    "top_trading_cycles": affectation_top_trading_cycles,
+    "boston": affectation_boston,
+}
+
+# Moteurs à étudiants proposants: leurs résultats doivent être identiques
+MOTEURS_ETUDIANTS_PROPOSANTS = ("gale_shapley", "gale_shapley_file", "gale_shapley_numpy",
+                                "gale_shapley_composantes")
+
+# Moteurs produisant une affectation stable (les autres servent de comparaison)
+MOTEURS_STABLES = MOTEURS_ETUDIANTS_PROPOSANTS + ("universites_proposantes",)
+
+
+def obtenir_moteur(nom: str) -> MoteurAffectation:
+    """Retourne le moteur d'affectation `nom` ou lève ValueError."""
+    try:
+        return MOTEURS[nom]
+    except KeyError:
+        raise ValueError(
+            f"Moteur inconnu '{nom}'. Moteurs disponibles: {', '.join(sorted(MOTEURS))}"
+        ) from None
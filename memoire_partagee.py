@@ -0,0 +1,95 @@
+"""Tableaux NumPy en mémoire partagée entre le processus principal et les workers."""
+import sys
+import weakref
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+# Descripteur picklable d'un tableau partagé: (nom du bloc, forme, dtype)
+Descripteur = Tuple[str, Tuple[int, ...], str]
+
+
+def _liberer(blocs: List[shared_memory.SharedMemory]) -> None:
+    while blocs:
+        bloc = blocs.pop()
+        try:
+            bloc.close()
+        except BufferError:
+            # Une vue est encore référencée: le segment sera démappé avec elle
+            pass
+        try:
+            bloc.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ZonePartagee:
+    """
+    Blocs de mémoire partagée possédés par le processus principal.
+
+    Seuls les descripteurs (nom, forme, dtype) sont envoyés aux workers, qui
+    attachent les blocs sans copie (`attacher`). Tous les blocs sont détruits
+    à la sortie du `with`, y compris sur exception ou annulation, et à défaut
+    lors de la collecte de la zone ou à la fin du programme.
+    """
+
+    def __init__(self):
+        self._blocs: List[shared_memory.SharedMemory] = []
+        self._finaliseur = weakref.finalize(self, _liberer, self._blocs)
+
+    def creer(self, forme: Tuple[int, ...], dtype=np.int32) -> Tuple[np.ndarray, Descripteur]:
+        """Alloue un tableau partagé (non initialisé); retourne sa vue et son descripteur."""
+        dtype = np.dtype(dtype)
+        taille = max(int(np.prod(forme, dtype=np.int64)) * dtype.itemsize, 1)
+        bloc = shared_memory.SharedMemory(create=True, size=taille)
+        self._blocs.append(bloc)
+        return np.ndarray(forme, dtype=dtype, buffer=bloc.buf), (bloc.name, tuple(forme), dtype.str)
+
+    def partager(self, tableau: np.ndarray) -> Descripteur:
+        """Copie `tableau` dans un nouveau bloc partagé."""
+        vue, descripteur = self.creer(tableau.shape, tableau.dtype)
+        vue[...] = tableau
+        return descripteur
+
+    def liberer(self) -> None:
+        """Détruit tous les blocs (les vues de la zone ne doivent plus servir)."""
+        _liberer(self._blocs)
+
+    def __len__(self) -> int:
+        return len(self._blocs)
+
+    def __enter__(self) -> "ZonePartagee":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.liberer()
+
+
+def _ouvrir(nom: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        # Le bloc appartient au processus principal: pas de suivi côté worker
+        return shared_memory.SharedMemory(name=nom, track=False)
+    return shared_memory.SharedMemory(name=nom)
+
+
+@contextmanager
+def attacher(descripteurs: Sequence[Descripteur]) -> Iterator[List[np.ndarray]]:
+    """
+    Attache des blocs partagés dans un worker, sans copie. Les vues sont
+    retirées de la liste à la sortie: ne pas les conserver au-delà (copier
+    ce qui doit l'être). Les blocs sont fermés, jamais détruits.
+    """
+    blocs = [_ouvrir(nom) for nom, _, _ in descripteurs]
+    tableaux = [np.ndarray(forme, dtype=np.dtype(dtype), buffer=bloc.buf)
+                for bloc, (_, forme, dtype) in zip(blocs, descripteurs)]
+    try:
+        yield tableaux
+    finally:
+        tableaux.clear()
+        for bloc in blocs:
+            try:
+                bloc.close()
+            except BufferError:
+                pass
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Ordonnanceur de travaux (asyncio): file à priorités, délais, annulation et préemption.
+
+Chaque travail s'exécute dans son propre processus (et groupe de processus):
+il peut être suspendu, repris ou tué avec ses éventuels sous-processus, ce
+qu'un pool partagé ne permet pas. La boucle asyncio tourne dans un thread
+dédié; l'API est utilisable depuis la GUI comme depuis la ligne de commande:
+
+    python -m ordonnanceur "--tailles 100,500 --sortie a.jsonl" "--tailles 200 --rejouer 42" --delai 600
+"""
+import argparse
+import asyncio
+import atexit
+import heapq
+import itertools
+import multiprocessing
+import os
+import shlex
+import signal
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Priorités (la plus petite passe en premier)
+PRIORITE_INTERACTIVE = 0
+PRIORITE_FOND = 10
+
+# États d'un travail
+EN_ATTENTE = "en attente"
+EN_COURS = "en cours"
+SUSPENDU = "suspendu"
+TERMINE = "terminé"
+ECHEC = "échec"
+ANNULE = "annulé"
+DELAI_DEPASSE = "délai dépassé"
+ETATS_FINAUX = (TERMINE, ECHEC, ANNULE, DELAI_DEPASSE)
+
+# Suspension d'un groupe de processus (POSIX); sinon, priorités sans préemption
+PREEMPTION_POSSIBLE = hasattr(signal, "SIGSTOP") and hasattr(os, "killpg")
+
+# Période de surveillance des processus (s)
+PERIODE_S = 0.05
+
+
+@dataclass
+class Travail:
+    """Un travail soumis: fonction picklable exécutée dans un processus dédié."""
+    id: int
+    nom: str
+    priorite: int
+    fonction: Callable
+    args: tuple = ()
+    kwargs: Dict = field(default_factory=dict)
+    delai_s: Optional[float] = None
+    progressif: bool = False
+    etat: str = EN_ATTENTE
+    resultat: Any = None
+    erreur: Optional[str] = None
+    # Messages envoyés par `progression(...)` (le dernier dans `progression`)
+    messages: List = field(default_factory=list)
+    progression: Any = None
+    soumis: float = field(default_factory=time.time)
+    debut: Optional[float] = None
+    fin: Optional[float] = None
+    temps_calcul_s: float = 0.0
+    preemptions: int = 0
+    _processus: Any = field(default=None, repr=False, compare=False)
+    _tache: Any = field(default=None, repr=False, compare=False)
+    _fini: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
+
+    @property
+    def termine(self) -> bool:
+        return self.etat in ETATS_FINAUX
+
+    @property
+    def duree_s(self) -> float:
+        """Temps écoulé depuis le démarrage (jusqu'à la fin si terminé)."""
+        if self.debut is None:
+            return 0.0
+        return (self.fin or time.time()) - self.debut
+
+
+def _executer(conn, fonction: Callable, args: tuple, kwargs: Dict, progressif: bool) -> None:
+    """Corps du processus d'un travail: envoie la progression puis le résultat (ou l'erreur)."""
+    if hasattr(os, "setpgrp"):
+        # Groupe propre: suspension et arrêt atteignent aussi les sous-processus
+        os.setpgrp()
+    try:
+        if progressif:
+            kwargs = dict(kwargs, progression=lambda valeur: conn.send(("progression", valeur)))
+        conn.send(("resultat", fonction(*args, **kwargs)))
+    except BaseException as e:
+        conn.send(("erreur", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def _signaler(pid: int, sig: int) -> None:
+    """Envoie `sig` au groupe du processus (à lui seul si le groupe n'existe pas encore)."""
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+
+def _arreter_processus(processus) -> None:
+    if processus is None or processus.pid is None:
+        return
+    if hasattr(os, "killpg"):
+        _signaler(processus.pid, signal.SIGTERM)
+        # Un groupe suspendu ne traite SIGTERM qu'une fois repris
+        _signaler(processus.pid, signal.SIGCONT)
+        processus.join(2)
+        if processus.is_alive():
+            _signaler(processus.pid, signal.SIGKILL)
+    else:
+        processus.terminate()
+    processus.join(2)
+
+
+def _contexte_par_defaut():
+    """forkserver (fork sûr depuis un processus multi-thread, modules préchargés), sinon spawn."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        contexte = multiprocessing.get_context("forkserver")
+        contexte.set_forkserver_preload(["matching", "satisfaction", "experiences"])
+        return contexte
+    return multiprocessing.get_context("spawn")
+
+
+class Ordonnanceur:
+    """
+    File à priorités de travaux, exécutés au plus `emplacements` à la fois.
+
+    Un travail en attente plus prioritaire qu'un travail en cours le préempte:
+    le moins prioritaire (le plus récent à égalité) est suspendu, puis repris
+    dès qu'un emplacement se libère. `delai_s` borne le temps de calcul d'un
+    travail (hors suspension). Toutes les méthodes publiques sont utilisables
+    depuis n'importe quel thread.
+    """
+
+    def __init__(self, emplacements: int = 1, contexte=None):
+        self.emplacements = emplacements
+        self._contexte = contexte or _contexte_par_defaut()
+        self._travaux: Dict[int, Travail] = {}
+        self._ids = itertools.count(1)
+        self._verrou = threading.Lock()
+        self._file: List = []           # tas de (priorité, id, travail)
+        self._en_cours: List[Travail] = []
+        self._boucle = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._boucle.run_forever, name="ordonnanceur", daemon=True)
+        self._thread.start()
+        self._ferme = False
+        atexit.register(self.fermer)
+
+    # API (tout thread)
+
+    def soumettre(self, fonction: Callable, args: tuple = (), kwargs: Optional[Dict] = None,
+                  nom: Optional[str] = None, priorite: int = PRIORITE_FOND,
+                  delai_s: Optional[float] = None, progressif: bool = False) -> Travail:
+        """
+        Met un travail en file. Avec `progressif`, `fonction` reçoit un argument
+        `progression` (callable) dont chaque appel ajoute un message au travail.
+        """
+        if self._ferme:
+            raise RuntimeError("Ordonnanceur fermé")
+        with self._verrou:
+            travail = Travail(next(self._ids), nom or getattr(fonction, "__name__", "travail"), priorite,
+                              fonction, tuple(args), dict(kwargs or {}), delai_s, progressif)
+            self._travaux[travail.id] = travail
+        self._boucle.call_soon_threadsafe(self._ajouter, travail)
+        return travail
+
+    def annuler(self, travail_id: int) -> None:
+        """Annule un travail en attente, ou tue celui en cours (et ses sous-processus)."""
+        self._boucle.call_soon_threadsafe(self._annuler, travail_id)
+
+    def travaux(self) -> List[Travail]:
+        """Tous les travaux soumis, dans l'ordre de soumission."""
+        with self._verrou:
+            return list(self._travaux.values())
+
+    def attendre(self, travail: Travail, timeout: Optional[float] = None) -> Travail:
+        """Bloque jusqu'à la fin du travail (ou `timeout`)."""
+        travail._fini.wait(timeout)
+        return travail
+
+    def fermer(self) -> None:
+        """Annule tous les travaux, tue les processus et arrête la boucle."""
+        if self._ferme:
+            return
+        self._ferme = True
+        if self._boucle.is_running():
+            asyncio.run_coroutine_threadsafe(self._tout_annuler(), self._boucle).result()
+            self._boucle.call_soon_threadsafe(self._boucle.stop)
+        self._thread.join()
+        self._boucle.close()
+
+    # Boucle asyncio (thread de l'ordonnanceur)
+
+    def _ajouter(self, travail: Travail) -> None:
+        heapq.heappush(self._file, (travail.priorite, travail.id, travail))
+        self._repartir()
+
+    def _prochain(self) -> Optional[Travail]:
+        """Candidat le plus prioritaire: en file ou suspendu."""
+        while self._file and self._file[0][2].etat != EN_ATTENTE:
+            heapq.heappop(self._file)
+        candidats = [(t.priorite, t.id, t) for t in self._en_cours if t.etat == SUSPENDU]
+        if self._file:
+            candidats.append(self._file[0])
+        return min(candidats, key=lambda c: c[:2])[2] if candidats else None
+
+    def _repartir(self) -> None:
+        """Occupe les emplacements libres, en préemptant si un candidat est plus prioritaire."""
+        while not self._ferme:
+            candidat = self._prochain()
+            if candidat is None:
+                return
+            actifs = [t for t in self._en_cours if t.etat == EN_COURS]
+            if len(actifs) < self.emplacements:
+                self._lancer(candidat)
+                continue
+            victime = max(actifs, key=lambda t: (t.priorite, t.debut))
+            if not (PREEMPTION_POSSIBLE and candidat.priorite < victime.priorite):
+                return
+            _signaler(victime._processus.pid, signal.SIGSTOP)
+            victime.etat = SUSPENDU
+            victime.preemptions += 1
+            self._lancer(candidat)
+
+    def _lancer(self, travail: Travail) -> None:
+        if travail.etat == SUSPENDU:
+            _signaler(travail._processus.pid, signal.SIGCONT)
+            travail.etat = EN_COURS
+            return
+        heapq.heappop(self._file)
+        recepteur, emetteur = self._contexte.Pipe(duplex=False)
+        # Non démon: un travail peut lancer son propre pool de processus
+        travail._processus = self._contexte.Process(
+            target=_executer, name=f"travail-{travail.id}",
+            args=(emetteur, travail.fonction, travail.args, travail.kwargs, travail.progressif))
+        travail._processus.start()
+        emetteur.close()
+        travail.etat = EN_COURS
+        travail.debut = time.time()
+        self._en_cours.append(travail)
+        travail._tache = self._boucle.create_task(self._superviser(travail, recepteur))
+
+    async def _superviser(self, travail: Travail, conn) -> None:
+        """Relaie la progression et le résultat; applique délai et annulation."""
+        processus = travail._processus
+        precedent = time.monotonic()
+        try:
+            while True:
+                while conn.poll():
+                    # Réception hors de la boucle: un gros résultat peut prendre du temps
+                    genre, contenu = await self._boucle.run_in_executor(None, conn.recv)
+                    if genre == "progression":
+                        travail.messages.append(contenu)
+                        travail.progression = contenu
+                    elif genre == "resultat":
+                        travail.resultat = contenu
+                        travail.etat = TERMINE
+                        return
+                    else:
+                        travail.erreur = contenu
+                        travail.etat = ECHEC
+                        return
+                if not processus.is_alive() and not conn.poll():
+                    travail.erreur = f"Processus arrêté (code {processus.exitcode})"
+                    travail.etat = ECHEC
+                    return
+                await asyncio.sleep(PERIODE_S)
+                maintenant = time.monotonic()
+                if travail.etat == EN_COURS:
+                    travail.temps_calcul_s += maintenant - precedent
+                precedent = maintenant
+                if travail.delai_s is not None and travail.temps_calcul_s > travail.delai_s:
+                    travail.erreur = f"Délai de {travail.delai_s:g} s dépassé"
+                    travail.etat = DELAI_DEPASSE
+                    return
+        except asyncio.CancelledError:
+            travail.etat = ANNULE
+        except (EOFError, OSError) as e:
+            travail.erreur = f"Liaison avec le processus perdue: {e}"
+            travail.etat = ECHEC
+        finally:
+            if processus.is_alive():
+                await self._boucle.run_in_executor(None, _arreter_processus, processus)
+            else:
+                processus.join()
+            conn.close()
+            self._en_cours.remove(travail)
+            self._finir(travail)
+            self._repartir()
+
+    def _finir(self, travail: Travail) -> None:
+        travail.fin = time.time()
+        travail._fini.set()
+
+    def _annuler(self, travail_id: int) -> None:
+        travail = self._travaux.get(travail_id)
+        if travail is None or travail.termine:
+            return
+        if travail.etat == EN_ATTENTE:
+            travail.etat = ANNULE
+            self._finir(travail)
+        elif travail._tache is not None:
+            travail._tache.cancel()
+
+    async def _tout_annuler(self) -> None:
+        for travail in list(self._travaux.values()):
+            self._annuler(travail.id)
+        taches = [t._tache for t in list(self._en_cours) if t._tache is not None]
+        if taches:
+            await asyncio.gather(*taches, return_exceptions=True)
+
+
+def formater_travaux(travaux: Sequence[Travail]) -> str:
+    """Tableau texte de l'état des travaux."""
+    lignes = [f"{'id':>4} {'état':<14} {'prio.':>5} {'durée s':>8} {'calcul s':>8}  nom"]
+    for t in travaux:
+        lignes.append(f"{t.id:>4} {t.etat:<14} {t.priorite:>5} {t.duree_s:>8.1f} {t.temps_calcul_s:>8.1f}  {t.nom}"
+                      + (f"  ({t.erreur})" if t.erreur else ""))
+    return "\n".join(lignes)
+
+
+# Travaux usuels (fonctions picklables exécutées dans le processus du travail)
+
+def travail_simulation(prefs_etud, prefs_uni, capacites, moteur: str = "gale_shapley", trace: bool = False,
+                       classes=None, departage: str = "unique", tirages: int = 1):
+    """
+    Simulation unique: affectation, satisfactions et trace facultative des
+    propositions. Avec `classes` (égalités des établissements, voir
+    `egalites`), un départage `departage` précède le moteur; le dernier
+    élément du résultat décrit alors les listes départagées, les paires
+    bloquantes au sens faible et, si `tirages` > 1, la distribution des issues.
+    """
+    from matching import obtenir_moteur
+    from satisfaction import compter_paires_bloquantes, mesurer_satisfaction_globale
+    from trace_propositions import TracePropositions
+
+    trace_props = TracePropositions() if trace else None
+    if classes is None:
+        affectations = obtenir_moteur(moteur)(prefs_etud, prefs_uni, capacites, trace=trace_props)
+        stats = mesurer_satisfaction_globale(affectations, prefs_etud, prefs_uni, capacites)
+        return affectations, stats, trace_props, None
+
+    from egalites import MarcheAvecEgalites, affectation_avec_egalites, resumer_distribution
+
+    affectations, strictes = affectation_avec_egalites(prefs_etud, prefs_uni, capacites, classes, departage,
+                                                       moteur=moteur, trace=trace_props)
+    stats = mesurer_satisfaction_globale(affectations, prefs_etud, strictes, capacites)
+    egalites = {
+        "departage": departage,
+        "preferences_universites": strictes,
+        "paires_bloquantes_faibles": compter_paires_bloquantes(affectations, prefs_etud, prefs_uni, capacites,
+                                                               classes_universites=classes),
+        "distribution": None,
+    }
+    if tirages > 1:
+        marche = MarcheAvecEgalites(prefs_etud, prefs_uni, classes)
+        egalites["distribution"] = resumer_distribution(marche.distribution(marche.tirages(tirages, departage)))
+    return affectations, stats, trace_props, egalites
+
+
+def travail_campagne(taches, moteur: str = "gale_shapley", modele: str = "uniforme",
+                     synthetique: bool = False, workers: int = 1, memoire: bool = False,
+                     progression: Optional[Callable] = None):
+    """
+    Répétitions planifiées (voir `cli.planifier`); chaque résultat est envoyé
+    à `progression` dès qu'il est prêt. Retourne le nombre de répétitions.
+    """
+    from cli import STUDENTS_CSV, UNIVERSITIES_CSV, executer_campagne
+    from data.data_loader import load_students_from_csv, load_universities_from_csv
+    from experiences import entites_synthetiques
+
+    if synthetique:
+        students, universities = entites_synthetiques(max(t[2] for t in taches), max(t[3] for t in taches))
+    else:
+        students = load_students_from_csv(STUDENTS_CSV)
+        universities = load_universities_from_csv(UNIVERSITIES_CSV)
+    nb = 0
+    for result in executer_campagne(taches, students, universities, moteur, workers,
+                                    modele=modele, memoire=memoire):
+        if progression is not None:
+            progression(result)
+        nb += 1
+    return nb
+
+
+def travail_cli(argv: Sequence[str]) -> int:
+    """Campagne en ligne de commande (arguments de `python -m cli`); retourne son code de sortie."""
+    from cli import main as main_cli
+
+    return main_cli(list(argv))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ordonnanceur",
+        description="Met en file des campagnes `python -m cli` et suit leur exécution. Une campagne "
+                    "avec --rejouer (simulation unique) est interactive et préempte les autres.",
+    )
+    parser.add_argument("campagnes", nargs="+", metavar="ARGUMENTS",
+                        help="arguments d'une campagne, entre guillemets, ex: \"--tailles 100,500 --sortie a.jsonl\"")
+    parser.add_argument("--paralleles", type=int, default=1, help="campagnes exécutées en même temps (défaut: 1)")
+    parser.add_argument("--delai", type=float, default=None, help="temps de calcul maximal par campagne (s)")
+    args = parser.parse_args(argv)
+
+    ordonnanceur = Ordonnanceur(emplacements=max(args.paralleles, 1))
+    travaux = []
+    for texte in args.campagnes:
+        arguments = shlex.split(texte)
+        priorite = PRIORITE_INTERACTIVE if "--rejouer" in arguments else PRIORITE_FOND
+        travaux.append(ordonnanceur.soumettre(travail_cli, (arguments,), nom=texte,
+                                              priorite=priorite, delai_s=args.delai))
+    precedent = None
+    try:
+        while True:
+            etats = [(t.etat, t.preemptions) for t in travaux]
+            if etats != precedent:
+                print(formater_travaux(travaux) + "\n", file=sys.stderr)
+                precedent = etats
+            if all(t.termine for t in travaux):
+                break
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        print("Interruption: annulation des campagnes", file=sys.stderr)
+        ordonnanceur.fermer()
+        print(formater_travaux(travaux), file=sys.stderr)
+        return 130
+    ordonnanceur.fermer()
+    return 0 if all(t.etat == TERMINE and t.resultat == 0 for t in travaux) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,27 @@
 """Génération des préférences pour étudiants et universités."""
 import random
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from models import Student, University, StudentKey, UniversityKey
 
 
 def generer_preferences_etudiants(
     etudiants: List[Student],
-    universites: List[University]
+    universites: List[University],
+    rng: Optional[random.Random] = None,
 ) -> Dict[StudentKey, List[UniversityKey]]:
     """
     Génère les préférences aléatoires pour chaque étudiant.
     
+    `rng` permet une génération reproductible (par défaut: RNG global).
     """
+    shuffle = (rng or random).shuffle
     preferences: Dict[StudentKey, List[UniversityKey]] = {}
     uni_names = [u.name for u in universites]
 
     for etu in etudiants:
         prefs = uni_names.copy()
-        random.shuffle(prefs)
+        shuffle(prefs)
         preferences[etu.full_name] = prefs
 
     return preferences
@@ -26,18 +29,117 @@ def generer_preferences_etudiants(
 
 def generer_preferences_universites(
     etudiants: List[Student],
-    universites: List[University]
+    universites: List[University],
+    rng: Optional[random.Random] = None,
 ) -> Dict[UniversityKey, List[StudentKey]]:
     """
     Génère les préférences aléatoires pour chaque université.
 
+    `rng` permet une génération reproductible (par défaut: RNG global).
     """
+    shuffle = (rng or random).shuffle
     preferences: Dict[UniversityKey, List[StudentKey]] = {}
     etu_names = [e.full_name for e in etudiants]
 
     for uni in universites:
         prefs = etu_names.copy()
-        random.shuffle(prefs)
+        shuffle(prefs)
         preferences[uni.name] = prefs
 
     return preferences
+
+
+def _classer_par_score(
+    candidats: List[str],
+    qualites: Dict[str, float],
+    correlation: float,
+    rng,
+) -> List[str]:
+    """Classe `candidats` par score décroissant: qualité commune + bruit individuel."""
+    scores = {c: correlation * qualites[c] + (1 - correlation) * rng.random() for c in candidats}
+    return sorted(candidats, key=scores.__getitem__, reverse=True)
+
+
+def generer_preferences_correlees(
+    etudiants: List[Student],
+    universites: List[University],
+    correlation: float = 0.5,
+    rng: Optional[random.Random] = None,
+) -> Tuple[Dict[StudentKey, List[UniversityKey]], Dict[UniversityKey, List[StudentKey]]]:
+    """
+    Génère des préférences corrélées des deux côtés.
+
+    Chaque entité a une qualité commune tirée uniformément; chaque classement
+    trie selon `correlation * qualité + (1 - correlation) * bruit`.
+    correlation=0 redonne le modèle uniforme, correlation=1 une liste maîtresse.
+    """
+    rng = rng or random
+    uni_names = [u.name for u in universites]
+    etu_names = [e.full_name for e in etudiants]
+    qualite_uni = {u: rng.random() for u in uni_names}
+    qualite_etu = {e: rng.random() for e in etu_names}
+
+    prefs_etud = {e: _classer_par_score(uni_names, qualite_uni, correlation, rng) for e in etu_names}
+    prefs_uni = {u: _classer_par_score(etu_names, qualite_etu, correlation, rng) for u in uni_names}
+    return prefs_etud, prefs_uni
+
+
+def generer_preferences_regionales(
+    etudiants: List[Student],
+    universites: List[University],
+    nb_regions: int = 8,
+    rng: Optional[random.Random] = None,
+) -> Tuple[Dict[StudentKey, List[UniversityKey]], Dict[UniversityKey, List[StudentKey]]]:
+    """
+    Génère des préférences régionales (listes incomplètes).
+
+    Étudiants et universités sont répartis au hasard, à parts égales, entre
+    `nb_regions` régions; chacun classe aléatoirement les seuls agents de sa
+    région. Le marché se décompose en `nb_regions` sous-marchés indépendants.
+    """
+    rng = rng or random
+    uni_names = [u.name for u in universites]
+    etu_names = [e.full_name for e in etudiants]
+    melange_uni = uni_names.copy()
+    rng.shuffle(melange_uni)
+    melange_etu = etu_names.copy()
+    rng.shuffle(melange_etu)
+    unis_region = [melange_uni[r::nb_regions] for r in range(nb_regions)]
+    etus_region = [melange_etu[r::nb_regions] for r in range(nb_regions)]
+
+    prefs_etud: Dict[StudentKey, List[UniversityKey]] = {}
+    prefs_uni: Dict[UniversityKey, List[StudentKey]] = {}
+    for unis, etus in zip(unis_region, etus_region):
+        for e in etus:
+            prefs = unis.copy()
+            rng.shuffle(prefs)
+            prefs_etud[e] = prefs
+        for u in unis:
+            prefs = etus.copy()
+            rng.shuffle(prefs)
+            prefs_uni[u] = prefs
+    # Ordre des dictionnaires: celui des entités
+    return ({e: prefs_etud[e] for e in etu_names}, {u: prefs_uni[u] for u in uni_names})
+
+
+# Modèles de préférences disponibles pour les campagnes de tests
+MODELES_PREFERENCES = ("uniforme", "correle", "regional")
+
+
+def generer_preferences(
+    etudiants: List[Student],
+    universites: List[University],
+    modele: str = "uniforme",
+    rng: Optional[random.Random] = None,
+) -> Tuple[Dict[StudentKey, List[UniversityKey]], Dict[UniversityKey, List[StudentKey]]]:
+    """Génère les préférences des deux côtés selon le modèle `modele`."""
+    if modele == "uniforme":
+        return (generer_preferences_etudiants(etudiants, universites, rng=rng),
+                generer_preferences_universites(etudiants, universites, rng=rng))
+    if modele == "correle":
+        return generer_preferences_correlees(etudiants, universites, rng=rng)
+    if modele == "regional":
+        return generer_preferences_regionales(etudiants, universites, rng=rng)
+    raise ValueError(
+        f"Modèle de préférences inconnu '{modele}'. Modèles disponibles: {', '.join(MODELES_PREFERENCES)}"
+    )
@@ -0,0 +1,108 @@
+"""Points de reprise des campagnes de tests (répétitions terminées et agrégats partiels)."""
+import json
+import os
+from typing import Dict, Optional, Set, Tuple
+
+from statistiques import Welford
+
+# Métriques dont l'agrégat (Welford) est conservé par taille
+METRIQUES_REPRISE = ("sat_students", "sat_universities", "r_etu_obs", "r_uni_obs", "exec_time_ms")
+
+
+class JournalReprise:
+    """
+    Fichier JSON Lines décrivant l'avancement d'une campagne.
+
+    La première ligne contient la configuration (dont la graine maîtresse);
+    chaque répétition terminée ajoute une ligne (n, m, répétition, graine) avec
+    l'état des agrégats de sa taille après cette répétition. Une ligne
+    tronquée (arrêt brutal pendant l'écriture) est ignorée au chargement.
+    """
+
+    def __init__(self, path: str, config: Dict):
+        self.path = path
+        self.config = config
+        self.termines: Set[Tuple[int, int, int]] = set()
+        self.agregats: Dict[Tuple[int, int], Dict[str, Welford]] = {}
+        self._file = None
+
+    @classmethod
+    def creer(cls, path: str, config: Dict) -> "JournalReprise":
+        """Démarre un nouveau journal (écrase l'éventuel précédent)."""
+        journal = cls(path, config)
+        journal._file = open(path, "w", encoding="utf-8")
+        journal._ecrire({"config": config})
+        return journal
+
+    @classmethod
+    def charger(cls, path: str) -> Optional["JournalReprise"]:
+        """Relit un journal existant et le rouvre en ajout; None s'il est absent ou illisible."""
+        try:
+            with open(path, "rb") as f:
+                donnees = f.read()
+        except OSError:
+            return None
+        lignes = donnees.decode("utf-8", errors="replace").splitlines()
+        try:
+            config = json.loads(lignes[0])["config"]
+        except (IndexError, ValueError, KeyError, TypeError):
+            return None
+
+        journal = cls(path, config)
+        derniere_lue = True
+        for ligne in lignes[1:]:
+            try:
+                entree = json.loads(ligne)
+                taille = (entree["n"], entree["m"])
+                journal.termines.add((entree["n"], entree["m"], entree["rep"]))
+                journal.agregats[taille] = {
+                    nom: Welford.depuis_etat(etat) for nom, etat in entree["agregats"].items()
+                }
+                derniere_lue = True
+            except (ValueError, KeyError, TypeError, AttributeError):
+                derniere_lue = False
+        # Dernière ligne sans fin de ligne (arrêt pendant l'écriture): tronquée, elle est
+        # effacée; complète, elle est terminée. Sinon le prochain ajout s'y collerait.
+        fin = donnees.rfind(b"\n") + 1
+        if fin < len(donnees) and not derniere_lue:
+            with open(path, "r+b") as f:
+                f.truncate(fin)
+        journal._file = open(path, "a", encoding="utf-8")
+        if fin < len(donnees) and derniere_lue:
+            journal._ecrire_brut("\n")
+        return journal
+
+    def _ecrire(self, objet: Dict) -> None:
+        self._ecrire_brut(json.dumps(objet, ensure_ascii=False) + "\n")
+
+    def _ecrire_brut(self, texte: str) -> None:
+        self._file.write(texte)
+        self._file.flush()
+
+    def est_termine(self, nb_students: int, nb_universities: int, repetition: int) -> bool:
+        return (nb_students, nb_universities, repetition) in self.termines
+
+    def accumulateur(self, nb_students: int, nb_universities: int, metrique: str) -> Welford:
+        """Agrégat partiel d'une métrique pour une taille (vide si rien n'est fait)."""
+        etat = self.agregats.get((nb_students, nb_universities), {}).get(metrique)
+        return Welford.depuis_etat(etat.etat()) if etat is not None else Welford()
+
+    def enregistrer(self, result: Dict) -> None:
+        """Marque la répétition `result` comme terminée et met à jour les agrégats."""
+        n, m, rep = result["nb_students"], result["nb_universities"], result["repetition"]
+        agregats = self.agregats.setdefault((n, m), {nom: Welford() for nom in METRIQUES_REPRISE})
+        for nom, acc in agregats.items():
+            acc.ajouter(result[nom])
+        self.termines.add((n, m, rep))
+        self._ecrire({"n": n, "m": m, "rep": rep, "seed": result.get("seed"),
+                      "agregats": {nom: acc.etat() for nom, acc in agregats.items()}})
+
+    def fermer(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+    def terminer(self) -> None:
+        """Campagne achevée: le journal est supprimé."""
+        self.fermer()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,29 +1,39 @@
 """Calcul des satisfactions pour étudiants et universités."""
-from typing import Dict, List
+from typing import Dict, List, Optional
 import numpy as np
 import math
 
 from models import StudentKey, UniversityKey
 
 
+def affectation_par_etudiant(
+    affectations: Dict[UniversityKey, List[StudentKey]],
+) -> Dict[StudentKey, UniversityKey]:
+    """Table inverse étudiant -> université (les non affectés en sont absents)."""
+    return {etu: uni for uni, etus in affectations.items() for etu in etus}
+
+
 def satisfaction_etudiant(
     etudiant_key: StudentKey,
     preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
     affectations: Dict[UniversityKey, List[StudentKey]],
+    affectation_etudiants: Optional[Dict[StudentKey, UniversityKey]] = None,
 ) -> float:
     """
     Calcule la satisfaction d'un étudiant avec la formule normalisée.
     S = 1 - (r-1)/(n-1) où r est le rang obtenu et n le nombre de choix.
+    Un étudiant non affecté a une satisfaction nulle.
+
+    `affectation_etudiants` (voir `affectation_par_etudiant`) évite de
+    parcourir toutes les universités pour chaque étudiant.
     """
     prefs = preferences_etudiants[etudiant_key]
     n = len(prefs)
 
     # Trouver l'université d'affectation
-    universite_key = None
-    for uni, etus in affectations.items():
-        if etudiant_key in etus:
-            universite_key = uni
-            break
+    if affectation_etudiants is None:
+        affectation_etudiants = affectation_par_etudiant(affectations)
+    universite_key = affectation_etudiants.get(etudiant_key)
 
     if universite_key is None:
         return 0.0
@@ -70,22 +80,22 @@ def satisfaction_etablissement(
 def calculer_rang_moyen_etudiants(
     affectations: Dict[UniversityKey, List[StudentKey]],
     preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    affectation_etudiants: Optional[Dict[StudentKey, UniversityKey]] = None,
 ) -> float:
     """
     Calcule le rang moyen obtenu par les étudiants (demandeurs/proposants).
-    Rang 1 = premier choix, rang n = dernier choix.
+    Rang 1 = premier choix, rang n = dernier choix. Seuls les étudiants
+    affectés sont comptés.
     """
     rangs = []
+    if affectation_etudiants is None:
+        affectation_etudiants = affectation_par_etudiant(affectations)
     
     for etu_key in preferences_etudiants:
         prefs = preferences_etudiants[etu_key]
         
         # Trouver l'université d'affectation
-        universite_key = None
-        for uni, etus in affectations.items():
-            if etu_key in etus:
-                universite_key = uni
-                break
+        universite_key = affectation_etudiants.get(etu_key)
         
         if universite_key is not None and universite_key in prefs:
             rang = prefs.index(universite_key) + 1
@@ -118,31 +128,258 @@ def calculer_rang_moyen_etablissements(
     return float(np.mean(rangs)) if rangs else 0.0
 
 
+# Classes fixes de l'histogramme des rangs: [1], [2], [3-4], [5-8], ... [2^16+1 - 2^17]
+# (indépendantes de n, donc cumulables entre répétitions et tailles)
+NB_CLASSES_RANGS = 18
+
+
+def libelles_classes_rangs() -> List[str]:
+    """Libellés des classes de rangs ("1", "2", "3-4", "5-8", ...)."""
+    libelles = ["1", "2"]
+    for k in range(2, NB_CLASSES_RANGS):
+        libelles.append(f"{2 ** (k - 1) + 1}-{2 ** k}")
+    return libelles
+
+
+def rangs_obtenus(
+    affectations: Dict[UniversityKey, List[StudentKey]],
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    affectation_etudiants: Optional[Dict[StudentKey, UniversityKey]] = None,
+):
+    """
+    Rangs obtenus (1 = premier choix, 0 = non apparié ou partenaire non classé)
+    et longueurs des listes, dans l'ordre des dictionnaires de préférences.
+
+    Returns:
+        (rangs étudiants, longueurs étudiants, rangs universités, longueurs universités),
+        tableaux NumPy int64
+    """
+    if affectation_etudiants is None:
+        affectation_etudiants = affectation_par_etudiant(affectations)
+
+    def rang(prefs, partenaire):
+        if partenaire is None:
+            return 0
+        try:
+            return prefs.index(partenaire) + 1
+        except ValueError:
+            return 0
+
+    rangs_etu = np.fromiter(
+        (rang(prefs, affectation_etudiants.get(etu)) for etu, prefs in preferences_etudiants.items()),
+        dtype=np.int64, count=len(preferences_etudiants))
+    longueurs_etu = np.fromiter((len(p) for p in preferences_etudiants.values()),
+                                dtype=np.int64, count=len(preferences_etudiants))
+    # Premier étudiant affecté (capacité=1 par défaut)
+    rangs_uni = np.fromiter(
+        (rang(prefs, (affectations.get(uni) or [None])[0]) for uni, prefs in preferences_universites.items()),
+        dtype=np.int64, count=len(preferences_universites))
+    longueurs_uni = np.fromiter((len(p) for p in preferences_universites.values()),
+                                dtype=np.int64, count=len(preferences_universites))
+    return rangs_etu, longueurs_etu, rangs_uni, longueurs_uni
+
+
+def _paires_mutuelles(preferences_a, limites_a, preferences_b, limites_b) -> int:
+    """
+    Nombre de paires (a, b) avec b parmi les `limites_a[a]` premiers choix de
+    a et a parmi les `limites_b[b]` premiers choix de b.
+    """
+    groupes: Dict[str, List[str]] = {}
+    for a, prefs in preferences_a.items():
+        for b in prefs[:limites_a[a]]:
+            groupes.setdefault(b, []).append(a)
+    total = 0
+    for b, membres in groupes.items():
+        prefs = preferences_b.get(b)
+        if prefs:
+            total += len(set(membres).intersection(prefs[:limites_b[b]]))
+    return total
+
+
+def compter_paires_bloquantes(
+    affectations: Dict[UniversityKey, List[StudentKey]],
+    preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
+    preferences_universites: Dict[UniversityKey, List[StudentKey]],
+    capacites: Dict[UniversityKey, int],
+    rangs_etu: Optional[np.ndarray] = None,
+    classes_universites: Optional[Dict[UniversityKey, np.ndarray]] = None,
+    rangs_uni: Optional[np.ndarray] = None,
+) -> int:
+    """
+    Nombre de paires (étudiant, université) qui se préfèrent mutuellement à
+    leur affectation; 0 si l'affectation est stable.
+
+    Chaque agent ne regarde que le début de sa liste (partenaires préférés
+    au sien): le côté au total le plus court est parcouru en Python, l'autre
+    par intersections d'ensembles. `rangs_etu` (voir `rangs_obtenus`) évite
+    de recalculer les rangs des étudiants, `rangs_uni` ceux des universités de
+    capacité 1 (le moins bon admis est alors le seul). Avec `classes_universites` (voir
+    `egalites`), une université ne préfère que les classes strictement
+    meilleures que celle de son admis: 0 si l'affectation est faiblement stable.
+    """
+    if rangs_etu is None:
+        rangs_etu = rangs_obtenus(affectations, preferences_etudiants, preferences_universites)[0]
+    limites_etu = {etu: rang - 1 if rang else len(prefs)
+                   for (etu, prefs), rang in zip(preferences_etudiants.items(), rangs_etu.tolist())}
+    # Universités: étudiants classés avant le moins bon admis (tous s'il reste une place
+    # ou si un admis n'est pas classé)
+    limites_uni = {}
+    rangs_connus = rangs_uni.tolist() if rangs_uni is not None else [None] * len(preferences_universites)
+    for (uni, prefs), rang in zip(preferences_universites.items(), rangs_connus):
+        admis = affectations.get(uni) or []
+        limites_uni[uni] = len(prefs)
+        if not admis or len(admis) < capacites.get(uni, 1):
+            continue
+        if rang is not None and len(admis) == 1:
+            # Rang déjà calculé par `rangs_obtenus` (0: admis non classé)
+            if not rang:
+                continue
+            limite = rang - 1
+        else:
+            try:
+                limite = max(prefs.index(etu) for etu in admis)
+            except ValueError:
+                continue
+        if classes_universites is not None:
+            classes = classes_universites[uni]
+            limite = int(np.searchsorted(classes, classes[limite]))
+        limites_uni[uni] = limite
+    if sum(limites_etu.values()) <= sum(limites_uni.values()):
+        return _paires_mutuelles(preferences_etudiants, limites_etu, preferences_universites, limites_uni)
+    return _paires_mutuelles(preferences_universites, limites_uni, preferences_etudiants, limites_etu)
+
+
+def satisfactions_depuis_rangs(rangs: np.ndarray, longueurs: np.ndarray) -> np.ndarray:
+    """S = 1 - (r-1)/(n-1) vectorisé; 0 si non apparié, 1 si la liste n'a qu'un choix."""
+    denominateur = np.maximum(longueurs - 1, 1)
+    sat = 1.0 - (rangs - 1) / denominateur
+    sat[longueurs <= 1] = 1.0
+    sat[rangs == 0] = 0.0
+    return sat
+
+
+def coefficient_gini(valeurs: np.ndarray) -> float:
+    """Coefficient de Gini de valeurs positives (0 = égalité parfaite)."""
+    n = valeurs.size
+    total = float(valeurs.sum())
+    if n == 0 or total <= 0:
+        return 0.0
+    tries = np.sort(valeurs)
+    return float(2 * np.dot(np.arange(1, n + 1), tries) / (n * total) - (n + 1) / n)
+
+
+def histogramme_rangs(rangs: np.ndarray) -> np.ndarray:
+    """Effectifs des agents appariés par classe de rang (classes `NB_CLASSES_RANGS`)."""
+    apparies = rangs[rangs > 0]
+    classes = np.minimum(np.ceil(np.log2(apparies)).astype(np.int64), NB_CLASSES_RANGS - 1)
+    return np.bincount(classes, minlength=NB_CLASSES_RANGS)
+
+
+def analyser_rangs(rangs: np.ndarray, satisfactions: np.ndarray) -> Dict:
+    """
+    Distribution des rangs d'un côté du marché: histogramme, part de premiers
+    choix, pire rang, non appariés et Gini des satisfactions (non appariés à 0).
+    """
+    n = rangs.size
+    apparies = rangs > 0
+    return {
+        "histogramme": histogramme_rangs(rangs).tolist(),
+        "non_apparies": int(n - apparies.sum()),
+        "part_premier_choix": float((rangs == 1).sum() / n) if n else 0.0,
+        "pire_rang": int(rangs.max(initial=0)),
+        "gini": coefficient_gini(satisfactions),
+    }
+
+
+class HistogrammesRangs:
+    """
+    Cumul des distributions de rangs sur des répétitions (classes fixes):
+    mémoire constante, O(classes) par répétition.
+    """
+
+    COTES = ("etudiants", "universites")
+
+    def __init__(self):
+        self.repetitions = 0
+        self.effectifs = {cote: np.zeros(NB_CLASSES_RANGS, dtype=np.int64) for cote in self.COTES}
+        self.non_apparies = dict.fromkeys(self.COTES, 0)
+        self.premiers_choix = dict.fromkeys(self.COTES, 0.0)
+        self.pire_rang = dict.fromkeys(self.COTES, 0)
+        self.gini = dict.fromkeys(self.COTES, 0.0)
+
+    def ajouter(self, distributions: Dict[str, Dict]) -> None:
+        """Ajoute les distributions d'une répétition (`stats["distributions"]`)."""
+        self.repetitions += 1
+        for cote in self.COTES:
+            d = distributions[cote]
+            self.effectifs[cote] += np.asarray(d["histogramme"], dtype=np.int64)
+            self.non_apparies[cote] += d["non_apparies"]
+            self.premiers_choix[cote] += d["part_premier_choix"]
+            self.pire_rang[cote] = max(self.pire_rang[cote], d["pire_rang"])
+            self.gini[cote] += d["gini"]
+
+    def resume(self, cote: str) -> Dict:
+        """Parts par classe (parmi les agents appariés) et moyennes par répétition."""
+        effectifs = self.effectifs[cote]
+        total = int(effectifs.sum())
+        r = max(self.repetitions, 1)
+        return {
+            "parts": (effectifs / total).tolist() if total else [0.0] * NB_CLASSES_RANGS,
+            "apparies": total,
+            "non_apparies": self.non_apparies[cote],
+            "part_premier_choix": self.premiers_choix[cote] / r,
+            "pire_rang": self.pire_rang[cote],
+            "gini": self.gini[cote] / r,
+        }
+
+    def vider(self) -> None:
+        self.__init__()
+
+    def formater(self) -> str:
+        """Texte: parts par classe de rang et indicateurs, pour chaque côté."""
+        libelles = libelles_classes_rangs()
+        lignes = []
+        for cote, nom in zip(self.COTES, ("Étudiants", "Établissements")):
+            r = self.resume(cote)
+            lignes.append(f"{nom}: premier choix {r['part_premier_choix']:.1%}, pire rang {r['pire_rang']}, "
+                          f"Gini {r['gini']:.3f}, non appariés {r['non_apparies']} ({self.repetitions} rép.)")
+            derniere = max((i for i, p in enumerate(r["parts"]) if p > 0), default=-1)
+            for libelle, part in zip(libelles[:derniere + 1], r["parts"]):
+                lignes.append(f"  rang {libelle:>13} {part:7.1%} {'█' * round(part * 40)}")
+        return "\n".join(lignes)
+
+
 def mesurer_satisfaction_globale(
     affectations: Dict[UniversityKey, List[StudentKey]],
     preferences_etudiants: Dict[StudentKey, List[UniversityKey]],
     preferences_universites: Dict[UniversityKey, List[StudentKey]],
     capacites: Dict[UniversityKey, int],
+    paires_bloquantes: bool = False,
 ) -> Dict:
+    """
+    Satisfactions par agent, moyennes, rangs moyens et distributions des rangs.
 
-    satisf_etudiants: Dict[StudentKey, float] = {}
-    satisf_universites: Dict[UniversityKey, float] = {}
-
-    # Calculer satisfaction par étudiant
-    for etu_key in preferences_etudiants:
-        satisf_etudiants[etu_key] = satisfaction_etudiant(
-            etu_key, preferences_etudiants, affectations
-        )
+    Les rangs obtenus sont calculés une fois dans des tableaux NumPy (table
+    inverse étudiant -> université en O(n + m)), puis toutes les mesures en
+    sont dérivées de façon vectorisée. Avec `paires_bloquantes`, le nombre de
+    paires bloquantes est inclus (voir `compter_paires_bloquantes`); sinon il
+    vaut None.
+    """
+    rangs_etu, longueurs_etu, rangs_uni, longueurs_uni = rangs_obtenus(
+        affectations, preferences_etudiants, preferences_universites)
+    sat_etu = satisfactions_depuis_rangs(rangs_etu, longueurs_etu)
+    sat_uni = satisfactions_depuis_rangs(rangs_uni, longueurs_uni)
 
-    # Calculer satisfaction par université
-    for uni_key in preferences_universites:
-        satisf_universites[uni_key] = satisfaction_etablissement(
-            uni_key, preferences_universites, affectations
-        )
+    satisf_etudiants: Dict[StudentKey, float] = dict(zip(preferences_etudiants, sat_etu.tolist()))
+    satisf_universites: Dict[UniversityKey, float] = dict(zip(preferences_universites, sat_uni.tolist()))
 
-    # Calculer rangs moyens
-    rang_moyen_etu = calculer_rang_moyen_etudiants(affectations, preferences_etudiants)
-    rang_moyen_etab = calculer_rang_moyen_etablissements(affectations, preferences_universites)
+    # Rangs moyens (agents appariés seulement)
+    rang_moyen_etu = float(rangs_etu[rangs_etu > 0].mean()) if (rangs_etu > 0).any() else 0.0
+    rang_moyen_etab = float(rangs_uni[rangs_uni > 0].mean()) if (rangs_uni > 0).any() else 0.0
+    nb_paires_bloquantes = compter_paires_bloquantes(
+        affectations, preferences_etudiants, preferences_universites, capacites, rangs_etu,
+        rangs_uni=rangs_uni) if paires_bloquantes else None
     
     # Calculs théoriques de Pittel 
     n = len(preferences_etudiants)
@@ -152,10 +389,19 @@ def mesurer_satisfaction_globale(
     return {
         "satisfactions_etudiants": satisf_etudiants,
         "satisfactions_universites": satisf_universites,
-        "moyenne_etudiants": float(np.mean(list(satisf_etudiants.values()))),
-        "moyenne_universites": float(np.mean(list(satisf_universites.values()))),
+        "moyenne_etudiants": float(sat_etu.mean()) if sat_etu.size else 0.0,
+        "moyenne_universites": float(sat_uni.mean()) if sat_uni.size else 0.0,
         "rang_moyen_etudiants": rang_moyen_etu,
         "rang_moyen_etablissements": rang_moyen_etab,
+        # Marchés déséquilibrés: agents restés seuls (satisfaction nulle)
+        "non_affectes_etudiants": int((rangs_etu == 0).sum()),
+        "non_pourvues_universites": sum(1 for u in preferences_universites if not affectations.get(u)),
+        # Stabilité (sur demande): 0 pour Gale-Shapley, en général > 0 pour TTC ou Boston
+        "paires_bloquantes": nb_paires_bloquantes,
+        "distributions": {
+            "etudiants": analyser_rangs(rangs_etu, sat_etu),
+            "universites": analyser_rangs(rangs_uni, sat_uni),
+        },
         "log_n_theorique": log_n,
         "n_sur_log_n_theorique": n_sur_log_n,
     }
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Service local d'affectation: JSON sur HTTP, bibliothèque standard seule.
+
+    python -m serveur --port 8765 --workers 4 --file-max 256
+
+    POST /affecter   une instance, ou {"instances": [...]} pour un lot
+    GET  /metrics    profondeur de file, compteurs et histogrammes de latence
+    GET  /sante      état du service
+
+Une instance fournit soit ses préférences (`preferences_etudiants`,
+`preferences_universites`, `capacites` facultatives), soit des paramètres
+de génération (`nb_students`, `nb_universities`, `seed`, `modele`) sur des
+entités synthétiques; `moteur` choisit l'algorithme (voir `MOTEURS`) et
+`inclure_affectations=false` omet l'appariement de la réponse.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as DelaiDepasse
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from experiences import entites_synthetiques, generer_instance
+from matching import MOTEURS, MOTEURS_STABLES, obtenir_moteur
+from preferences import MODELES_PREFERENCES
+from satisfaction import mesurer_satisfaction_globale
+from statistiques import ResumeFlux
+
+# Bornes des histogrammes de latence (ms), la dernière classe est +Inf
+BORNES_LATENCE_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+# Corps de requête et marchés générés acceptés au plus
+TAILLE_CORPS_MAX = 64 << 20
+TAILLE_MARCHE_MAX = 20000
+
+
+class FileSaturee(Exception):
+    """La file est pleine: la requête est refusée et doit être retentée."""
+
+
+def _est_entier(valeur) -> bool:
+    """Entier JSON strict (ni flottant, ni chaîne, ni booléen)."""
+    return isinstance(valeur, int) and not isinstance(valeur, bool)
+
+
+def valider_instance(instance) -> Dict:
+    """
+    Contrôle la forme d'une instance avant sa mise en file et complète les
+    valeurs par défaut (moteur, graine tirée si absente). Les références entre
+    listes sont vérifiées par le worker.
+
+    Raises:
+        ValueError: instance mal formée
+    """
+    if not isinstance(instance, dict):
+        raise ValueError("Une instance doit être un objet JSON")
+    moteur = instance.get("moteur", "gale_shapley")
+    if moteur not in MOTEURS:
+        raise ValueError(f"Moteur inconnu '{moteur}'. Moteurs disponibles: {', '.join(sorted(MOTEURS))}")
+    valide = {"moteur": moteur, "inclure_affectations": bool(instance.get("inclure_affectations", True))}
+
+    if "preferences_etudiants" in instance or "preferences_universites" in instance:
+        for cle in ("preferences_etudiants", "preferences_universites"):
+            prefs = instance.get(cle)
+            if not isinstance(prefs, dict) or not all(isinstance(l, list) for l in prefs.values()):
+                raise ValueError(f"'{cle}' doit associer à chaque agent une liste de noms")
+            valide[cle] = prefs
+        capacites = instance.get("capacites") or {}
+        if not isinstance(capacites, dict) or not all(_est_entier(c) for c in capacites.values()):
+            raise ValueError("'capacites' doit associer à chaque université un entier")
+        valide["capacites"] = capacites
+        return valide
+
+    if "nb_students" not in instance:
+        raise ValueError("Instance sans préférences ni 'nb_students'")
+    n = instance["nb_students"]
+    m = instance.get("nb_universities", n)
+    seed = instance.get("seed")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+    if not all(_est_entier(x) for x in (n, m, seed)):
+        raise ValueError("'nb_students', 'nb_universities' et 'seed' doivent être des entiers")
+    if not (1 <= n <= TAILLE_MARCHE_MAX and 1 <= m <= TAILLE_MARCHE_MAX):
+        raise ValueError(f"Tailles de marché attendues entre 1 et {TAILLE_MARCHE_MAX}")
+    modele = instance.get("modele", "uniforme")
+    if modele not in MODELES_PREFERENCES:
+        raise ValueError(f"Modèle de préférences inconnu '{modele}'. "
+                         f"Modèles disponibles: {', '.join(MODELES_PREFERENCES)}")
+    valide.update(nb_students=n, nb_universities=m, seed=seed, modele=modele)
+    return valide
+
+
+# Entités synthétiques du worker, agrandies au besoin (les n premières ne
+# dépendent pas de la taille du lot: même graine, même instance)
+_ENTITES: Tuple[list, list] = ([], [])
+
+
+def _entites(nb_students: int, nb_universities: int) -> Tuple[list, list]:
+    global _ENTITES
+    students, universities = _ENTITES
+    if len(students) < nb_students or len(universities) < nb_universities:
+        _ENTITES = entites_synthetiques(max(nb_students, len(students)),
+                                        max(nb_universities, len(universities)))
+        students, universities = _ENTITES
+    return students[:nb_students], universities[:nb_universities]
+
+
+def _verifier_references(prefs_etud: Dict[str, list], prefs_uni: Dict[str, list]) -> None:
+    for prefs, autres, cote in ((prefs_etud, prefs_uni, "université"), (prefs_uni, prefs_etud, "étudiant")):
+        for agent, liste in prefs.items():
+            inconnus = [x for x in liste if x not in autres]
+            if inconnus:
+                raise ValueError(f"'{agent}' classe un(e) {cote} inconnu(e): {inconnus[0]!r}")
+
+
+def resoudre_instance(instance: Dict) -> Dict:
+    """Résout une instance validée: affectation, compteurs et statistiques de satisfaction."""
+    debut = time.perf_counter()
+    reponse: Dict = {"moteur": instance["moteur"]}
+    if "preferences_etudiants" in instance:
+        prefs_etud = instance["preferences_etudiants"]
+        prefs_uni = instance["preferences_universites"]
+        _verifier_references(prefs_etud, prefs_uni)
+        capacites = {u: int(instance["capacites"].get(u, 1)) for u in prefs_uni}
+    else:
+        n, m = instance["nb_students"], instance["nb_universities"]
+        students, universities = _entites(n, m)
+        _, selection, prefs_etud, prefs_uni = generer_instance(
+            random.Random(instance["seed"]), students, universities, n, m, instance["modele"])
+        capacites = {u.name: u.capacity for u in selection}
+        reponse.update(seed=instance["seed"], modele=instance["modele"])
+
+    compteurs: Dict[str, int] = {}
+    debut_affectation = time.perf_counter()
+    affectations = obtenir_moteur(instance["moteur"])(prefs_etud, prefs_uni, capacites, compteurs=compteurs)
+    temps_affectation_ms = (time.perf_counter() - debut_affectation) * 1000
+    stats = mesurer_satisfaction_globale(affectations, prefs_etud, prefs_uni, capacites,
+                                         paires_bloquantes=instance["moteur"] not in MOTEURS_STABLES)
+
+    reponse.update(
+        nb_students=len(prefs_etud),
+        nb_universities=len(prefs_uni),
+        compteurs=compteurs,
+        statistiques={cle: stats[cle] for cle in (
+            "moyenne_etudiants", "moyenne_universites", "rang_moyen_etudiants",
+            "rang_moyen_etablissements", "non_affectes_etudiants", "non_pourvues_universites",
+            "paires_bloquantes", "distributions")},
+        temps_affectation_ms=temps_affectation_ms,
+        temps_calcul_ms=(time.perf_counter() - debut) * 1000,
+    )
+    if instance["inclure_affectations"]:
+        reponse["affectations"] = affectations
+    return reponse
+
+
+def _resoudre_lot(instances: Sequence[Dict]) -> Tuple[List[Dict], float]:
+    """Worker: résout un lot (une erreur n'affecte que son instance); retourne aussi le temps de calcul."""
+    debut = time.perf_counter()
+    resultats = []
+    for instance in instances:
+        try:
+            resultats.append(resoudre_instance(instance))
+        except (ValueError, KeyError, TypeError) as e:
+            resultats.append({"erreur": str(e)})
+    return resultats, (time.perf_counter() - debut) * 1000
+
+
+class HistogrammeLatence:
+    """Histogramme à bornes fixes (effectifs cumulés, à la Prometheus) et résumé en flux."""
+
+    def __init__(self, bornes: Sequence[float] = BORNES_LATENCE_MS):
+        self.bornes = tuple(bornes)
+        self.effectifs = [0] * (len(self.bornes) + 1)
+        self.flux = ResumeFlux()
+
+    def ajouter(self, ms: float, poids: int = 1) -> None:
+        self.effectifs[bisect_left(self.bornes, ms)] += poids
+        for _ in range(poids):
+            self.flux.ajouter(ms)
+
+    def exporter(self) -> Dict:
+        cumul, total = [], 0
+        for effectif in self.effectifs:
+            total += effectif
+            cumul.append(total)
+        return {"bornes_ms": list(self.bornes) + ["+Inf"], "cumul": cumul, **self.flux.resume()}
+
+
+class ServiceAffectation:
+    """
+    File bornée d'instances résolues par un pool de `workers` processus.
+
+    Une requête est acceptée en entier ou refusée (`FileSaturee`) si ses
+    instances dépasseraient `file_max` instances en attente ou en calcul.
+    Les instances d'une requête partent par lots de `taille_lot` (un aller-
+    retour de processus par lot). Latences mesurées par lot: totale (de la
+    mise en file au résultat), calcul (dans le worker) et attente (écart).
+    """
+
+    def __init__(self, workers: int = 1, file_max: int = 256, taille_lot: int = 8,
+                 delai_s: float = 300.0):
+        self.workers = workers
+        self.file_max = file_max
+        self.taille_lot = taille_lot
+        self.delai_s = delai_s
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._verrou = threading.Lock()
+        self._profondeur = 0
+        self._debut = time.time()
+        self.compteurs = dict.fromkeys(("requetes", "instances", "terminees", "rejets", "erreurs", "delais"), 0)
+        self.latences = {cle: HistogrammeLatence() for cle in ("totale", "attente", "calcul")}
+
+    @property
+    def profondeur(self) -> int:
+        """Instances acceptées et non terminées (en file ou en calcul)."""
+        return self._profondeur
+
+    def soumettre(self, instances: Sequence[Dict]) -> List[Future]:
+        """Met des instances validées en file, par lots; lève `FileSaturee` si la file est pleine."""
+        with self._verrou:
+            if self._profondeur + len(instances) > self.file_max:
+                self.compteurs["rejets"] += 1
+                raise FileSaturee(f"File pleine ({self._profondeur}/{self.file_max} instances)")
+            self._profondeur += len(instances)
+            self.compteurs["instances"] += len(instances)
+        futures = []
+        for i in range(0, len(instances), self.taille_lot):
+            lot = instances[i:i + self.taille_lot]
+            future = self._executor.submit(_resoudre_lot, lot)
+            future.add_done_callback(partial(self._termine, len(lot), time.perf_counter()))
+            futures.append(future)
+        return futures
+
+    def _termine(self, taille: int, debut: float, future: Future) -> None:
+        totale_ms = (time.perf_counter() - debut) * 1000
+        with self._verrou:
+            self._profondeur -= taille
+            if future.cancelled() or future.exception() is not None:
+                self.compteurs["erreurs"] += taille
+                return
+            resultats, calcul_ms = future.result()
+            self.compteurs["terminees"] += taille
+            self.compteurs["erreurs"] += sum(1 for r in resultats if "erreur" in r)
+            self.latences["totale"].ajouter(totale_ms, taille)
+            self.latences["calcul"].ajouter(calcul_ms, taille)
+            self.latences["attente"].ajouter(max(totale_ms - calcul_ms, 0.0), taille)
+
+    def traiter(self, corps) -> Tuple[int, Dict]:
+        """Traite le corps d'une requête /affecter; retourne (statut HTTP, réponse)."""
+        with self._verrou:
+            self.compteurs["requetes"] += 1
+        par_lot = isinstance(corps, dict) and "instances" in corps
+        brutes = corps["instances"] if par_lot else [corps]
+        if not isinstance(brutes, list) or not brutes:
+            return 400, {"erreur": "'instances' doit être une liste non vide"}
+        try:
+            instances = [valider_instance(instance) for instance in brutes]
+        except ValueError as e:
+            return 400, {"erreur": str(e)}
+        try:
+            futures = self.soumettre(instances)
+        except FileSaturee as e:
+            return 503, {"erreur": str(e)}
+
+        limite = time.monotonic() + self.delai_s
+        resultats: List[Dict] = []
+        try:
+            for future in futures:
+                resultats.extend(future.result(timeout=max(limite - time.monotonic(), 0))[0])
+        except DelaiDepasse:
+            for future in futures:
+                future.cancel()
+            with self._verrou:
+                self.compteurs["delais"] += 1
+            return 504, {"erreur": f"Délai de {self.delai_s:g} s dépassé"}
+        except Exception as e:
+            return 500, {"erreur": f"Échec du worker: {e}"}
+        if par_lot:
+            return 200, {"resultats": resultats}
+        return (400 if "erreur" in resultats[0] else 200), resultats[0]
+
+    def metriques(self) -> Dict:
+        """Instantané pour /metrics."""
+        with self._verrou:
+            return {
+                "file": {"profondeur": self._profondeur, "capacite": self.file_max,
+                         "workers": self.workers, "taille_lot": self.taille_lot},
+                "compteurs": dict(self.compteurs),
+                "latence_ms": {cle: h.exporter() for cle, h in self.latences.items()},
+                "duree_service_s": time.time() - self._debut,
+            }
+
+    def fermer(self) -> None:
+        """Arrête le pool (les lots pas encore démarrés sont annulés)."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _Gestionnaire(BaseHTTPRequestHandler):
+    server_version = "MariageStable/1.0"
+
+    def _repondre(self, statut: int, contenu: Dict, entetes: Optional[Dict[str, str]] = None) -> None:
+        corps = json.dumps(contenu, ensure_ascii=False).encode("utf-8")
+        self.send_response(statut)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corps)))
+        for nom, valeur in (entetes or {}).items():
+            self.send_header(nom, valeur)
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def _chemin(self) -> str:
+        """Chemin de la requête, sans chaîne de requête ni fragment."""
+        return urlsplit(self.path).path
+
+    def do_GET(self):
+        service = self.server.service
+        chemin = self._chemin()
+        if chemin == "/metrics":
+            self._repondre(200, service.metriques())
+        elif chemin == "/sante":
+            self._repondre(200, {"etat": "ok", "profondeur": service.profondeur, "capacite": service.file_max})
+        else:
+            self._repondre(404, {"erreur": f"Chemin inconnu: {chemin}"})
+
+    def do_POST(self):
+        chemin = self._chemin()
+        if chemin != "/affecter":
+            self._repondre(404, {"erreur": f"Chemin inconnu: {chemin}"})
+            return
+        try:
+            longueur = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            longueur = -1
+        if not 0 < longueur <= TAILLE_CORPS_MAX:
+            self._repondre(413 if longueur > TAILLE_CORPS_MAX else 400,
+                           {"erreur": f"Corps JSON attendu (au plus {TAILLE_CORPS_MAX} octets)"})
+            return
+        try:
+            corps = json.loads(self.rfile.read(longueur))
+        except (ValueError, UnicodeDecodeError) as e:
+            self._repondre(400, {"erreur": f"JSON invalide: {e}"})
+            return
+        statut, reponse = self.server.service.traiter(corps)
+        self._repondre(statut, reponse, {"Retry-After": "1"} if statut == 503 else None)
+
+    def log_message(self, format, *args):
+        if self.server.verbeux:
+            super().log_message(format, *args)
+
+
+def creer_serveur(service: ServiceAffectation, hote: str = "127.0.0.1", port: int = 8765,
+                  verbeux: bool = False) -> ThreadingHTTPServer:
+    """Serveur HTTP (un thread par connexion) devant `service`; `port=0` choisit un port libre."""
+    serveur = ThreadingHTTPServer((hote, port), _Gestionnaire)
+    serveur.daemon_threads = True
+    serveur.service = service
+    serveur.verbeux = verbeux
+    return serveur
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m serveur",
+                                     description="Service local d'affectation (JSON sur HTTP).")
+    parser.add_argument("--hote", default="127.0.0.1", help="adresse d'écoute (défaut: boucle locale)")
+    parser.add_argument("--port", type=int, default=8765, help="port d'écoute (0: port libre)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="nombre de processus de calcul (défaut: nombre de cœurs)")
+    parser.add_argument("--file-max", type=int, default=256,
+                        help="instances en attente ou en calcul au-delà desquelles les requêtes sont refusées (503)")
+    parser.add_argument("--taille-lot", type=int, default=8,
+                        help="instances d'une même requête envoyées ensemble à un worker")
+    parser.add_argument("--delai", type=float, default=300.0,
+                        help="délai maximal d'une requête en secondes (504 au-delà)")
+    parser.add_argument("--verbeux", action="store_true", help="journaliser chaque requête sur stderr")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.file_max < 1 or args.taille_lot < 1:
+        print("Erreur: --workers, --file-max et --taille-lot doivent être >= 1", file=sys.stderr)
+        return 2
+
+    service = ServiceAffectation(args.workers, args.file_max, args.taille_lot, args.delai)
+    serveur = creer_serveur(service, args.hote, args.port, args.verbeux)
+    hote, port = serveur.server_address[:2]
+    print(f"Service d'affectation sur http://{hote}:{port} ({args.workers} processus)", file=sys.stderr)
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.server_close()
+        service.fermer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Outils statistiques pour les mesures répétées (quantiles, intervalles de confiance)."""
+import math
+from typing import Dict, List, Sequence, Tuple
+
+# Quantiles bilatéraux à 95% de la loi de Student (ddl 1..30)
+_T95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+Z95 = 1.959964
+
+
+def quantile_student_95(ddl: int) -> float:
+    """Quantile t(0.975, ddl); approximation normale au-delà de 30 ddl."""
+    if ddl < 1:
+        return float("inf")
+    if ddl <= len(_T95):
+        return _T95[ddl - 1]
+    # Développement de Cornish-Fisher à l'ordre 1
+    return Z95 + (Z95 ** 3 + Z95) / (4 * ddl)
+
+
+def quantile(valeurs_triees: Sequence[float], q: float) -> float:
+    """Quantile par interpolation linéaire sur des valeurs déjà triées."""
+    n = len(valeurs_triees)
+    if n == 0:
+        return 0.0
+    pos = (n - 1) * q
+    bas = int(math.floor(pos))
+    haut = min(bas + 1, n - 1)
+    return valeurs_triees[bas] + (valeurs_triees[haut] - valeurs_triees[bas]) * (pos - bas)
+
+
+def ic95_mediane(valeurs_triees: Sequence[float]) -> Tuple[float, float]:
+    """
+    Intervalle de confiance à 95% de la médiane par statistiques d'ordre
+    (sans hypothèse de distribution, approximation binomiale normale).
+    """
+    n = len(valeurs_triees)
+    if n == 0:
+        return 0.0, 0.0
+    demi = Z95 * math.sqrt(n) / 2
+    bas = max(int(math.floor(n / 2 - demi)), 0)
+    haut = min(int(math.ceil(n / 2 + demi)), n - 1)
+    return valeurs_triees[bas], valeurs_triees[haut]
+
+
+def resumer_echantillons(valeurs: Sequence[float]) -> Dict[str, float]:
+    """
+    Résumé robuste d'un échantillon: médiane, IQR, IC95 de la médiane,
+    moyenne, écart-type et IC95 de la moyenne (Student).
+    """
+    tries: List[float] = sorted(valeurs)
+    n = len(tries)
+    if n == 0:
+        return {"n": 0, "mediane": 0.0, "q1": 0.0, "q3": 0.0, "iqr": 0.0,
+                "ic95_bas": 0.0, "ic95_haut": 0.0, "moyenne": 0.0, "ecart_type": 0.0,
+                "ic95_moyenne": 0.0, "min": 0.0, "max": 0.0}
+
+    moyenne = sum(tries) / n
+    variance = sum((v - moyenne) ** 2 for v in tries) / (n - 1) if n > 1 else 0.0
+    ecart_type = math.sqrt(variance)
+    q1, q3 = quantile(tries, 0.25), quantile(tries, 0.75)
+    ic_bas, ic_haut = ic95_mediane(tries)
+    return {
+        "n": n,
+        "mediane": quantile(tries, 0.5),
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "ic95_bas": ic_bas,
+        "ic95_haut": ic_haut,
+        "moyenne": moyenne,
+        "ecart_type": ecart_type,
+        # Demi-largeur de l'IC95 de la moyenne
+        "ic95_moyenne": quantile_student_95(n - 1) * ecart_type / math.sqrt(n) if n > 1 else 0.0,
+        "min": tries[0],
+        "max": tries[-1],
+    }
+
+
+class Welford:
+    """
+    Moyenne et variance en flux (algorithme de Welford): O(1) mémoire et
+    O(1) par valeur, numériquement stable.
+    """
+
+    __slots__ = ("n", "moyenne", "_m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.moyenne = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def ajouter(self, valeur: float) -> None:
+        self.n += 1
+        delta = valeur - self.moyenne
+        self.moyenne += delta / self.n
+        self._m2 += delta * (valeur - self.moyenne)
+        if valeur < self.min:
+            self.min = valeur
+        if valeur > self.max:
+            self.max = valeur
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def ecart_type(self) -> float:
+        return math.sqrt(self.variance)
+
+    def demi_largeur_ic95(self) -> float:
+        """Demi-largeur de l'IC95 de la moyenne (Student); infinie sous 2 valeurs."""
+        if self.n < 2:
+            return float("inf")
+        return quantile_student_95(self.n - 1) * self.ecart_type / math.sqrt(self.n)
+
+    def etat(self) -> Dict[str, float]:
+        """État sérialisable (pour reprise ou fusion)."""
+        return {"n": self.n, "moyenne": self.moyenne, "m2": self._m2, "min": self.min, "max": self.max}
+
+    @classmethod
+    def depuis_etat(cls, etat: Dict[str, float]) -> "Welford":
+        acc = cls()
+        acc.n = int(etat["n"])
+        acc.moyenne = etat["moyenne"]
+        acc._m2 = etat["m2"]
+        acc.min = etat["min"]
+        acc.max = etat["max"]
+        return acc
+
+
+class CroquisQuantiles:
+    """
+    Croquis de quantiles en flux (t-digest à fusion, échelle k1).
+
+    Les valeurs sont accumulées dans un tampon puis fusionnées en au plus
+    ~`compression` centroïdes (moyenne, poids), plus fins près des extrêmes:
+    mémoire bornée, coût amorti constant par valeur, quantiles approchés
+    (exacts pour min et max).
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.n = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._centroides: List[Tuple[float, int]] = []
+        self._tampon: List[float] = []
+
+    def ajouter(self, valeur: float) -> None:
+        self._tampon.append(valeur)
+        self.n += 1
+        if valeur < self.min:
+            self.min = valeur
+        if valeur > self.max:
+            self.max = valeur
+        if len(self._tampon) >= 5 * self.compression:
+            self._compresser()
+
+    def _q_limite(self, q: float) -> float:
+        """Plus grand quantile couvert par un centroïde commençant en `q` (k1 + 1)."""
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _compresser(self) -> None:
+        if not self._tampon:
+            return
+        points = sorted(self._centroides + [(v, 1) for v in self._tampon])
+        self._tampon = []
+        fusion: List[Tuple[float, int]] = []
+        cumul = 0
+        moyenne, poids = points[0]
+        q_limite = self._q_limite(0.0)
+        for m, w in points[1:]:
+            if (cumul + poids + w) / self.n <= q_limite:
+                poids += w
+                moyenne += (m - moyenne) * w / poids
+            else:
+                fusion.append((moyenne, poids))
+                cumul += poids
+                q_limite = self._q_limite(cumul / self.n)
+                moyenne, poids = m, w
+        fusion.append((moyenne, poids))
+        self._centroides = fusion
+
+    def quantile(self, q: float) -> float:
+        """Quantile approché (interpolation entre centres des centroïdes)."""
+        self._compresser()
+        if self.n == 0:
+            return 0.0
+        centroides = self._centroides
+        cible = q * self.n
+        cumul = 0.0
+        precedent_centre, precedente_moyenne = 0.0, self.min
+        for moyenne, poids in centroides:
+            centre = cumul + poids / 2
+            if cible <= centre:
+                if centre == precedent_centre:
+                    return moyenne
+                t = (cible - precedent_centre) / (centre - precedent_centre)
+                return precedente_moyenne + (moyenne - precedente_moyenne) * t
+            cumul += poids
+            precedent_centre, precedente_moyenne = centre, moyenne
+        if self.n == precedent_centre:
+            return self.max
+        t = (cible - precedent_centre) / (self.n - precedent_centre)
+        return precedente_moyenne + (self.max - precedente_moyenne) * min(t, 1.0)
+
+
+class ResumeFlux:
+    """Résumé en flux d'une métrique: moments (Welford) et quantiles (croquis)."""
+
+    __slots__ = ("moments", "croquis")
+
+    def __init__(self, compression: int = 100):
+        self.moments = Welford()
+        self.croquis = CroquisQuantiles(compression)
+
+    def ajouter(self, valeur: float) -> None:
+        self.moments.ajouter(valeur)
+        self.croquis.ajouter(valeur)
+
+    def resume(self) -> Dict[str, float]:
+        """n, moyenne, écart-type, min, max et percentiles 5 / 50 / 95."""
+        m = self.moments
+        if m.n == 0:
+            return {"n": 0, "moyenne": 0.0, "ecart_type": 0.0, "min": 0.0, "max": 0.0,
+                    "p05": 0.0, "p50": 0.0, "p95": 0.0}
+        return {
+            "n": m.n,
+            "moyenne": m.moyenne,
+            "ecart_type": m.ecart_type,
+            "min": m.min,
+            "max": m.max,
+            "p05": self.croquis.quantile(0.05),
+            "p50": self.croquis.quantile(0.5),
+            "p95": self.croquis.quantile(0.95),
+        }
@@ -0,0 +1,159 @@
+"""Trace compacte des propositions (tampon circulaire NumPy) pour le rejeu pas à pas."""
+import csv
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+# Issues d'une proposition
+ACCEPTEE = 0   # le proposant est retenu (provisoirement)
+REJETEE = 1    # le proposant est refusé
+DELOGE = 2     # le titulaire précédent est libéré au profit du proposant
+
+NOMS_ISSUES = {ACCEPTEE: "acceptée", REJETEE: "rejetée", DELOGE: "délogé"}
+
+# (tour, étudiant, université, issue)
+Evenement = Tuple[int, int, int, int]
+
+
+class TracePropositions:
+    """
+    Tampon circulaire préalloué d'enregistrements (tour, étudiant, université,
+    issue) en int32: 16 octets par événement, mémoire bornée par `capacite`.
+    Au-delà, les plus anciens événements sont écrasés (`perdus`).
+
+    Les identifiants sont les positions dans `etudiants` / `universites`,
+    fixés par `preparer` au début de l'algorithme.
+    """
+
+    def __init__(self, capacite: int = 1 << 20):
+        self.capacite = capacite
+        self._donnees = np.zeros((capacite, 4), dtype=np.int32)
+        self.total = 0
+        self.etudiants: List[str] = []
+        self.universites: List[str] = []
+
+    def preparer(self, etudiants: Sequence[str], universites: Sequence[str]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Vide la trace, fixe les identifiants et retourne les tables nom -> id."""
+        self.total = 0
+        self.etudiants = list(etudiants)
+        self.universites = list(universites)
+        return ({e: i for i, e in enumerate(self.etudiants)},
+                {u: j for j, u in enumerate(self.universites)})
+
+    def ajouter(self, tour: int, etudiant: int, universite: int, issue: int) -> None:
+        self._donnees[self.total % self.capacite] = (tour, etudiant, universite, issue)
+        self.total += 1
+
+    def ajouter_lot(self, tour: int, etudiants: np.ndarray, universites: np.ndarray, issues: np.ndarray) -> None:
+        """Ajoute un lot d'événements d'un même tour (moteurs vectorisés)."""
+        k = len(etudiants)
+        if k == 0:
+            return
+        lot = np.empty((k, 4), dtype=np.int32)
+        lot[:, 0] = tour
+        lot[:, 1] = etudiants
+        lot[:, 2] = universites
+        lot[:, 3] = issues
+        if k >= self.capacite:
+            lot = lot[-self.capacite:]
+            self.total += k - self.capacite
+            k = self.capacite
+        debut = self.total % self.capacite
+        fin = min(debut + k, self.capacite)
+        self._donnees[debut:fin] = lot[:fin - debut]
+        self._donnees[:k - (fin - debut)] = lot[fin - debut:]
+        self.total += k
+
+    def __getstate__(self) -> Dict:
+        # Seuls les événements conservés sont sérialisés, pas le tampon entier
+        return {"capacite": self.capacite, "total": self.total, "evenements": self.tableau(),
+                "etudiants": self.etudiants, "universites": self.universites}
+
+    def __setstate__(self, etat: Dict) -> None:
+        self.capacite = etat["capacite"]
+        self.total = etat["total"]
+        self.etudiants = etat["etudiants"]
+        self.universites = etat["universites"]
+        self._donnees = np.zeros((self.capacite, 4), dtype=np.int32)
+        evenements = etat["evenements"]
+        if self.total <= self.capacite:
+            self._donnees[:len(evenements)] = evenements
+        else:
+            # Tampon plein: le plus ancien événement est à la position total % capacite
+            self._donnees[:] = np.roll(evenements, self.total % self.capacite, axis=0)
+
+    @property
+    def perdus(self) -> int:
+        """Nombre d'événements écrasés faute de place."""
+        return max(self.total - self.capacite, 0)
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacite)
+
+    def tableau(self) -> np.ndarray:
+        """Événements conservés dans l'ordre chronologique (copie k × 4)."""
+        if self.total <= self.capacite:
+            return self._donnees[:self.total].copy()
+        debut = self.total % self.capacite
+        return np.concatenate((self._donnees[debut:], self._donnees[:debut]))
+
+    def evenements(self) -> Iterator[Evenement]:
+        for tour, etu, uni, issue in self.tableau().tolist():
+            yield tour, etu, uni, issue
+
+    def exporter_csv(self, path: str) -> None:
+        """Écrit la trace (noms et issues lisibles) dans un fichier CSV."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["tour", "etudiant", "universite", "issue"])
+            for tour, etu, uni, issue in self.evenements():
+                writer.writerow([tour, self.etudiants[etu], self.universites[uni], NOMS_ISSUES[issue]])
+
+    @classmethod
+    def charger_csv(cls, path: str) -> "TracePropositions":
+        """Relit une trace exportée par `exporter_csv`."""
+        codes = {nom: code for code, nom in NOMS_ISSUES.items()}
+        with open(path, newline="", encoding="utf-8") as f:
+            lignes = list(csv.DictReader(f))
+        trace = cls(capacite=max(len(lignes), 1))
+        ids_etu: Dict[str, int] = {}
+        ids_uni: Dict[str, int] = {}
+        for ligne in lignes:
+            etu = ids_etu.setdefault(ligne["etudiant"], len(ids_etu))
+            uni = ids_uni.setdefault(ligne["universite"], len(ids_uni))
+            trace.ajouter(int(ligne["tour"]), etu, uni, codes[ligne["issue"]])
+        trace.etudiants = list(ids_etu)
+        trace.universites = list(ids_uni)
+        return trace
+
+
+class RejeuTrace:
+    """
+    État de l'appariement après les `position` premiers événements d'une
+    trace. Avancer coûte O(événements parcourus); reculer repart du début.
+    """
+
+    def __init__(self, trace: TracePropositions):
+        self.trace = trace
+        self.evenements = trace.tableau().tolist()
+        self.position = 0
+        self.titulaires: Dict[int, int] = {}   # université -> étudiant
+
+    def aller_a(self, position: int) -> List[int]:
+        """Place le rejeu à `position`; retourne les universités modifiées."""
+        position = max(0, min(position, len(self.evenements)))
+        if position < self.position:
+            modifiees = set(self.titulaires)
+            self.titulaires = {}
+            self.position = 0
+        else:
+            modifiees = set()
+        for tour, etu, uni, issue in self.evenements[self.position:position]:
+            if issue == ACCEPTEE:
+                self.titulaires[uni] = etu
+                modifiees.add(uni)
+            elif issue == DELOGE and self.titulaires.get(uni) == etu:
+                del self.titulaires[uni]
+                modifiees.add(uni)
+        self.position = position
+        return sorted(modifiees)